@@ -0,0 +1,383 @@
+"""
+Bloomberg XIDF Export Ingestion
+===============================
+Reads the financial statements straight out of a Bloomberg Macro XIDF export
+(e.g. "Bloomberg Macro XIDF (1).xlsm") so the generators no longer carry
+hand-copied figures.
+
+- Each sheet's XML is parsed on its own, straight out of the zip archive, by
+  xlsx_reader; styles.xml (1.4 MB in the XIDF export) and the VBA project are
+  never loaded
+- Independent sheets are parsed concurrently in a process pool, largest first,
+  and merged into one dataset, so cold loads scale with core count
+- Only the requested sheets are parsed; "Supplemental", "Multiples" and the
+  other secondary sheets are skipped unless asked for
+- XidfWorkbook is a facade over one export whose sheets are lazy proxies:
+  a sheet is parsed the first time its grid, table or index is read and is
+  then memoised, so callers pay only for the sheets they touch
+- Parsed sheets are cached by zip member CRC32 (xidf_cache): warm runs do no
+  XML parsing at all, and a re-export only re-parses the sheets it changed
+
+Periods are keyed the same way the generators key them: "FY2023" for actuals
+and "FY2026E" for consensus estimates.
+"""
+
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from xml.etree import ElementTree
+
+import xidf_cache
+from xlsx_reader import (
+    cells_to_grid,
+    iter_member,
+    read_shared_strings,
+    shared_strings_crc,
+    sheet_paths,
+)
+
+XIDF_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "Bloomberg Macro XIDF (1).xlsm"
+)
+
+STATEMENT_SHEETS = ("Income Statement", "Balance Sheet", "Cash Flow")
+KEY_STATS_SHEET = "Key Stats"
+
+# Bloomberg puts the line-item labels in column B (index 1 of a row tuple)
+LABEL_COLUMN = 1
+
+_OFFSET_RE = re.compile(r"^(-?\d+)FY$")
+_FISCAL_YEAR_RE = re.compile(r"^FY\s*(\d{4})$")
+_DATE_RE = re.compile(r"^\d{1,2}/\d{1,2}/(\d{4})$")
+
+_CORE_PROPS = "docProps/core.xml"
+_MODIFIED_TAG = "{http://purl.org/dc/terms/}modified"
+
+# Store field name -> Bloomberg label (labels are matched stripped); the
+# derived rows built from these live in financial_store
+INCOME_FIELDS = {
+    "Revenue": "Revenue",
+    "COGS": "Cost Of Goods Sold",
+    "SGA": "Selling General & Admin Exp.",
+    "Other_OpEx": "Other Operating Expense/(Income)",
+    "Interest_Expense": "Interest Expense",
+    "Net_Interest": "Net Interest Exp.",
+    "Other_NonOp_Exp": "Other Non-Operating Exp. (Inc)",
+    "EBT_Incl_Unusual": "EBT Incl. Unusual Items",
+    "Tax_Expense": "Income Tax Expense",
+    "Net_Income": "Net Income",
+    "Pref_Dividends": "Pref. Dividends",
+    "Basic_Shares": "Weighted Avg. Basic Shares Out.",
+    "Diluted_Shares": "Weighted Avg. Diluted Shares Out.",
+}
+
+BALANCE_FIELDS = {
+    "Cash": "Cash And Equivalents",
+    "ST_Investments": "Short Term Investments",
+    "Receivables": "Accounts & Notes Receivable",
+    "Inventory": "Inventories",
+    "Prepaid": "Prepaid Exp.",
+    "Other_Current_Assets": "Other Current Assets",
+    "Total_CA": "Total Current Assets",
+    "Net_PPE": "Net Property, Plant & Equipment",
+    "LT_Investments": "Long-term Investments",
+    "Deferred_Charges": "Deferred Charges, LT",
+    "Other_LTA": "Other Long-Term Assets",
+    "Total_Assets": "Total Assets",
+    "Accrued_Exp": "Accrued Exp.",
+    "ST_Borrowings": "Short-term Borrowings",
+    "AP": "Accounts Payable",
+    "Taxes_Payable": "Curr. Income Taxes Payable",
+    "Other_Current_Liab": "Other Current Liabilities",
+    "Total_CL": "Total Current Liabilities",
+    "LT_Debt": "Long-Term Debt",
+    "Other_LTL": "Other Non-Current Liabilities",
+    "Total_Liabilities": "Total Liabilities",
+    "Pref_Stock": "Pref. Stock, Non-Redeem.",
+    "Minority_Int": "Minority Interest",
+    "APIC": "Additional Paid In Capital",
+    "Retained_Earnings": "Retained Earnings",
+    "AOCI": "Comprehensive Inc. and Other",
+    "Total_Equity": "Total Equity",
+    "Total_Liab_Equity": "Total Liabilities And Equity",
+}
+
+CASHFLOW_FIELDS = {
+    "Net_Income": "Net Income",
+    "DA": "Depreciation & Amort., Total",
+    "Other_NonCash": "Other Non-Cash Adj",
+    "WC_Changes": "Changes in Non-Cash Capital",
+    "CFO": "Cash from Ops.",
+    "CapEx": "Capital Expenditure",
+    "Sale_Assets": "Sale of Property, Plant, and Equipment",
+    "Acquisitions": "Cash Acquisitions",
+    "Investment_Proceeds": "Proceeds from Investment",
+    "Other_Invest": "Other Investing Activities",
+    "CFI": "Cash from Investing",
+    "Chg_ST_Debt": "Net Short Term Debt Issued/Repaid",
+    "LT_Debt_Issued": "Long-Term Debt Issued",
+    "LT_Debt_Repaid": "Long-Term Debt Repaid",
+    "Debt_Net": "Total Debt Issued/Repaid",
+    "Pref_Div": "Pref. Dividends Paid",
+    "Cash_Div": "Total Dividends Paid",
+    "Stock_Issued": "Increase in CapItal Stocks",  # sic - Bloomberg's spelling
+    "Stock_Repurchased": "Decrease in Capital Stocks",
+    "Other_Financing": "Other Financing Activities",
+    "CFF": "Cash from Financing",
+    "Net_Change": "Net Change in Cash",
+    "FCF": "Free Cash Flow",
+}
+
+ESTIMATE_FIELDS = {
+    "Revenue": "Total Revenue",
+    "Gross_Profit": "Gross Profit",
+    "EBITDA": "EBITDA",
+    "EBIT": "EBIT",
+    "Net_Income": "Net Income",
+    "EPS": "Diluted EPS Excl. Extra Items",
+}
+
+
+def _sheet_members(path, sheets):
+    """{sheet: ZipInfo of its XML member} and the sharedStrings.xml CRC32."""
+    with zipfile.ZipFile(path) as archive:
+        members = sheet_paths(archive)
+        missing = [name for name in sheets if name not in members]
+        if missing:
+            raise KeyError(f"Worksheet(s) {missing} not found in {path}")
+        infos = {name: archive.getinfo(members[name]) for name in sheets}
+        return infos, shared_strings_crc(archive)
+
+
+def _shared_strings(path):
+    with zipfile.ZipFile(path) as archive:
+        return read_shared_strings(archive)
+
+
+def _parse_sheet(path, member):
+    """
+    Parse one worksheet XML member into {row_number: values}, plus the
+    {index: string} shared strings its cells used.
+    """
+    with zipfile.ZipFile(path) as archive:
+        strings = read_shared_strings(archive)
+        refs = {}
+        grid = cells_to_grid(iter_member(archive, member, strings, refs))
+        return grid, refs
+
+
+def _parse_sheets(path, members, workers=None):
+    """Parse {sheet: ZipInfo} members into {sheet: (grid, refs)}."""
+    workers = min(workers or os.cpu_count() or 1, len(members))
+    if workers <= 1:
+        return {
+            name: _parse_sheet(path, info.filename) for name, info in members.items()
+        }
+
+    # Largest sheets first so the long poles start straight away
+    order = sorted(members, key=lambda name: members[name].file_size, reverse=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(_parse_sheet, path, members[name].filename)
+            for name in order
+        }
+        return {name: futures[name].result() for name in members}
+
+
+def read_sheets(path=XIDF_PATH, sheets=STATEMENT_SHEETS, use_cache=True, workers=None):
+    """
+    Parse the named sheets into {sheet: {row_number: values}} grids.
+
+    With use_cache, each sheet whose zip member has the same CRC32 as one
+    parsed before (in this or any earlier export) is served from the on-disk
+    cache (see xidf_cache); only changed sheets are parsed and added to it.
+    Those are parsed across `workers` processes (default: one per core).
+    """
+    sheets = tuple(sheets)
+    members, strings_crc = _sheet_members(path, sheets)
+    grids = {}
+    if use_cache:
+        grids = xidf_cache.load(members, strings_crc, lambda: _shared_strings(path))
+    changed = {name: members[name] for name in sheets if name not in grids}
+    if changed:
+        parsed = _parse_sheets(path, changed, workers)
+        if use_cache:
+            xidf_cache.store(members, strings_crc, parsed)
+        grids.update((name, grid) for name, (grid, _) in parsed.items())
+    return {name: grids[name] for name in sheets}
+
+
+def _period_name(offset, header_values):
+    # Prefer an explicit "FY 2023" header, fall back to the fiscal year end date
+    for value in header_values:
+        text = str(value).strip() if value is not None else ""
+        match = _FISCAL_YEAR_RE.match(text) or _DATE_RE.match(text)
+        if match:
+            return f"FY{match.group(1)}" + ("E" if offset > 0 else "")
+    return None
+
+
+def statement_periods(grid):
+    """Map column index -> period key ("FY2023", "FY2026E") for a sheet grid."""
+    for row_idx in sorted(grid):
+        values = grid[row_idx]
+        if len(values) <= LABEL_COLUMN or values[LABEL_COLUMN] != "FY":
+            continue
+        periods = {}
+        for col, value in enumerate(values):
+            match = _OFFSET_RE.match(str(value)) if value is not None else None
+            if not match:
+                continue
+            headers = [
+                grid.get(r, ())[col] if col < len(grid.get(r, ())) else None
+                for r in range(row_idx + 1, row_idx + 4)
+            ]
+            name = _period_name(int(match.group(1)), headers)
+            if name:
+                periods[col] = name
+        return periods
+    return {}
+
+
+def parse_statement(grid):
+    """Turn a sheet grid into {period: {label: value}} using its FY header row."""
+    periods = statement_periods(grid)
+    table = {name: {} for name in periods.values()}
+    for row_idx in sorted(grid):
+        values = grid[row_idx]
+        if len(values) <= LABEL_COLUMN or not isinstance(values[LABEL_COLUMN], str):
+            continue
+        label = values[LABEL_COLUMN].strip()
+        for col, name in periods.items():
+            value = values[col] if col < len(values) else None
+            # First occurrence wins: Key Stats repeats "Margin %" under each item
+            if isinstance(value, (int, float)) and label not in table[name]:
+                table[name][label] = value
+    return table
+
+
+def export_date(path=XIDF_PATH):
+    """
+    Date the export was pulled: the workbook's last-modified stamp in
+    docProps/core.xml, or the file's mtime when the stamp is missing.
+    """
+    with zipfile.ZipFile(path) as archive:
+        if _CORE_PROPS in archive.namelist():
+            props = ElementTree.fromstring(archive.read(_CORE_PROPS))
+            stamp = props.findtext(_MODIFIED_TAG)
+            if stamp:
+                return date.fromisoformat(stamp[:10])
+    return datetime.fromtimestamp(os.path.getmtime(path)).date()
+
+
+# =============================================================================
+# LAZY WORKBOOK FACADE
+# =============================================================================
+
+
+class LazySheet:
+    """Proxy for one sheet of an export; parses itself on first access."""
+
+    def __init__(self, workbook, name):
+        self.workbook = workbook
+        self.name = name
+        self._grid = None
+        self._table = None
+        self._index = None
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazySheet {self.name!r} ({state})>"
+
+    @property
+    def loaded(self):
+        return self._grid is not None
+
+    @property
+    def grid(self):
+        """{row_number: values}, parsed (or served from cache) on first use."""
+        if self._grid is None:
+            self.workbook.load(self.name)
+        return self._grid
+
+    @property
+    def table(self):
+        """{period: {label: value}} (see parse_statement)."""
+        if self._table is None:
+            self._table = parse_statement(self.grid)
+        return self._table
+
+    @property
+    def index(self):
+        """Label / period SheetIndex over the sheet."""
+        if self._index is None:
+            from sheet_index import SheetIndex
+
+            self._index = SheetIndex(self.name, self.grid)
+        return self._index
+
+
+class XidfWorkbook:
+    """
+    One XIDF export as {sheet name: LazySheet}. Only the sheet list is read
+    up front; load() parses several sheets in one batch so changed ones still
+    go through the process pool together.
+    """
+
+    def __init__(self, path=XIDF_PATH, use_cache=True):
+        self.path = path
+        self.use_cache = use_cache
+        with zipfile.ZipFile(path) as archive:
+            self.sheetnames = list(sheet_paths(archive))
+        self._sheets = {name: LazySheet(self, name) for name in self.sheetnames}
+
+    def __contains__(self, name):
+        return name in self._sheets
+
+    def __iter__(self):
+        return iter(self.sheetnames)
+
+    def __getitem__(self, name):
+        try:
+            return self._sheets[name]
+        except KeyError:
+            raise KeyError(f"Worksheet {name!r} not found in {self.path}") from None
+
+    def load(self, *names):
+        """Parse every named sheet not loaded yet, in one read_sheets call."""
+        pending = [name for name in names if not self[name].loaded]
+        if pending:
+            grids = read_sheets(self.path, pending, self.use_cache)
+            for name, grid in grids.items():
+                self._sheets[name]._grid = grid
+        return [self[name] for name in names]
+
+    @property
+    def loaded(self):
+        return [name for name in self.sheetnames if self._sheets[name].loaded]
+
+
+# One facade per export file, so separate loads in a run share parsed sheets
+_WORKBOOKS = {}
+
+
+def open_workbook(path=XIDF_PATH, use_cache=True):
+    """
+    The XidfWorkbook for `path`, reused while the file is unchanged (same
+    size and mtime).
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns, use_cache)
+    workbook = _WORKBOOKS.get(key)
+    if workbook is None:
+        workbook = _WORKBOOKS[key] = XidfWorkbook(path, use_cache)
+    return workbook
+
+
+def load_statements(path=XIDF_PATH, extra_sheets=(), use_cache=True):
+    """Parse the three statement sheets (plus any extra sheets asked for)."""
+    sheets = tuple(STATEMENT_SHEETS) + tuple(extra_sheets)
+    workbook = open_workbook(path, use_cache)
+    return {sheet.name: sheet.table for sheet in workbook.load(*sheets)}
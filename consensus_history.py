@@ -0,0 +1,228 @@
+"""
+Point-in-Time Consensus Estimates
+=================================
+Versioned store of the Bloomberg consensus (the "FY2026E"... columns of Key
+Stats), one entry per pull, so a model can be rebuilt with the consensus as it
+stood on any date instead of whatever the latest export says.
+
+- Every consensus cell is a (line item, period) pair on one flat cell axis;
+  new items and newly rolled-in years (FY2029E) simply extend the axis
+- Each pull is stored as a delta against the previous pull: the indices of
+  the cells that changed and their new values, as two small NumPy arrays
+- A full keyframe is kept every KEYFRAME_INTERVAL pulls, so rebuilding any
+  date is a binary search plus at most KEYFRAME_INTERVAL - 1 deltas, however
+  long the history grows
+- The last rebuilt pull is kept, so walking forward date by date applies one
+  delta per step
+- Cells a pull does not carry (a year that has become an actual) are NaN and
+  drop out of the as-of store
+- Histories persist as one zlib-compressed pickle, written atomically like
+  the parsed-export cache (xidf_cache); a year of daily pulls of the Key
+  Stats consensus is a few tens of KB
+
+Run this module directly to record the current XIDF export as a pull.
+"""
+
+import bisect
+import os
+from datetime import date
+
+import numpy as np
+
+import xidf_cache
+from bloomberg_xidf import ESTIMATE_FIELDS, XIDF_PATH, export_date
+from financial_store import FinancialStore, derive_estimates, load_financials
+
+HISTORY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "consensus_history.snap"
+)
+
+# Bump when the layout of the saved history changes
+HISTORY_VERSION = 1
+
+KEYFRAME_INTERVAL = 32
+
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+class ConsensusHistory:
+    """Consensus pulls by date, stored as deltas between consecutive pulls."""
+
+    def __init__(self):
+        self.cells = []  # [(line item, period)], in order of first appearance
+        self.cell_index = {}
+        self.dates = []  # one per pull, strictly increasing
+        self.deltas = []  # per pull: (cell indices, new values)
+        self.keyframes = {}  # pull number -> every cell's value at that pull
+        self._latest = np.empty(0)
+        self._memo = None  # (pull number, values) of the last rebuild
+
+    def __len__(self):
+        return len(self.dates)
+
+    def _cell(self, name, period):
+        index = self.cell_index.get((name, period))
+        if index is None:
+            index = self.cell_index[name, period] = len(self.cells)
+            self.cells.append((name, period))
+        return index
+
+    def _padded(self, values):
+        # Cells added after `values` was taken had no value yet
+        if len(values) == len(self.cells):
+            return values.copy()
+        padded = np.full(len(self.cells), np.nan)
+        padded[: len(values)] = values
+        return padded
+
+    def record(self, as_of, estimates):
+        """
+        Add the consensus pulled on `as_of` (a FinancialStore of estimate
+        periods). Returns False, recording nothing, when that date is already
+        recorded or older than the last pull: deltas only run forward, and
+        re-reading an older export must not fail.
+        """
+        as_of = _as_date(as_of)
+        if self.dates and as_of <= self.dates[-1]:
+            return False
+
+        pulled = {
+            self._cell(name, period): value
+            for name in estimates
+            for period, value in zip(estimates.periods, estimates[name])
+        }
+        values = np.full(len(self.cells), np.nan)
+        values[list(pulled)] = list(pulled.values())
+
+        previous = self._padded(self._latest)
+        same = (values == previous) | (np.isnan(values) & np.isnan(previous))
+        changed = np.flatnonzero(~same).astype(np.int32)
+
+        pull = len(self.dates)
+        self.dates.append(as_of)
+        self.deltas.append((changed, values[changed]))
+        if pull % KEYFRAME_INTERVAL == 0:
+            self.keyframes[pull] = values
+        self._latest = values
+        return True
+
+    def _values(self, pull):
+        """Every cell's value as of pull number `pull`."""
+        start = pull - pull % KEYFRAME_INTERVAL
+        if self._memo is not None and start <= self._memo[0] <= pull:
+            done, values = self._memo
+            values = self._padded(values)
+        else:
+            done, values = start, self._padded(self.keyframes[start])
+        for step in range(done + 1, pull + 1):
+            changed, new_values = self.deltas[step]
+            values[changed] = new_values
+        self._memo = (pull, values)
+        return values
+
+    def pull_for(self, as_of):
+        """Number of the last pull on or before `as_of`."""
+        pull = bisect.bisect_right(self.dates, _as_date(as_of)) - 1
+        if pull < 0:
+            raise KeyError(f"No consensus pull on or before {as_of}")
+        return pull
+
+    def as_of(self, as_of):
+        """The consensus as it stood on `as_of`, as a FinancialStore."""
+        values = self._values(self.pull_for(as_of))
+        live = ~np.isnan(values)
+        cells = [cell for cell, keep in zip(self.cells, live) if keep]
+        store = FinancialStore(sorted({period for _, period in cells}))
+        for (name, period), value in zip(cells, values[live].tolist()):
+            if name not in store:
+                store[name] = np.nan
+            store[name][store.period_index[period]] = value
+        return store
+
+    def revisions(self, name, period):
+        """[(date, value)] every time one consensus cell changed."""
+        index = self.cell_index.get((name, period))
+        if index is None:
+            return []
+        history = []
+        for as_of, (changed, new_values) in zip(self.dates, self.deltas):
+            hit = np.flatnonzero(changed == index)
+            if hit.size:
+                history.append((as_of, float(new_values[hit[0]])))
+        return history
+
+    @property
+    def nbytes(self):
+        """Bytes held in delta and keyframe arrays."""
+        return sum(c.nbytes + v.nbytes for c, v in self.deltas) + sum(
+            values.nbytes for values in self.keyframes.values()
+        )
+
+    def save(self, path=HISTORY_PATH):
+        xidf_cache.write_pickle(
+            path,
+            {
+                "version": HISTORY_VERSION,
+                "cells": self.cells,
+                "dates": self.dates,
+                "deltas": self.deltas,
+                "keyframes": self.keyframes,
+            },
+        )
+
+    @classmethod
+    def load(cls, path=HISTORY_PATH):
+        """Saved history at `path`; an empty one if there is none yet."""
+        history = cls()
+        saved = xidf_cache.read_pickle(path)
+        if not isinstance(saved, dict) or saved.get("version") != HISTORY_VERSION:
+            return history
+        history.cells = saved["cells"]
+        history.cell_index = {cell: i for i, cell in enumerate(history.cells)}
+        history.dates = saved["dates"]
+        history.deltas = saved["deltas"]
+        history.keyframes = saved["keyframes"]
+        if history.dates:
+            history._latest = history._values(len(history.dates) - 1).copy()
+        return history
+
+
+# =============================================================================
+# XIDF EXPORTS
+# =============================================================================
+
+
+def record_export(estimates, path=XIDF_PATH, history_path=HISTORY_PATH):
+    """
+    Record the consensus of one XIDF export, dated by export_date(). Only the
+    raw Key Stats fields are kept; derived rows are rebuilt on read. An
+    export no newer than the last recorded pull is skipped with a note.
+    """
+    history = ConsensusHistory.load(history_path)
+    pulled = FinancialStore(
+        estimates.periods, {name: estimates[name] for name in ESTIMATE_FIELDS}
+    )
+    as_of = export_date(path)
+    if history.record(as_of, pulled):
+        history.save(history_path)
+    else:
+        print(f"Consensus of {as_of} not recorded: history runs to {history.dates[-1]}")
+    return history
+
+
+def consensus_as_of(as_of, history_path=HISTORY_PATH):
+    """Consensus estimates store (with derived rows) as of a date."""
+    estimates = ConsensusHistory.load(history_path).as_of(as_of)
+    derive_estimates(estimates)
+    return estimates
+
+
+if __name__ == "__main__":
+    _, _, _, estimates = load_financials(XIDF_PATH)
+    history = record_export(estimates)
+    print(
+        f"{len(history)} consensus pull(s), {history.dates[0]} to "
+        f"{history.dates[-1]}, {history.nbytes / 1e3:.1f} KB"
+    )
@@ -0,0 +1,258 @@
+"""
+Native DCF and Sensitivity Grids
+================================
+The DCF and WACC sheets that update_module7_final.py writes, as broadcast
+NumPy expressions: every input may be a scalar or an array, so a whole
+sensitivity grid (WACC x terminal growth, beta x risk-free rate, ...) is one
+evaluation instead of an Excel data table recalculating cell by cell.
+
+- WACC = E/V * (Rf + Beta * MRP) + D/V * Kd * (1 - t), as WACC!B23
+- Projected FCF (DCF!C12:D12) is extended to five years by the sheet's fades
+  (x1.03, x1.03, x1.025), discounted at WACC with a Gordon-growth terminal
+  value; less debt plus cash, over shares outstanding, gives DCF!B29
+- Inputs are read from an updated workbook (or the in-memory one the updater
+  is building) through formula_engine, so the grid's base cell reproduces
+  the sheet
+- A grid is two inputs with additive steps around their base values;
+  write_sensitivity() lays it out as a formatted block with the base case
+  highlighted
+"""
+
+import sys
+
+import numpy as np
+import openpyxl
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+from formula_engine import FormulaModel
+
+DCF_YEARS = 5
+
+# FCF growth the DCF sheet applies after the projected years (E12:G12)
+FADES = (0.03, 0.03, 0.025)
+
+# Input -> (sheet, cell) of the updated Module7 workbook
+INPUT_CELLS = {
+    "Risk_Free": ("WACC", "B5"),
+    "Beta": ("WACC", "B6"),
+    "Market_Premium": ("WACC", "B7"),
+    "Pre_Tax_Kd": ("WACC", "B11"),
+    "Tax_Rate": ("WACC", "B12"),
+    "Equity_Value": ("WACC", "B16"),
+    "Debt_Value": ("WACC", "B17"),
+    "Terminal_Growth": ("DCF", "B6"),
+    "Shares": ("DCF", "B7"),
+    "Price": ("DCF", "B8"),
+    "Debt": ("DCF", "B26"),  # negated on read
+    "Cash": ("DCF", "B27"),
+}
+FCF_CELLS = ("DCF", ("C12", "D12"))
+
+# (row input, row steps, column input, column steps), steps added to the base
+SENSITIVITY_TABLES = (
+    (
+        "WACC",
+        np.linspace(-0.02, 0.02, 9),
+        "Terminal_Growth",
+        np.linspace(-0.01, 0.01, 5),
+    ),
+    ("Beta", np.linspace(-0.3, 0.3, 7), "Risk_Free", np.linspace(-0.01, 0.01, 5)),
+)
+
+LABELS = {
+    "WACC": "WACC",
+    "Terminal_Growth": "Terminal Growth",
+    "Beta": "Beta (Levered)",
+    "Risk_Free": "Risk-Free Rate",
+    "Market_Premium": "Market Risk Premium",
+    "Pre_Tax_Kd": "Pre-Tax Cost of Debt",
+    "Tax_Rate": "Tax Rate",
+}
+RATE_FORMAT = "0.00%"
+# Inputs that are not rates
+INPUT_FORMATS = {"Beta": "0.00"}
+PRICE_FORMAT = '"$"#,##0.00'
+
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+
+def cost_of_capital(inputs):
+    """WACC from the CAPM and capital-structure inputs (broadcast)."""
+    cost_of_equity = inputs["Risk_Free"] + inputs["Beta"] * inputs["Market_Premium"]
+    after_tax_debt = inputs["Pre_Tax_Kd"] * (1 - inputs["Tax_Rate"])
+    capital = inputs["Equity_Value"] + inputs["Debt_Value"]
+    return (
+        inputs["Equity_Value"] * cost_of_equity + inputs["Debt_Value"] * after_tax_debt
+    ) / capital
+
+
+def share_price(fcf, wacc, terminal_growth, debt, cash, shares, fades=FADES):
+    """
+    Implied share price from projected FCF (..., P): extended to DCF_YEARS
+    with the tail of `fades`, discounted at `wacc` with a Gordon-growth
+    terminal value. Every argument broadcasts against fcf[..., 0].
+    """
+    fcf = np.asarray(fcf, float)
+    extra = DCF_YEARS - fcf.shape[-1]
+    if extra > 0:
+        growth = np.cumprod(1 + np.asarray(fades[-extra:], float))
+        fcf = np.concatenate([fcf, fcf[..., -1:] * growth], axis=-1)
+    fcf = fcf[..., :DCF_YEARS]
+    wacc = np.asarray(wacc, float)[..., None]
+    discount = (1 + wacc) ** -np.arange(1, DCF_YEARS + 1)
+    terminal = (
+        fcf[..., -1]
+        * (1 + terminal_growth)
+        / (wacc[..., 0] - terminal_growth)
+        * discount[..., -1]
+    )
+    enterprise = (fcf * discount).sum(axis=-1) + terminal
+    return (enterprise - debt + cash) / shares
+
+
+def implied_price(inputs):
+    """DCF!B29 for `inputs`; a "WACC" entry overrides the computed WACC."""
+    wacc = inputs["WACC"] if "WACC" in inputs else cost_of_capital(inputs)
+    return share_price(
+        inputs["FCF"],
+        wacc,
+        inputs["Terminal_Growth"],
+        inputs["Debt"],
+        inputs["Cash"],
+        inputs["Shares"],
+    )
+
+
+def dcf_inputs(model):
+    """{input: value} from an evaluated FormulaModel of a Module7 workbook."""
+    inputs = {
+        name: model.value(sheet, cell) for name, (sheet, cell) in INPUT_CELLS.items()
+    }
+    inputs["Debt"] = -inputs["Debt"]
+    sheet, cells = FCF_CELLS
+    inputs["FCF"] = np.array([model.value(sheet, cell) for cell in cells], float)
+    return inputs
+
+
+# =============================================================================
+# SENSITIVITY GRIDS
+# =============================================================================
+
+
+def sensitivity_grid(inputs, row_name, row_values, column_name, column_values):
+    """
+    Implied share price over every (row value, column value) pair, in one
+    broadcast evaluation; returns a (rows, columns) array.
+    """
+    grid = dict(inputs)
+    grid[row_name] = np.asarray(row_values, float)[:, None]
+    grid[column_name] = np.asarray(column_values, float)[None, :]
+    price = implied_price(grid)
+    return np.broadcast_to(price, (len(row_values), len(column_values)))
+
+
+def base_value(inputs, name):
+    """Base value of an input (WACC is derived unless overridden)."""
+    if name == "WACC" and "WACC" not in inputs:
+        return float(cost_of_capital(inputs))
+    return float(inputs[name])
+
+
+def write_sensitivity(
+    ws, top, left, row_name, row_values, column_name, column_values, prices
+):
+    """
+    Lay out one grid at (top, left): title, column-input header, row-input
+    values down the side, prices in the body. Returns the next free row.
+    """
+    thin = Side(style="thin", color="999999")
+    header_fill = PatternFill(
+        start_color="1F4E79", end_color="1F4E79", fill_type="solid"
+    )
+    base_fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+    row_base = len(row_values) // 2
+    column_base = len(column_values) // 2
+
+    title = ws.cell(
+        row=top,
+        column=left,
+        value=f"Implied Share Price: {LABELS.get(row_name, row_name)} x "
+        f"{LABELS.get(column_name, column_name)}",
+    )
+    title.font = Font(bold=True, size=12)
+    corner = ws.cell(
+        row=top + 1,
+        column=left,
+        value=f"{LABELS.get(row_name, row_name)} \\ "
+        f"{LABELS.get(column_name, column_name)}",
+    )
+    corner.font = Font(bold=True, color="FFFFFF")
+    corner.fill = header_fill
+    for j, value in enumerate(column_values):
+        cell = ws.cell(row=top + 1, column=left + 1 + j, value=float(value))
+        cell.font = Font(bold=True, color="FFFFFF")
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal="center")
+        cell.number_format = INPUT_FORMATS.get(column_name, RATE_FORMAT)
+    for i, value in enumerate(row_values):
+        cell = ws.cell(row=top + 2 + i, column=left, value=float(value))
+        cell.font = Font(bold=True)
+        cell.number_format = INPUT_FORMATS.get(row_name, RATE_FORMAT)
+        for j in range(len(column_values)):
+            cell = ws.cell(
+                row=top + 2 + i, column=left + 1 + j, value=float(prices[i, j])
+            )
+            cell.number_format = PRICE_FORMAT
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            if i == row_base and j == column_base:
+                cell.fill = base_fill
+                cell.font = Font(bold=True)
+    return top + 2 + len(row_values) + 1
+
+
+def add_sensitivity_sheet(wb, tables=SENSITIVITY_TABLES, title="DCF Sensitivity"):
+    """
+    Evaluate the workbook in-process and write every table in `tables` to
+    the `title` sheet (replaced if present). Returns {table: price grid}.
+    """
+    model = FormulaModel.from_workbook(wb)
+    model.evaluate()
+    inputs = dcf_inputs(model)
+    if title in wb.sheetnames:
+        del wb[title]
+    ws = wb.create_sheet(title)
+    ws["A1"] = "DCF Sensitivity - Implied Share Price (DCF!B29)"
+    ws["A1"].font = Font(bold=True, size=14)
+    ws["A2"] = f"Current price {inputs['Price']:.2f}; highlighted cell is the base case"
+    ws["A2"].font = Font(italic=True, size=9, color="666666")
+    ws.column_dimensions["A"].width = 34
+
+    grids = {}
+    top = 4
+    for row_name, row_steps, column_name, column_steps in tables:
+        row_values = base_value(inputs, row_name) + np.asarray(row_steps)
+        column_values = base_value(inputs, column_name) + np.asarray(column_steps)
+        prices = sensitivity_grid(
+            inputs, row_name, row_values, column_name, column_values
+        )
+        top = write_sensitivity(
+            ws, top, 1, row_name, row_values, column_name, column_values, prices
+        )
+        grids[(row_name, column_name)] = prices
+    return grids
+
+
+if __name__ == "__main__":
+    # python dcf_model.py <updated Module7 workbook> [output path]
+    path = sys.argv[1]
+    wb = openpyxl.load_workbook(path, keep_vba=path.endswith(".xlsm"))
+    grids = add_sensitivity_sheet(wb)
+    for (row_name, column_name), prices in grids.items():
+        print(
+            f"{row_name} x {column_name}: {prices.size} prices, "
+            f"{prices.min():.2f} to {prices.max():.2f}"
+        )
+    wb.save(sys.argv[2] if len(sys.argv) > 2 else path)
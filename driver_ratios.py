@@ -0,0 +1,103 @@
+"""
+Historical Driver Ratios
+========================
+Derives the pro forma drivers (margins, expense and capex intensity, working
+capital days, tax rate) from the ingested Bloomberg history, so the generators
+no longer carry hand-typed assumption constants that drift from the data.
+
+- DRIVERS declares each ratio as numerator / denominator * scale over store
+  line items; every driver for every period is computed in one vectorized
+  pass as a (driver x period) matrix
+- A window collapses that history into one assumption per driver: the last
+  year, the mean of the last N years, or a weighted mean of the last N years
+  (weights 1..N, most recent heaviest); gaps are skipped
+- project() inverts the ratios over forecast periods: Receivables = DSO / 365
+  * Revenue, CapEx = CapEx % * Revenue, ...
+- Working-capital days use year-end balances over a 365-day year
+"""
+
+import numpy as np
+
+from financial_store import FinancialStore
+
+DAYS = 365
+
+# Driver name -> (numerator, denominator, scale)
+DRIVERS = {
+    "Gross_Margin": ("Gross_Profit", "Revenue", 1),
+    "SGA_Pct": ("SGA", "Revenue", 1),
+    "DA_Pct": ("DA", "Revenue", 1),
+    "CapEx_Pct": ("CapEx", "Revenue", 1),
+    "Tax_Rate": ("Tax_Expense", "EBT_Incl_Unusual", 1),
+    "DSO": ("Receivables", "Revenue", DAYS),
+    "DIO": ("Inventory", "COGS", DAYS),
+    "DPO": ("AP", "COGS", DAYS),
+    "Cash_Pct": ("Cash", "Revenue", 1),
+    "Other_CA_Pct": ("Other_CA", "Revenue", 1),
+    "Other_CL_Pct": ("Other_CL", "Revenue", 1),
+}
+
+WINDOWS = ("last", "mean", "weighted")
+
+
+def driver_history(stores, drivers=DRIVERS):
+    """
+    Every driver ratio for every period of the first store, as a
+    FinancialStore. Line items are taken from the first of `stores` that has
+    them (e.g. income, balance, cashflow).
+    """
+    periods = stores[0].periods
+    aligned = [stores[0]] + [store.reindex(periods) for store in stores[1:]]
+
+    def column(name):
+        for store in aligned:
+            if name in store:
+                return store[name]
+        raise KeyError(f"No line item {name!r} in any store")
+
+    numerators = np.vstack([column(num) for num, _, _ in drivers.values()])
+    denominators = np.vstack([column(den) for _, den, _ in drivers.values()])
+    scales = np.array([scale for _, _, scale in drivers.values()], float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = numerators / denominators * scales[:, None]
+    ratios[~np.isfinite(ratios)] = np.nan
+    return FinancialStore(periods, dict(zip(drivers, ratios)))
+
+
+def _weights(window, years):
+    if window == "last":
+        return np.ones(1)
+    if window == "mean":
+        return np.ones(years)
+    if window == "weighted":
+        return np.arange(1, years + 1, dtype=float)
+    raise ValueError(f"Unknown ratio window {window!r}; expected one of {WINDOWS}")
+
+
+def driver_assumptions(history, window="last", years=3, through=None):
+    """
+    {driver: assumption} from a driver_history store, collapsed over the
+    trailing window ending at period `through` (default: the last period).
+    """
+    end = len(history) if through is None else history.period_index[through] + 1
+    weights = _weights(window, years)
+    weights = weights[max(len(weights) - end, 0) :]
+    names = list(history)
+    tail = np.vstack([history[name] for name in names])[:, end - len(weights) : end]
+
+    present = ~np.isnan(tail)
+    weight = np.where(present, weights, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(present, tail, 0.0) @ weights / weight.sum(axis=1)
+    return dict(zip(names, values.tolist()))
+
+
+def project(assumptions, store, drivers=DRIVERS, names=None):
+    """
+    Apply driver assumptions to a forecast store in place: each driver's
+    numerator becomes assumption / scale * denominator over every period.
+    """
+    for name in names or assumptions:
+        numerator, denominator, scale = drivers[name]
+        store[numerator] = assumptions[name] / scale * store[denominator]
+    return store
@@ -0,0 +1,256 @@
+"""
+Columnar Financial Store
+========================
+One in-memory shape for the financials every script reads or writes: a NumPy
+float64 array per line item, laid out over an ordered fiscal-period axis.
+
+- Periods are keyed like the rest of the project ("FY2023", "FY2026E")
+- Derived rows (gross profit, EBIT, margins, working-capital changes) are
+  whole-array expressions, evaluated once per line item instead of per cell
+- Actuals and consensus estimates concatenate onto one axis, so growth and
+  margins run straight across the actual / estimate boundary
+- Line items come from the Bloomberg XIDF export (bloomberg_xidf) under the
+  field names the generators and the Module7 updaters share
+- Gaps are NaN; row() hands back plain Python floats ready for openpyxl cells
+"""
+
+import math
+
+import numpy as np
+
+from bloomberg_xidf import (
+    BALANCE_FIELDS,
+    CASHFLOW_FIELDS,
+    ESTIMATE_FIELDS,
+    INCOME_FIELDS,
+    KEY_STATS_SHEET,
+    XIDF_PATH,
+    load_statements,
+)
+
+
+class FinancialStore:
+    """Line item name -> float64 array over a fixed tuple of periods."""
+
+    def __init__(self, periods, items=None):
+        self.periods = tuple(periods)
+        self.period_index = {period: i for i, period in enumerate(self.periods)}
+        self.items = {}
+        for name, values in (items or {}).items():
+            self[name] = values
+
+    @classmethod
+    def from_table(cls, table, fields=None, missing=np.nan):
+        """
+        Build a store from a {period: {label: value}} table (parse_statement).
+        `fields` ({name: label}) picks and renames line items; by default every
+        label is kept as is. Blank cells become `missing`.
+        """
+        if fields is None:
+            fields = {label: label for items in table.values() for label in items}
+        store = cls(table)
+        for name, label in fields.items():
+            store[name] = [items.get(label, missing) for items in table.values()]
+        return store
+
+    def __len__(self):
+        return len(self.periods)
+
+    def __contains__(self, name):
+        return name in self.items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, name):
+        try:
+            return self.items[name]
+        except KeyError:
+            raise KeyError(f"No line item {name!r} in store") from None
+
+    def __setitem__(self, name, values):
+        # Scalars broadcast across every period ("Other_OpEx" = 50.0)
+        values = np.asarray(values, dtype=np.float64)
+        self.items[name] = np.array(np.broadcast_to(values, (len(self.periods),)))
+
+    def _positions(self, periods):
+        try:
+            return [self.period_index[period] for period in periods]
+        except KeyError as exc:
+            raise KeyError(f"Period {exc.args[0]!r} not in store") from None
+
+    def value(self, name, period):
+        return float(self[name][self._positions([period])[0]])
+
+    def row(self, name, periods=None, missing=None):
+        """One line item as Python floats (NaN -> `missing`), for writing cells."""
+        values = self[name]
+        if periods is not None:
+            values = values[self._positions(periods)]
+        return [missing if math.isnan(v) else v for v in values.tolist()]
+
+    def select(self, periods):
+        """New store over a subset / reordering of this store's periods."""
+        positions = self._positions(periods)
+        return FinancialStore(
+            periods, {name: values[positions] for name, values in self.items.items()}
+        )
+
+    def reindex(self, periods):
+        """Same line items over `periods`; periods this store lacks are NaN."""
+        periods = tuple(periods)
+        positions = np.array([self.period_index.get(p, -1) for p in periods], int)
+        found = positions >= 0
+        store = FinancialStore(periods)
+        for name, values in self.items.items():
+            column = np.full(len(periods), np.nan)
+            column[found] = values[positions[found]]
+            store.items[name] = column
+        return store
+
+    def concat(self, other):
+        """
+        This store's periods followed by `other`'s (actuals then estimates).
+        Line items missing on either side are NaN there.
+        """
+        tail = [p for p in other.periods if p not in self.period_index]
+        head = len(self.periods)
+        store = FinancialStore(self.periods + tuple(tail))
+        names = list(self.items) + [n for n in other.items if n not in self.items]
+        tail_positions = other._positions(tail)
+        for name in names:
+            column = np.full(len(store.periods), np.nan)
+            if name in self.items:
+                column[:head] = self.items[name]
+            if name in other.items:
+                column[head:] = other.items[name][tail_positions]
+            store.items[name] = column
+        return store
+
+    def lag(self, name, periods=1):
+        """Values from `periods` periods earlier (NaN where there are none)."""
+        values = self[name]
+        shifted = np.full_like(values, np.nan)
+        if periods < len(values):
+            shifted[periods:] = values[: len(values) - periods]
+        return shifted
+
+    def diff(self, name):
+        """Current minus prior period."""
+        return self[name] - self.lag(name)
+
+    def growth(self, name):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self[name] / self.lag(name) - 1
+
+    def ratio(self, numerator, denominator):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self[numerator] / self[denominator]
+
+
+# =============================================================================
+# DERIVED LINE ITEMS
+# =============================================================================
+
+
+def derive_income(income, cashflow):
+    """Income statement subtotals, per-share figures and tax rate."""
+    income["DA"] = cashflow.reindex(income.periods)["DA"]
+    income["Gross_Profit"] = income["Revenue"] - income["COGS"]
+    income["EBIT"] = income["Gross_Profit"] - income["SGA"] - income["Other_OpEx"]
+    income["EBITDA"] = income["EBIT"] + income["DA"]
+    income["NonOp_Income"] = -income["Other_NonOp_Exp"]
+    income["Pretax_Income"] = (
+        income["EBIT"] - income["Net_Interest"] + income["NonOp_Income"]
+    )
+    # Implied from Net Income (absorbs the unusual items below EBT) so the
+    # statements tie; the tax rate uses the reported expense instead
+    income["Income_Tax"] = income["Pretax_Income"] - income["Net_Income"]
+    income["Tax_Rate"] = income.ratio("Tax_Expense", "EBT_Incl_Unusual")
+    income["Net_Income_Common"] = income["Net_Income"] - income["Pref_Dividends"]
+    income["EPS_Basic"] = income.ratio("Net_Income_Common", "Basic_Shares")
+    income["EPS"] = income.ratio("Net_Income_Common", "Diluted_Shares")
+
+
+def derive_balance(balance):
+    """Balance sheet groupings used by the generators and the Module7 template."""
+    balance["Other_CA"] = balance["Prepaid"] + balance["Other_Current_Assets"]
+    balance["Other_CL"] = balance["Accrued_Exp"] + balance["Other_Current_Liab"]
+    balance["Other_NonCA"] = balance["Deferred_Charges"] + balance["Other_LTA"]
+    balance["Total_NonCA"] = balance["Total_Assets"] - balance["Total_CA"]
+    balance["Total_NonCL"] = balance["Total_Liabilities"] - balance["Total_CL"]
+    balance["Total_Debt"] = balance["ST_Borrowings"] + balance["LT_Debt"]
+    balance["Total_SH_Equity"] = balance["Total_Equity"] - balance["Minority_Int"]
+    balance["Common_Equity"] = balance["Total_SH_Equity"] - balance["Pref_Stock"]
+    # Zero when the statement balances
+    balance["Balance_Check"] = balance["Total_Assets"] - balance["Total_Liab_Equity"]
+
+
+def derive_cashflow(cashflow, balance):
+    """Cash flow subtotals and working-capital changes from the balance sheet."""
+    # Module7 sign convention: an increase in an asset uses cash
+    working = FinancialStore(
+        balance.periods,
+        {
+            "Chg_Receivables": -balance.diff("Receivables"),
+            "Chg_Inventory": -balance.diff("Inventory"),
+            "Chg_AP": balance.diff("AP"),
+        },
+    ).reindex(cashflow.periods)
+    for name in working:
+        cashflow[name] = working[name]
+    cashflow["FFO"] = (
+        cashflow["Net_Income"] + cashflow["DA"] + cashflow["Other_NonCash"]
+    )
+    cashflow["Other_WC"] = cashflow["WC_Changes"] - (
+        cashflow["Chg_Receivables"] + cashflow["Chg_Inventory"] + cashflow["Chg_AP"]
+    )
+    cashflow["Chg_LT_Debt"] = cashflow["LT_Debt_Issued"] + cashflow["LT_Debt_Repaid"]
+    cashflow["Common_Div"] = cashflow["Cash_Div"] - cashflow["Pref_Div"]
+    cashflow["Stock_Change"] = cashflow["Stock_Issued"] + cashflow["Stock_Repurchased"]
+
+
+def derive_estimates(estimates):
+    """Line items implied by the consensus figures."""
+    estimates["COGS"] = estimates["Revenue"] - estimates["Gross_Profit"]
+    estimates["DA"] = estimates["EBITDA"] - estimates["EBIT"]
+    # Share count implied by consensus net income and EPS
+    estimates["Diluted_Shares"] = estimates.ratio("Net_Income", "EPS")
+
+
+def add_margins(store):
+    """Growth and margin rows; run on a concatenated actual + estimate store."""
+    store["Revenue_Growth"] = store.growth("Revenue")
+    store["Gross_Margin"] = store.ratio("Gross_Profit", "Revenue")
+    store["EBIT_Margin"] = store.ratio("EBIT", "Revenue")
+    store["Net_Margin"] = store.ratio("Net_Income", "Revenue")
+
+
+def load_financials(path=XIDF_PATH, use_cache=True):
+    """
+    Read the XIDF export into (income, balance, cashflow, estimates) stores.
+
+    Statement blanks ("-") are Bloomberg's "none" and load as 0; the estimates
+    store holds the consensus periods ("FY2026E"...) of the Key Stats sheet.
+    """
+    statements = load_statements(path, (KEY_STATS_SHEET,), use_cache)
+    income = FinancialStore.from_table(
+        statements["Income Statement"], INCOME_FIELDS, missing=0.0
+    )
+    balance = FinancialStore.from_table(
+        statements["Balance Sheet"], BALANCE_FIELDS, missing=0.0
+    )
+    cashflow = FinancialStore.from_table(
+        statements["Cash Flow"], CASHFLOW_FIELDS, missing=0.0
+    )
+    key_stats = statements[KEY_STATS_SHEET]
+    estimates = FinancialStore.from_table(
+        {period: items for period, items in key_stats.items() if period.endswith("E")},
+        ESTIMATE_FIELDS,
+    )
+
+    derive_balance(balance)
+    derive_cashflow(cashflow, balance)
+    derive_income(income, cashflow)
+    derive_estimates(estimates)
+    return income, balance, cashflow, estimates
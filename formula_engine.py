@@ -0,0 +1,805 @@
+"""
+Formula Evaluation Engine
+=========================
+Computes the formulas the generators and Module7 updaters write
+("=G5*(1-$B$34)", "=G37+IncomeStatement!G23", "=SUM(B8:B11)") in-process, so
+batch jobs get the valued model without opening Excel.
+
+- Each formula is normalised to its relative (R1C1) pattern; a pattern is
+  parsed, with Excel's operator precedence (negation, %, ^, * /, + -, &,
+  comparisons), and compiled into nested Python closures once, and every
+  cell sharing it (the same line filled across 40 periods) reuses that
+  callable, so parse / compile cost tracks distinct formulas, not cells
+- Cell and range references may be sheet-qualified, quoted or not
+  ('Cash Flow Statement'!E16), absolute or relative
+- The references of every formula cell (ranges expanded) form a dependency
+  graph; each cell is computed once, in topological order
+- Functions: SUM, AVERAGE, MIN, MAX, ROUND, ABS, NPV, IF, IFERROR, AND, OR;
+  anything else evaluates to #NAME?
+- Excel errors (#DIV/0!, #VALUE!, ...) are values: they flow into every
+  dependent cell instead of aborting the run, as do #REF! literals left
+  behind by deleted rows
+- Data tables ({=TABLE(...)}) are left to Excel and read as empty
+- Incremental recalculation: edit() marks a cell dirty and recalculate()
+  walks a reverse dependency index (cell -> formulas reading it) to recompute
+  only the edited cells' transitive dependents, so a what-if edit to one
+  assumption costs its downstream chain, not the workbook
+
+Run this module directly on a workbook last saved by Excel to check every
+formula against Excel's own cached results.
+"""
+
+import math
+import re
+import sys
+from functools import partial
+from graphlib import CycleError, TopologicalSorter
+
+import openpyxl
+from openpyxl.utils.cell import (
+    column_index_from_string,
+    coordinate_to_tuple,
+    get_column_letter,
+)
+
+DIV0 = "#DIV/0!"
+VALUE = "#VALUE!"
+NAME = "#NAME?"
+NUM = "#NUM!"
+
+
+class FormulaSyntaxError(ValueError):
+    """A formula the parser cannot read."""
+
+
+class CircularReferenceError(ValueError):
+    """Formulas that reference each other in a loop."""
+
+    def __init__(self, cells):
+        self.cells = cells
+        super().__init__("Circular reference: " + ", ".join(map(cell_name, cells)))
+
+
+class ExcelError(Exception):
+    """An Excel error value (#DIV/0!, #VALUE!...), stored as a cell's value."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+    def __repr__(self):
+        return self.code
+
+    def __eq__(self, other):
+        return isinstance(other, ExcelError) and other.code == self.code
+
+    def __hash__(self):
+        return hash(self.code)
+
+
+def cell_name(key):
+    """(sheet, row, col) -> "Sheet!B12"."""
+    sheet, row, col = key
+    return f"{sheet}!{get_column_letter(col)}{row}"
+
+
+# =============================================================================
+# PARSER
+# =============================================================================
+
+_REF = (
+    r"(?P<ref>(?:(?:'(?P<quoted>(?:[^']|'')+)'|(?P<sheet>[A-Za-z_][\w.]*))!)?"
+    r"(?P<ac1>\$)?(?P<c1>[A-Za-z]{1,3})(?P<ar1>\$)?(?P<r1>\d+)"
+    r"(?::(?P<ac2>\$)?(?P<c2>[A-Za-z]{1,3})(?P<ar2>\$)?(?P<r2>\d+))?)(?![\w(])"
+)
+
+_TOKEN_RE = re.compile(
+    r"\s*(?:" + _REF + r"|(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r'|(?P<string>"(?:[^"]|"")*")'
+    r"|(?P<func>[A-Za-z_][\w.]*)\s*\("
+    r"|(?P<bool>TRUE|FALSE)\b"
+    r"|(?P<error>#(?:NULL!|DIV/0!|VALUE!|REF!|NAME\?|NUM!|N/A))"
+    r"|(?P<op><>|<=|>=|[-+*/^&=<>%(),])"
+    r")"
+)
+
+# References only, skipping over string literals ("A1" in quotes is text)
+_REF_RE = re.compile(r'"(?:[^"]|"")*"|(?<![\w.$])' + _REF)
+
+_KINDS = ("ref", "number", "string", "func", "bool", "error", "op")
+
+
+def _tokens(text):
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise FormulaSyntaxError(f"Unexpected {text[pos:]!r} in ={text}")
+        pos = match.end()
+        kind = next(kind for kind in _KINDS if match.group(kind) is not None)
+        yield kind, match if kind == "ref" else match.group(kind)
+    yield "end", None
+
+
+class _Parser:
+    """Recursive descent over the tokens of one formula."""
+
+    def __init__(self, text, sheet, row, col):
+        self.text = text
+        self.sheet = sheet
+        self.row = row
+        self.col = col
+        self.tokens = list(_tokens(text))
+        self.pos = 0
+
+    def error(self, what):
+        return FormulaSyntaxError(f"{what} in ={self.text}")
+
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def take(self):
+        self.pos += 1
+        return self.tokens[self.pos - 1]
+
+    def parse(self):
+        node = self.comparison()
+        if self.peek()[0] != "end":
+            raise self.error(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def _binary(self, operators, operand):
+        node = operand()
+        while self.peek()[0] == "op" and self.peek()[1] in operators:
+            node = ("bin", self.take()[1], node, operand())
+        return node
+
+    def comparison(self):
+        return self._binary(("=", "<>", "<", ">", "<=", ">="), self.concat)
+
+    def concat(self):
+        return self._binary(("&",), self.additive)
+
+    def additive(self):
+        return self._binary(("+", "-"), self.term)
+
+    def term(self):
+        return self._binary(("*", "/"), self.power)
+
+    def power(self):
+        return self._binary(("^",), self.percent)
+
+    def percent(self):
+        node = self.unary()
+        while self.peek() == ("op", "%"):
+            self.take()
+            node = ("pct", node)
+        return node
+
+    def unary(self):
+        if self.peek() == ("op", "-"):
+            self.take()
+            return ("neg", self.unary())
+        if self.peek() == ("op", "+"):
+            self.take()
+            return self.unary()
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.take()
+        if kind == "number":
+            return ("const", float(value))
+        if kind == "string":
+            return ("const", value[1:-1].replace('""', '"'))
+        if kind == "bool":
+            return ("const", value == "TRUE")
+        if kind == "error":
+            return ("error", value)
+        if kind == "ref":
+            return self.reference(value)
+        if kind == "func":
+            return ("call", value.upper(), self.arguments())
+        if (kind, value) == ("op", "("):
+            node = self.comparison()
+            if self.take() != ("op", ")"):
+                raise self.error("Expected ')'")
+            return node
+        raise self.error(f"Unexpected {value!r}")
+
+    def arguments(self):
+        args = []
+        if self.peek() == ("op", ")"):
+            self.take()
+            return args
+        while True:
+            args.append(self.comparison())
+            token = self.take()
+            if token == ("op", ")"):
+                return args
+            if token != ("op", ","):
+                raise self.error("Expected ',' or ')'")
+
+    def reference(self, match):
+        # Relative rows / columns become offsets from the formula's own cell
+        corners = [
+            (
+                row if row_abs else row - self.row,
+                row_abs,
+                col if col_abs else col - self.col,
+                col_abs,
+            )
+            for row, col, row_abs, col_abs in _corners(match)
+        ]
+        return (
+            "ref" if len(corners) == 1 else "range",
+            _ref_sheet(match, self.sheet),
+            *corners,
+        )
+
+
+def _ref_sheet(match, sheet):
+    quoted = match.group("quoted")
+    return quoted.replace("''", "'") if quoted else match.group("sheet") or sheet
+
+
+def _corners(match):
+    """[(row, col, row absolute?, col absolute?)] for each corner of a ref."""
+    r1, c1, ar1, ac1, r2, c2, ar2, ac2 = match.group(
+        "r1", "c1", "ar1", "ac1", "r2", "c2", "ar2", "ac2"
+    )
+    corners = [
+        (
+            int(r1),
+            column_index_from_string(c1.upper()),
+            ar1 is not None,
+            ac1 is not None,
+        )
+    ]
+    if c2 is not None:
+        corners.append(
+            (
+                int(r2),
+                column_index_from_string(c2.upper()),
+                ar2 is not None,
+                ac2 is not None,
+            )
+        )
+    return corners
+
+
+def parse_formula(formula, sheet, row=1, col=1):
+    """
+    Expression tree of the formula ("=...") in cell (row, col) of `sheet`.
+    References are (row, row absolute?, col, col absolute?) with relative
+    parts stored as offsets from that cell.
+    """
+    text = formula[1:] if formula.startswith("=") else formula
+    return _Parser(text, sheet, row, col).parse()
+
+
+def _r1c1(offset, absolute, axis):
+    if absolute:
+        return f"{axis}{offset}"
+    return f"{axis}[{offset}]" if offset else axis
+
+
+def normalize(formula, sheet, row, col):
+    """
+    (R1C1 pattern, absolute references) of the formula in (row, col). A
+    formula filled across columns has one pattern: "=G5-G6" in G7 and
+    "=H5-H6" in H7 are both "=R[-2]C-R[-1]C".
+    """
+    text = formula[1:]
+    pieces, refs, done = ["="], [], 0
+    for match in _REF_RE.finditer(text):
+        if match.group("ref") is None:
+            continue  # a string literal
+        start, end = match.span()
+        ref_sheet = _ref_sheet(match, sheet)
+        corners = _corners(match)
+        pieces.append(text[done:start])
+        if match.group("quoted") or match.group("sheet"):
+            pieces.append("'" + ref_sheet.replace("'", "''") + "'!")
+        pieces.append(
+            ":".join(
+                _r1c1(r if r_abs else r - row, r_abs, "R")
+                + _r1c1(c if c_abs else c - col, c_abs, "C")
+                for r, c, r_abs, c_abs in corners
+            )
+        )
+        done = end
+        if len(corners) == 1:
+            refs.append(("ref", ref_sheet, *corners[0][:2]))
+        else:
+            (r1, c1, _, _), (r2, c2, _, _) = corners
+            refs.append(
+                ("range", ref_sheet, min(r1, r2), min(c1, c2), max(r1, r2), max(c1, c2))
+            )
+    pieces.append(text[done:])
+    return "".join(pieces), tuple(refs)
+
+
+# =============================================================================
+# VALUES AND FUNCTIONS
+# =============================================================================
+
+
+def _number(value):
+    """A scalar as a number, the way Excel coerces operands."""
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            raise ExcelError(VALUE) from None
+    raise ExcelError(VALUE)
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else format(value, ".15g")
+    return str(value)
+
+
+def _rank(value):
+    # Excel orders mixed types: numbers < text < logicals
+    if isinstance(value, bool):
+        return 2
+    return 1 if isinstance(value, str) else 0
+
+
+def _compare(op, left, right):
+    if left is None:
+        left = "" if isinstance(right, str) else 0.0
+    if right is None:
+        right = "" if isinstance(left, str) else 0.0
+    if _rank(left) != _rank(right):
+        left, right = _rank(left), _rank(right)
+    elif isinstance(left, str):
+        left, right = left.casefold(), right.casefold()
+    if op == "=":
+        return left == right
+    if op == "<>":
+        return left != right
+    if op == "<":
+        return left < right
+    if op == ">":
+        return left > right
+    if op == "<=":
+        return left <= right
+    return left >= right
+
+
+def _arithmetic(op, left, right):
+    left, right = _number(left), _number(right)
+    if op == "+":
+        return left + right
+    if op == "-":
+        return left - right
+    if op == "*":
+        return left * right
+    if op == "/":
+        if right == 0:
+            raise ExcelError(DIV0)
+        return left / right
+    if left == 0 and right < 0:
+        raise ExcelError(DIV0)
+    try:
+        result = left**right
+    except OverflowError:
+        raise ExcelError(NUM) from None
+    if isinstance(result, complex):
+        raise ExcelError(NUM)
+    return result
+
+
+def _numbers(args):
+    """Numbers of function arguments: ranges skip text / blanks, scalars coerce."""
+    numbers = []
+    for arg in args:
+        if isinstance(arg, list):
+            for value in arg:
+                if isinstance(value, ExcelError):
+                    raise value
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    numbers.append(float(value))
+        else:
+            numbers.append(_number(arg))
+    return numbers
+
+
+def _average(args):
+    numbers = _numbers(args)
+    if not numbers:
+        raise ExcelError(DIV0)
+    return sum(numbers) / len(numbers)
+
+
+def _round(args):
+    value = _number(args[0])
+    digits = int(_number(args[1])) if len(args) > 1 else 0
+    # Half away from zero, like Excel (Python's round() is half to even)
+    scale = 10.0**digits
+    return math.copysign(math.floor(abs(value) * scale + 0.5) / scale, value)
+
+
+def _npv(args):
+    rate = _number(args[0])
+    return sum(
+        value / (1 + rate) ** period
+        for period, value in enumerate(_numbers(args[1:]), start=1)
+    )
+
+
+FUNCTIONS = {
+    "SUM": lambda args: sum(_numbers(args)),
+    "AVERAGE": _average,
+    "MIN": lambda args: min(_numbers(args), default=0.0),
+    "MAX": lambda args: max(_numbers(args), default=0.0),
+    "ROUND": _round,
+    "ABS": lambda args: abs(_number(args[0])),
+    "NPV": _npv,
+    "AND": lambda args: all(_numbers(args)),
+    "OR": lambda args: any(_numbers(args)),
+}
+
+_OPERATORS = {op: partial(_arithmetic, op) for op in ("+", "-", "*", "/", "^")}
+_OPERATORS.update(
+    {op: partial(_compare, op) for op in ("=", "<>", "<", ">", "<=", ">=")}
+)
+_OPERATORS["&"] = lambda left, right: _text(left) + _text(right)
+
+
+# =============================================================================
+# COMPILER
+# =============================================================================
+
+# (sheet, R1C1 pattern) -> compiled callable, shared by every cell and model
+_COMPILED = {}
+
+
+def compile_formula(formula, sheet, row=1, col=1):
+    """
+    The formula in (row, col) as a callable f(values, row, col) that computes
+    it for any cell sharing its R1C1 pattern, reading cells from `values`.
+    """
+    return _compile(parse_formula(formula, sheet, row, col))
+
+
+def _compile(node):
+    kind = node[0]
+    if kind == "const":
+        value = node[1]
+        return lambda values, row, col: value
+    if kind == "ref":
+        return _compile_ref(node[1], node[2])
+    if kind == "range":
+        return _compile_range(*node[1:])
+    if kind == "bin":
+        operator = _OPERATORS[node[1]]
+        left, right = _compile_scalar(node[2]), _compile_scalar(node[3])
+        return lambda values, row, col: operator(
+            left(values, row, col), right(values, row, col)
+        )
+    if kind == "neg":
+        operand = _compile_scalar(node[1])
+        return lambda values, row, col: -_number(operand(values, row, col))
+    if kind == "pct":
+        operand = _compile_scalar(node[1])
+        return lambda values, row, col: _number(operand(values, row, col)) / 100
+    if kind == "error":
+        return partial(_raise, ExcelError(node[1]))
+    return _compile_call(node[1], [_compile(arg) for arg in node[2]])
+
+
+def _raise(error, values, row, col):
+    raise error
+
+
+def _compile_scalar(node):
+    """Compile an operand; ranges (and calls that return one) are #VALUE!."""
+    function = _compile(node)
+    if node[0] not in ("range", "call"):
+        return function
+
+    def scalar(values, row, col):
+        value = function(values, row, col)
+        if isinstance(value, list):
+            raise ExcelError(VALUE)
+        return value
+
+    return scalar
+
+
+def _compile_ref(sheet, corner):
+    r, r_abs, c, c_abs = corner
+
+    def ref(values, row, col):
+        value = values.get((sheet, r if r_abs else row + r, c if c_abs else col + c))
+        if isinstance(value, ExcelError):
+            raise value
+        return value
+
+    return ref
+
+
+def _compile_range(sheet, first, second):
+    (r1, r1_abs, c1, c1_abs), (r2, r2_abs, c2, c2_abs) = first, second
+
+    def cells(values, row, col):
+        top, bottom = r1 if r1_abs else row + r1, r2 if r2_abs else row + r2
+        left, right = c1 if c1_abs else col + c1, c2 if c2_abs else col + c2
+        return [
+            values.get((sheet, r, c))
+            for r in range(min(top, bottom), max(top, bottom) + 1)
+            for c in range(min(left, right), max(left, right) + 1)
+        ]
+
+    return cells
+
+
+def _compile_call(name, args):
+    if name == "IF":
+        condition = args[0]
+        then = args[1] if len(args) > 1 else (lambda values, row, col: True)
+        otherwise = args[2] if len(args) > 2 else (lambda values, row, col: False)
+
+        def if_(values, row, col):
+            value = condition(values, row, col)
+            if isinstance(value, list):
+                raise ExcelError(VALUE)
+            branch = then if _number(value) != 0 else otherwise
+            return branch(values, row, col)
+
+        return if_
+    if name == "IFERROR":
+        value, fallback = args
+
+        def iferror(values, row, col):
+            try:
+                result = value(values, row, col)
+                if isinstance(result, list):
+                    raise ExcelError(VALUE)
+                return result
+            except ExcelError:
+                return fallback(values, row, col)
+
+        return iferror
+    function = FUNCTIONS.get(name)
+    if function is None:
+        return partial(_raise, ExcelError(NAME))
+    return lambda values, row, col: function([arg(values, row, col) for arg in args])
+
+
+# =============================================================================
+# CELL STORE
+# =============================================================================
+
+
+def stored_cells(ws):
+    """
+    {(row, col): cell} of the cells `ws` actually holds, in insertion order.
+
+    This is openpyxl's private Worksheet._cells, read directly because no
+    public API exposes it: iter_rows() and ws.cell() create every blank cell
+    they pass over (and on a template_pool clone copy every shared one).
+    Every module that needs only the stored cells (this one, xlsm_patch,
+    template_pool) goes through here, so an openpyxl change has one place to
+    land.
+    """
+    return ws._cells
+
+
+# =============================================================================
+# WORKBOOK MODEL
+# =============================================================================
+
+
+def _is_formula(value):
+    return isinstance(value, str) and value.startswith("=") and value != "="
+
+
+class FormulaModel:
+    """
+    Cell values and formulas of a workbook, keyed (sheet, row, col).
+    evaluate() fills `values` with every constant and computed formula; after
+    that, edit() + recalculate() recompute only what an edit reaches.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.formulas = {}
+        self.refs = {}
+        self.code = {}
+        self._order = None
+        self._position = None
+        self._dependents = None
+        self._dirty = set()
+
+    @classmethod
+    def from_workbook(cls, wb):
+        """Model of an openpyxl workbook loaded with formulas (not data_only)."""
+        model = cls()
+        for ws in wb.worksheets:
+            # Stored cells only, in row order (see stored_cells)
+            for (row, col), cell in sorted(stored_cells(ws).items()):
+                value = cell.value
+                if _is_formula(value):
+                    model.set_formula(ws.title, row, col, value)
+                elif isinstance(value, (int, float, str, bool)):
+                    model.values[ws.title, row, col] = value
+        return model
+
+    def set_formula(self, sheet, row, col, formula):
+        key = (sheet, row, col)
+        pattern, refs = normalize(formula, sheet, row, col)
+        code = _COMPILED.get((sheet, pattern))
+        if code is None:
+            code = _COMPILED[sheet, pattern] = compile_formula(formula, sheet, row, col)
+        self.formulas[key] = formula
+        self.refs[key] = refs
+        self.code[key] = code
+        self._graph_changed()
+        self._dirty.add(key)
+
+    def edit(self, sheet, coordinate, value):
+        """
+        Change one cell (a constant, a "=..." formula or None) and mark it
+        dirty for the next recalculate().
+        """
+        key = (sheet, *coordinate_to_tuple(coordinate))
+        if _is_formula(value):
+            self.set_formula(*key, value)
+            return
+        if key in self.code:
+            del self.formulas[key], self.refs[key], self.code[key]
+            self._graph_changed()
+        self.values[key] = value
+        self._dirty.add(key)
+
+    def _graph_changed(self):
+        self._order = self._position = self._dependents = None
+
+    def _precedents(self, key):
+        """Every cell the formula at `key` reads, ranges expanded."""
+        for ref in self.refs[key]:
+            if ref[0] == "ref":
+                yield ref[1:]
+                continue
+            sheet, r1, c1, r2, c2 = ref[1:]
+            for row in range(r1, r2 + 1):
+                for col in range(c1, c2 + 1):
+                    yield sheet, row, col
+
+    def dependencies(self, key):
+        """Formula cells the formula at `key` reads."""
+        return {cell for cell in self._precedents(key) if cell in self.code}
+
+    def dependents(self):
+        """{cell: formula cells that read it}, for constants and formulas alike."""
+        if self._dependents is None:
+            dependents = {}
+            for key in self.code:
+                for cell in self._precedents(key):
+                    dependents.setdefault(cell, set()).add(key)
+            self._dependents = dependents
+        return self._dependents
+
+    @property
+    def patterns(self):
+        """Number of distinct compiled formulas behind the formula cells."""
+        return len({id(code) for code in self.code.values()})
+
+    def order(self):
+        """Formula cells in dependency order (precedents first)."""
+        if self._order is None:
+            graph = {key: self.dependencies(key) for key in self.code}
+            try:
+                self._order = list(TopologicalSorter(graph).static_order())
+            except CycleError as exc:
+                raise CircularReferenceError(exc.args[1][:-1]) from None
+            self._position = {key: i for i, key in enumerate(self._order)}
+        return self._order
+
+    def evaluate(self):
+        """Compute every formula cell; returns the `values` dict."""
+        for key in self.order():
+            self._compute(key)
+        self._dirty.clear()
+        return self.values
+
+    def recalculate(self):
+        """
+        Recompute the formulas downstream of the cells edited since the last
+        evaluate() / recalculate(), once each, in dependency order. Returns the
+        recomputed cells.
+        """
+        dependents = self.dependents()
+        self.order()
+        stale = {key for key in self._dirty if key in self.code}
+        pending = list(self._dirty)
+        while pending:
+            for dependent in dependents.get(pending.pop(), ()):
+                if dependent not in stale:
+                    stale.add(dependent)
+                    pending.append(dependent)
+        self._dirty.clear()
+        stale = sorted(stale, key=self._position.__getitem__)
+        for key in stale:
+            self._compute(key)
+        return stale
+
+    def _compute(self, key):
+        try:
+            value = self.code[key](self.values, key[1], key[2])
+        except ExcelError as error:
+            value = error
+        self.values[key] = ExcelError(VALUE) if isinstance(value, list) else value
+
+    def value(self, sheet, coordinate):
+        """Value of a cell by its A1 coordinate (after evaluate())."""
+        return self.values.get((sheet, *coordinate_to_tuple(coordinate)))
+
+
+def evaluate_workbook(path):
+    """Load a workbook's formulas and return its evaluated FormulaModel."""
+    wb = openpyxl.load_workbook(path)
+    try:
+        model = FormulaModel.from_workbook(wb)
+    finally:
+        wb.close()
+    model.evaluate()
+    return model
+
+
+# =============================================================================
+# CHECK AGAINST EXCEL
+# =============================================================================
+
+
+def check_against_excel(path, tolerance=1e-9):
+    """
+    Evaluate `path` and compare each formula with the value Excel cached when
+    it last saved the file. Returns (matching, [(cell, ours, excel)], number
+    of distinct formula patterns).
+    """
+    model = evaluate_workbook(path)
+    cached = openpyxl.load_workbook(path, data_only=True)
+    matching, mismatches = 0, []
+    for key in model.order():
+        sheet, row, col = key
+        expected = cached[sheet].cell(row=row, column=col).value
+        if expected is None:
+            continue  # never calculated by Excel
+        ours = model.values[key]
+        if isinstance(expected, (int, float)) and isinstance(ours, (int, float)):
+            same = math.isclose(ours, expected, rel_tol=tolerance, abs_tol=tolerance)
+        elif isinstance(ours, ExcelError):
+            same = ours.code == expected
+        else:
+            same = ours == expected
+        if same:
+            matching += 1
+        else:
+            mismatches.append((cell_name(key), ours, expected))
+    cached.close()
+    return matching, mismatches, model.patterns
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "Module7.xlsm"
+    matching, mismatches, patterns = check_against_excel(target)
+    print(
+        f"{target}: {matching} formulas ({patterns} distinct patterns) match "
+        f"Excel, {len(mismatches)} differ"
+    )
+    for name, ours, expected in mismatches[:20]:
+        print(f"  {name}: {ours!r} (Excel: {expected!r})")
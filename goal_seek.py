@@ -0,0 +1,198 @@
+"""
+Goal Seek
+=========
+Batched root finding over the native models: which input value makes an
+output hit a target ("what FY2026 gross margin gives EPS of 13.045?", "what
+terminal growth justifies the current price?"), for one question or a whole
+coverage list at once.
+
+- goal_seek() solves N problems together: `func` maps an (N,) array of
+  inputs to an (N,) array of outputs, so each iteration is one vectorized
+  model evaluation however many problems are in the batch
+- Each problem starts from a bracket [low, high], its end nearer the target
+  pushed outward until the output crosses it; it is then narrowed with secant steps kept
+  inside the bracket (Illinois variant of regula falsi), which converges
+  superlinearly like Newton's method without needing derivatives and cannot
+  step outside the bracket
+- Problems that never bracket their target are reported as not converged
+  rather than raising, so one bad ticker does not sink the batch
+- driver_objective() and dcf_objective() turn any scenario_model driver /
+  line item or dcf_model input into such a function
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from dcf_model import dcf_inputs, implied_price
+from formula_engine import evaluate_workbook
+from scenario_model import Convergence, load_base_case, project_scenarios
+
+
+class Solution:
+    """Solved inputs, the outputs they give and per-problem convergence."""
+
+    def __init__(self, x, values, convergence):
+        self.x = x
+        self.values = values
+        self.convergence = convergence
+
+    def __repr__(self):
+        return f"Solution({len(self.x)} problems, {self.convergence})"
+
+
+def goal_seek(
+    func, target, low, high, tolerance=1e-9, max_iterations=100, max_expansions=30
+):
+    """
+    Find x with func(x) == target for every problem in the batch. `target`,
+    `low` and `high` are scalars or (N,) arrays; a problem has converged when
+    its output is within `tolerance` of its target.
+    """
+    target, low, high = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, float)) for value in (target, low, high))
+    )
+    a, b = np.minimum(low, high).astype(float), np.maximum(low, high).astype(float)
+    fa, fb = func(a) - target, func(b) - target
+
+    for _ in range(max_expansions):
+        unbracketed = np.sign(fa) * np.sign(fb) > 0
+        if not unbracketed.any():
+            break
+        # Grow the end nearer the target (smaller |f|), as in zbrac, so the
+        # search heads towards the root rather than across a pole
+        width = 1.6 * (b - a)
+        lower = unbracketed & (np.abs(fa) < np.abs(fb))
+        upper = unbracketed & ~lower
+        a = np.where(lower, a - width, a)
+        b = np.where(upper, b + width, b)
+        fa = np.where(lower, func(a) - target, fa)
+        fb = np.where(upper, func(b) - target, fb)
+    bracketed = np.sign(fa) * np.sign(fb) <= 0
+
+    x = np.where(np.abs(fa) < np.abs(fb), a, b)
+    fx = np.where(np.abs(fa) < np.abs(fb), fa, fb)
+    iterations = np.zeros(len(x), dtype=int)
+    done = ~bracketed | (np.abs(fx) <= tolerance)
+    side = np.zeros(len(x), dtype=int)  # endpoint replaced last: -1 a, +1 b
+    for iteration in range(1, max_iterations + 1):
+        if done.all():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = b - fb * (b - a) / (fb - fa)
+        inside = np.isfinite(step) & (step > a) & (step < b)
+        candidate = np.where(inside, step, (a + b) / 2)
+        candidate = np.where(done, x, candidate)
+        fc = func(candidate) - target
+
+        active = ~done
+        x = np.where(active, candidate, x)
+        fx = np.where(active, fc, fx)
+        replace_a = active & (np.sign(fc) == np.sign(fa))
+        replace_b = active & ~replace_a
+        # Illinois: halve the stale endpoint's value when the same side moves
+        # twice, so the secant does not stall against it
+        fb = np.where(replace_a & (side == -1), fb / 2, fb)
+        fa = np.where(replace_b & (side == 1), fa / 2, fa)
+        a, fa = np.where(replace_a, candidate, a), np.where(replace_a, fc, fa)
+        b, fb = np.where(replace_b, candidate, b), np.where(replace_b, fc, fb)
+        side = np.where(replace_a, -1, np.where(replace_b, 1, side))
+
+        solved = active & (np.abs(fc) <= tolerance)
+        iterations[solved] = iteration
+        done |= solved
+
+    residuals = np.where(bracketed, np.abs(fx), np.inf)
+    return Solution(x, fx + target, Convergence(iterations, residuals, tolerance))
+
+
+# =============================================================================
+# OBJECTIVES
+# =============================================================================
+
+
+def driver_objective(opening, drivers, periods, driver, output, period, at=None):
+    """
+    func(x) setting scenario_model driver `driver` to x (in period `at`, or
+    every period) and returning line item `output` in `period`. Drivers,
+    and opening balances as (N, 1) arrays, may differ by problem.
+    """
+    column = periods.index(period)
+    base = np.asarray(drivers[driver], float)
+    if base.ndim < 2:
+        base = base.reshape(-1, 1)
+
+    def func(x):
+        path = np.array(np.broadcast_to(base, (len(x), len(periods))))
+        if at is None:
+            path[:] = x[:, None]
+        else:
+            path[:, periods.index(at)] = x
+        results = project_scenarios(opening, dict(drivers, **{driver: path}), periods)
+        return results[output][:, column]
+
+    return func
+
+
+def dcf_objective(inputs, name):
+    """func(x) setting dcf_model input `name` to x, returning the share price."""
+
+    def func(x):
+        return implied_price(dict(inputs, **{name: x}))
+
+    return func
+
+
+if __name__ == "__main__":
+    # python goal_seek.py <updated Module7 workbook>
+    opening, base, periods = load_base_case()
+
+    margin = goal_seek(
+        driver_objective(
+            opening, base, periods, "Gross_Margin", "EPS", periods[0], at=periods[0]
+        ),
+        13.045,
+        0.4,
+        0.7,
+    )
+    print(
+        f"{periods[0]} gross margin for EPS 13.045: {margin.x[0]:.4%} "
+        f"(EPS {margin.values[0]:.4f}, {margin.convergence})"
+    )
+
+    inputs = dcf_inputs(evaluate_workbook(sys.argv[1]))
+    # Keep the bracket below WACC: the Gordon value has a pole at g = WACC
+    growth = goal_seek(
+        dcf_objective(inputs, "Terminal_Growth"), inputs["Price"], 0.0, 0.1
+    )
+    print(
+        f"Terminal growth for ${inputs['Price']:.2f}: {growth.x[0]:.4%} "
+        f"(price {growth.values[0]:.2f}, {growth.convergence})"
+    )
+
+    # A coverage list: each ticker its own scale, margins and FY2028E EPS
+    # target, solved for the flat revenue growth that reaches it
+    n = 5_000
+    rng = np.random.default_rng(0)
+    scale = rng.uniform(0.2, 3.0, (n, 1))
+    coverage = {name: value * scale for name, value in opening.items()}
+    drivers = dict(
+        base,
+        Gross_Margin=base["Gross_Margin"] + rng.normal(0, 0.02, (n, 1)),
+        Other_OpEx=base["Other_OpEx"] * scale,
+        Other_NonOp_Exp=base["Other_NonOp_Exp"] * scale,
+        Diluted_Shares=opening["Diluted_Shares"] * scale[:, 0],
+    )
+    targets = rng.normal(14.0, 1.5, n)
+    start = time.perf_counter()
+    batch = goal_seek(
+        driver_objective(
+            coverage, drivers, periods, "Revenue_Growth", "EPS", periods[-1]
+        ),
+        targets,
+        -0.1,
+        0.2,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"{n:,} goal seeks in {elapsed * 1e3:.1f} ms; {batch.convergence}")
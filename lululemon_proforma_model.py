@@ -17,39 +17,157 @@ Source Citations:
 - Historical data: Lululemon 10-K filings, company earnings reports
 """
 
-import openpyxl
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, numbers
+import numpy as np
 from openpyxl.utils import get_column_letter
-from openpyxl.formatting.rule import FormulaRule
 
+from driver_ratios import DAYS
+from financial_store import FinancialStore
+from scenario_model import FIXED_DRIVERS, solve_financing
+from sheet_writer import SheetWriter, StyleRegistry, Styled, new_workbook
 
-def create_lululemon_model():
-    wb = Workbook()
 
-    # Create sheets
-    ws_income = wb.active
-    ws_income.title = "Income Statement"
+def solved_interest(consensus, given, ratios, balances):
+    """
+    Interest income on average cash and expense on average debt for the
+    estimate years, solved with the cash they earn (scenario_model). The
+    projection is the workbook's own: its ratios and given lines, from the
+    first column's `balances`.
+    """
+    revenue = consensus["Revenue"]
+    cogs = revenue * ratios["COGS_Pct"]
+    da = revenue * ratios["DA_Pct"]
+    # Gross PPE grows by CapEx and accumulated depreciation by D&A
+    net_ppe = balances["Gross_PPE"] + balances["Accumulated_DA"]
+    net_ppe += np.cumsum(
+        np.concatenate([[0.0], revenue[1:] * (ratios["CapEx_Pct"] - ratios["DA_Pct"])])
+    )
+    opening = {
+        "Revenue": revenue[0],
+        "Net_PPE": net_ppe[0],
+        "Cash": balances["Cash"],
+        "Receivables": revenue[0] / DAYS * ratios["DSO"],
+        "Inventory": cogs[0] / DAYS * ratios["DIO"],
+        "AP": cogs[0] / DAYS * ratios["DPO"],
+        "Total_Debt": given["Long_Term_Debt"][0],
+        # Only the interest lines are read back
+        "Retained_Earnings": np.nan,
+        "Total_Assets": np.nan,
+        "Total_Liabilities": np.nan,
+        "Total_Equity": np.nan,
+    }
+    # Every given cash flow, with the prepaid and accrued balance changes
+    other_flows = sum(
+        given[name]
+        for name in (
+            "Stock_Comp",
+            "Deferred_Taxes",
+            "Other_WC",
+            "Investments",
+            "Other_Invest",
+            "Repurchases",
+            "Option_Exercises",
+            "Debt_Repayments",
+            "Other_Financing",
+        )
+    ) + np.diff(given["Accrued"] - given["Prepaid"], prepend=np.nan)
+    drivers = dict(
+        FIXED_DRIVERS,
+        Revenue_Growth=consensus["Revenue_Growth"][None, 1:],
+        Gross_Margin=1 - ratios["COGS_Pct"],
+        SGA_Pct=ratios["SGA_Pct"],
+        DA_Pct=ratios["DA_Pct"],
+        Tax_Rate=ratios["Tax_Rate"],
+        DSO=ratios["DSO"],
+        DIO=ratios["DIO"],
+        DPO=ratios["DPO"],
+        # D&A sits above EBIT here; no minimum cash, so no revolver
+        Other_OpEx=da[None, 1:],
+        Other_NonOp_Exp=-given["Other_Income"][None, 1:],
+        PPE_Growth=(net_ppe[1:] / net_ppe[:-1] - 1)[None, :],
+        Net_Financing=other_flows[None, 1:],
+        Diluted_Shares=given["Shares"][None, 1:],
+        Cash_Pct=0.0,
+        Debt_Rate=ratios["Debt_Rate"],
+    )
+    return solve_financing(opening, drivers, consensus.periods[1:]).scenario(0)
+
+
+def create_lululemon_model(write_only=False, direct=False):
+    wb = new_workbook(write_only, direct)
+
+    # Create sheets; every sheet is written top to bottom via SheetWriter
+    ws_income = wb.create_sheet("Income Statement")
     ws_balance = wb.create_sheet("Balance Sheet")
     ws_cashflow = wb.create_sheet("Cash Flow Statement")
     ws_assumptions = wb.create_sheet("Assumptions & Sources")
 
-    # Styling
-    header_font = Font(bold=True, size=12)
-    title_font = Font(bold=True, size=14)
-    border = Border(bottom=Side(style="thin"), top=Side(style="thin"))
-    dollar_format = "#,##0"
-    percent_format = "0.0%"
-    header_fill = PatternFill(
-        start_color="1F4E79", end_color="1F4E79", fill_type="solid"
+    # Styling: named styles shared by every cell (sheet_writer.STYLES), with
+    # whole-dollar figures
+    styles = StyleRegistry(wb, {"dollar": {"number_format": "#,##0"}})
+
+    # Street consensus revenue, one column per fiscal year
+    consensus = FinancialStore(
+        ["FY2024", "FY2025E", "FY2026E", "FY2027E"],
+        {"Revenue": [10570, 11200, 12100, 13000]},
+    )
+    consensus["Revenue_Growth"] = consensus.growth("Revenue")
+    growth = [
+        f"{g:.1%}" for g in consensus.row("Revenue_Growth", consensus.periods[1:])
+    ]
+
+    # Operating ratios, used by the statement formulas and the interest solve
+    ratios = {
+        "COGS_Pct": 0.43,
+        "SGA_Pct": 0.33,
+        "DA_Pct": 0.04,
+        "Tax_Rate": 0.27,
+        "CapEx_Pct": 0.05,
+        "DSO": 5,
+        "DIO": 120,
+        "DPO": 30,
+        # 15 a year on the 400 of long-term debt, as in FY2024
+        "Debt_Rate": 0.0375,
+    }
+
+    # First-year balances the projection rolls forward from
+    balances = {"Cash": 1850, "Gross_PPE": 2800, "Accumulated_DA": -900}
+
+    # Lines entered as given rather than derived, one column per year
+    given = FinancialStore(
+        consensus.periods,
+        {
+            "Other_Income": [10, 10, 10, 10],
+            "Shares": [125, 124, 123, 122],
+            "Prepaid": [150, 160, 170, 180],
+            "Accrued": [400, 420, 450, 480],
+            "Long_Term_Debt": [400, 400, 400, 400],
+            "Stock_Comp": [120, 130, 140, 150],
+            "Deferred_Taxes": [15, 10, 10, 10],
+            "Other_WC": [50, 30, 35, 40],
+            "Investments": [-50, -60, -70, -80],
+            "Other_Invest": [-20, -25, -25, -25],
+            "Repurchases": [-800, -100, -100, -100],
+            "Option_Exercises": [30, 35, 40, 45],
+            "Debt_Repayments": [0, 0, 0, 0],
+            "Other_Financing": [-15, -15, -15, -15],
+        },
     )
-    header_font_white = Font(bold=True, color="FFFFFF", size=11)
+    interest = solved_interest(consensus, given, ratios, balances)
 
     # =========================================================================
     # ASSUMPTIONS & SOURCES SHEET
     # =========================================================================
-    ws_assumptions["A1"] = "LULULEMON ATHLETICA - PRO FORMA MODEL ASSUMPTIONS & SOURCES"
-    ws_assumptions["A1"].font = Font(bold=True, size=16)
+    assumptions = SheetWriter(ws_assumptions, styles)
+    assumptions.widths({"A": 30, "B": 20, "C": 50, "D": 40})
+    assumptions.row(
+        1,
+        [
+            Styled(
+                "LULULEMON ATHLETICA - PRO FORMA MODEL ASSUMPTIONS & SOURCES",
+                style="heading",
+            )
+        ],
+    )
 
     assumptions_data = [
         ["", ""],
@@ -60,10 +178,20 @@ def create_lululemon_model():
         ],
         ["", ""],
         ["Fiscal Year", "Revenue ($M)", "Growth Rate", "Source"],
-        ["FY2024 (Actual)", 10570, "-", "Lululemon 10-K Annual Report"],
-        ["FY2025E", 11200, "6.0%", "Wall Street Consensus (Yahoo Finance)"],
-        ["FY2026E", 12100, "8.0%", "Wall Street Consensus (Bloomberg)"],
-        ["FY2027E", 13000, "7.4%", "Wall Street Consensus (FactSet)"],
+        *[
+            [label, revenue, rate, source]
+            for label, revenue, rate, source in zip(
+                ["FY2024 (Actual)", "FY2025E", "FY2026E", "FY2027E"],
+                consensus.row("Revenue"),
+                ["-", *growth],
+                [
+                    "Lululemon 10-K Annual Report",
+                    "Wall Street Consensus (Yahoo Finance)",
+                    "Wall Street Consensus (Bloomberg)",
+                    "Wall Street Consensus (FactSet)",
+                ],
+            )
+        ],
         ["", ""],
         ["KEY OPERATING ASSUMPTIONS", ""],
         ["Gross Margin", "57.0%", "Based on historical average and company guidance"],
@@ -90,67 +218,83 @@ def create_lululemon_model():
     ]
 
     for row_idx, row_data in enumerate(assumptions_data, start=3):
-        for col_idx, value in enumerate(row_data, start=1):
-            cell = ws_assumptions.cell(row=row_idx, column=col_idx, value=value)
-            if row_idx == 3 or row_idx == 12 or row_idx == 18 or row_idx == 24:
-                cell.font = Font(bold=True, size=12)
-
-    # Adjust column widths
-    ws_assumptions.column_dimensions["A"].width = 30
-    ws_assumptions.column_dimensions["B"].width = 20
-    ws_assumptions.column_dimensions["C"].width = 50
-    ws_assumptions.column_dimensions["D"].width = 40
+        if row_idx == 3 or row_idx == 12 or row_idx == 18 or row_idx == 24:
+            row_data = [Styled(v, style="section") for v in row_data]
+        assumptions.row(row_idx, row_data)
 
     # =========================================================================
     # INCOME STATEMENT
     # =========================================================================
     years = ["FY2024A", "FY2025E", "FY2026E", "FY2027E"]
 
+    def statement_header(ws, title, label_width):
+        # Title block and the fiscal-year header row shared by the statements
+        writer = SheetWriter(ws, styles)
+        writer.widths(
+            {"A": label_width, **{get_column_letter(i): 15 for i in range(2, 6)}}
+        )
+        writer.row(1, [Styled("LULULEMON ATHLETICA INC.", style="title")])
+        writer.row(2, [Styled(title, style="subtitle")])
+        writer.row(4, [None] + [Styled(year, style="header") for year in years])
+        return writer
+
+    def statement_rows(writer, data, bold_labels=(), percent_rows=False):
+        # Label in A, values in B:E; placeholders (None) are left out entirely
+        # and the CHECK row is ruled off
+        for row_idx, row_data in enumerate(data, start=5):
+            label = row_data[0]
+            check = label.startswith("CHECK")
+            if check:
+                cells = [Styled(label, style="check")]
+            elif label in bold_labels:
+                cells = [Styled(label, style="bold")]
+            else:
+                cells = [label]
+            percent = percent_rows and (
+                "Margin" in label or "Growth" in label or "Rate" in label
+            )
+            for value in row_data[1:]:
+                if value is None:
+                    cells.append(None)
+                elif percent:
+                    cells.append(Styled(value, style="percent"))
+                elif isinstance(value, (int, float)):
+                    cells.append(Styled(value, style="dollar"))
+                elif check:
+                    cells.append(Styled(value, style="check"))
+                else:
+                    cells.append(value)
+            writer.row(row_idx, cells)
+
     # Headers
-    ws_income["A1"] = "LULULEMON ATHLETICA INC."
-    ws_income["A1"].font = title_font
-    ws_income["A2"] = "Pro Forma Income Statement ($ in millions)"
-    ws_income["A2"].font = Font(italic=True)
-
-    # Column headers
-    for i, year in enumerate(years):
-        cell = ws_income.cell(row=4, column=i + 2, value=year)
-        cell.font = header_font_white
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
+    income_writer = statement_header(
+        ws_income, "Pro Forma Income Statement ($ in millions)", 35
+    )
 
     # Income Statement Data (in millions)
     # Revenue: Street consensus estimates
     income_data = [
-        ["Net Revenue", 10570, 11200, 12100, 13000],  # Consensus estimates
+        ["Net Revenue", *consensus.row("Revenue")],  # Consensus estimates
         ["  YoY Growth %", None, "=B5/B5-1", "=D5/C5-1", "=E5/D5-1"],
         ["", None, None, None, None],
-        [
-            "Cost of Goods Sold",
-            "=B5*0.43",
-            "=C5*0.43",
-            "=D5*0.43",
-            "=E5*0.43",
-        ],  # 43% COGS
+        ["Cost of Goods Sold", *[f"={c}5*{ratios['COGS_Pct']}" for c in "BCDE"]],
         ["Gross Profit", "=B5-B8", "=C5-C8", "=D5-D8", "=E5-E8"],
         ["  Gross Margin %", "=B9/B5", "=C9/C5", "=D9/D5", "=E9/E5"],
         ["", None, None, None, None],
         [
             "Selling, General & Administrative",
-            "=B5*0.33",
-            "=C5*0.33",
-            "=D5*0.33",
-            "=E5*0.33",
+            *[f"={c}5*{ratios['SGA_Pct']}" for c in "BCDE"],
         ],
-        ["Depreciation & Amortization", "=B5*0.04", "=C5*0.04", "=D5*0.04", "=E5*0.04"],
+        ["Depreciation & Amortization", *[f"={c}5*{ratios['DA_Pct']}" for c in "BCDE"]],
         ["Total Operating Expenses", "=B12+B13", "=C12+C13", "=D12+D13", "=E12+E13"],
         ["", None, None, None, None],
         ["Operating Income (EBIT)", "=B9-B14", "=C9-C14", "=D9-D14", "=E9-E14"],
         ["  Operating Margin %", "=B16/B5", "=C16/C5", "=D16/D5", "=E16/E5"],
         ["", None, None, None, None],
-        ["Interest Expense", -15, -15, -15, -15],
-        ["Interest Income", 50, 55, 60, 65],
-        ["Other Income/(Expense)", 10, 10, 10, 10],
+        # FY2024 as reported; estimates solved on average cash and debt
+        ["Interest Expense", -15, *[-v for v in interest.row("Interest_Expense")]],
+        ["Interest Income", 50, *interest.row("Interest_Income")],
+        ["Other Income/(Expense)", *given.row("Other_Income")],
         ["", None, None, None, None],
         [
             "Pre-Tax Income (EBT)",
@@ -159,76 +303,44 @@ def create_lululemon_model():
             "=D16+D19+D20+D21",
             "=E16+E19+E20+E21",
         ],
-        [
-            "Income Tax Expense",
-            "=B23*0.27",
-            "=C23*0.27",
-            "=D23*0.27",
-            "=E23*0.27",
-        ],  # 27% tax rate
+        ["Income Tax Expense", *[f"={c}23*{ratios['Tax_Rate']}" for c in "BCDE"]],
         ["  Effective Tax Rate", "=B24/B23", "=C24/C23", "=D24/D23", "=E24/E23"],
         ["", None, None, None, None],
         ["Net Income", "=B23-B24", "=C23-C24", "=D23-D24", "=E23-E24"],
         ["  Net Margin %", "=B27/B5", "=C27/C5", "=D27/D5", "=E27/E5"],
         ["", None, None, None, None],
-        ["Shares Outstanding (M)", 125, 124, 123, 122],
+        ["Shares Outstanding (M)", *given.row("Shares")],
         ["Earnings Per Share (EPS)", "=B27/B30", "=C27/C30", "=D27/D30", "=E27/E30"],
     ]
 
-    for row_idx, row_data in enumerate(income_data, start=5):
-        ws_income.cell(row=row_idx, column=1, value=row_data[0])
-        for col_idx, value in enumerate(row_data[1:], start=2):
-            cell = ws_income.cell(row=row_idx, column=col_idx, value=value)
-            if isinstance(value, (int, float)) and value is not None:
-                cell.number_format = dollar_format
-            if (
-                "Margin" in str(row_data[0])
-                or "Growth" in str(row_data[0])
-                or "Rate" in str(row_data[0])
-            ):
-                cell.number_format = percent_format
-
-    # Format row labels
-    ws_income.column_dimensions["A"].width = 35
-    for i in range(2, 6):
-        ws_income.column_dimensions[get_column_letter(i)].width = 15
+    statement_rows(income_writer, income_data, percent_rows=True)
 
     # =========================================================================
     # BALANCE SHEET
     # =========================================================================
-    ws_balance["A1"] = "LULULEMON ATHLETICA INC."
-    ws_balance["A1"].font = title_font
-    ws_balance["A2"] = "Pro Forma Balance Sheet ($ in millions)"
-    ws_balance["A2"].font = Font(italic=True)
-
-    # Column headers
-    for i, year in enumerate(years):
-        cell = ws_balance.cell(row=4, column=i + 2, value=year)
-        cell.font = header_font_white
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
+    balance_writer = statement_header(
+        ws_balance, "Pro Forma Balance Sheet ($ in millions)", 35
+    )
 
     # Balance Sheet Data
     balance_data = [
         ["ASSETS", None, None, None, None],
         ["Current Assets:", None, None, None, None],
-        ["  Cash & Cash Equivalents", 1850, "=C30", "=D30", "=E30"],  # Links to CF
+        [
+            "  Cash & Cash Equivalents",
+            balances["Cash"],
+            *[f"='Cash Flow Statement'!{c}35" for c in "CDE"],  # Links to CF
+        ],
         ["  Short-term Investments", 200, 220, 240, 260],
         [
             "  Accounts Receivable",
-            "='Income Statement'!B5*5/365",
-            "='Income Statement'!C5*5/365",
-            "='Income Statement'!D5*5/365",
-            "='Income Statement'!E5*5/365",
+            *[f"='Income Statement'!{c}5*{ratios['DSO']}/365" for c in "BCDE"],
         ],
         [
             "  Inventory",
-            "='Income Statement'!B8*120/365",
-            "='Income Statement'!C8*120/365",
-            "='Income Statement'!D8*120/365",
-            "='Income Statement'!E8*120/365",
+            *[f"='Income Statement'!{c}8*{ratios['DIO']}/365" for c in "BCDE"],
         ],
-        ["  Prepaid Expenses", 150, 160, 170, 180],
+        ["  Prepaid Expenses", *given.row("Prepaid")],
         [
             "Total Current Assets",
             "=SUM(B7:B11)",
@@ -240,14 +352,15 @@ def create_lululemon_model():
         ["Non-Current Assets:", None, None, None, None],
         [
             "  Property, Plant & Equipment (Gross)",
-            2800,
-            "=B15+'Income Statement'!C5*0.05",
-            "=C15+'Income Statement'!D5*0.05",
-            "=D15+'Income Statement'!E5*0.05",
+            balances["Gross_PPE"],
+            *[
+                f"={p}15+'Income Statement'!{c}5*{ratios['CapEx_Pct']}"
+                for p, c in zip("BCD", "CDE")
+            ],
         ],
         [
             "  Accumulated Depreciation",
-            -900,
+            balances["Accumulated_DA"],
             "=B16-'Income Statement'!C13",
             "=C16-'Income Statement'!D13",
             "=D16-'Income Statement'!E13",
@@ -270,12 +383,9 @@ def create_lululemon_model():
         ["Current Liabilities:", None, None, None, None],
         [
             "  Accounts Payable",
-            "='Income Statement'!B8*30/365",
-            "='Income Statement'!C8*30/365",
-            "='Income Statement'!D8*30/365",
-            "='Income Statement'!E8*30/365",
+            *[f"='Income Statement'!{c}8*{ratios['DPO']}/365" for c in "BCDE"],
         ],
-        ["  Accrued Liabilities", 400, 420, 450, 480],
+        ["  Accrued Liabilities", *given.row("Accrued")],
         ["  Deferred Revenue", 200, 210, 225, 240],
         ["  Current Lease Liabilities", 180, 190, 200, 210],
         ["  Other Current Liabilities", 100, 105, 110, 115],
@@ -288,7 +398,7 @@ def create_lululemon_model():
         ],
         ["", None, None, None, None],
         ["Non-Current Liabilities:", None, None, None, None],
-        ["  Long-term Debt", 400, 400, 400, 400],
+        ["  Long-term Debt", *given.row("Long_Term_Debt")],
         ["  Non-Current Lease Liabilities", 1100, 1150, 1200, 1250],
         ["  Deferred Tax Liabilities", 150, 160, 170, 180],
         ["  Other Non-Current Liabilities", 80, 85, 90, 95],
@@ -333,9 +443,10 @@ def create_lululemon_model():
         ],
     ]
 
-    for row_idx, row_data in enumerate(balance_data, start=5):
-        cell_a = ws_balance.cell(row=row_idx, column=1, value=row_data[0])
-        if row_data[0] in [
+    statement_rows(
+        balance_writer,
+        balance_data,
+        [
             "ASSETS",
             "LIABILITIES",
             "SHAREHOLDERS' EQUITY",
@@ -343,31 +454,15 @@ def create_lululemon_model():
             "TOTAL LIABILITIES",
             "TOTAL SHAREHOLDERS' EQUITY",
             "TOTAL LIABILITIES & EQUITY",
-        ]:
-            cell_a.font = Font(bold=True)
-        for col_idx, value in enumerate(row_data[1:], start=2):
-            cell = ws_balance.cell(row=row_idx, column=col_idx, value=value)
-            if isinstance(value, (int, float)) and value is not None:
-                cell.number_format = dollar_format
-
-    ws_balance.column_dimensions["A"].width = 35
-    for i in range(2, 6):
-        ws_balance.column_dimensions[get_column_letter(i)].width = 15
+        ],
+    )
 
     # =========================================================================
     # CASH FLOW STATEMENT
     # =========================================================================
-    ws_cashflow["A1"] = "LULULEMON ATHLETICA INC."
-    ws_cashflow["A1"].font = title_font
-    ws_cashflow["A2"] = "Pro Forma Cash Flow Statement ($ in millions)"
-    ws_cashflow["A2"].font = Font(italic=True)
-
-    # Column headers
-    for i, year in enumerate(years):
-        cell = ws_cashflow.cell(row=4, column=i + 2, value=year)
-        cell.font = header_font_white
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
+    cashflow_writer = statement_header(
+        ws_cashflow, "Pro Forma Cash Flow Statement ($ in millions)", 38
+    )
 
     # Cash Flow Data
     cashflow_data = [
@@ -387,8 +482,8 @@ def create_lululemon_model():
             "='Income Statement'!D13",
             "='Income Statement'!E13",
         ],
-        ["  Stock-Based Compensation", 120, 130, 140, 150],
-        ["  Deferred Income Taxes", 15, 10, 10, 10],
+        ["  Stock-Based Compensation", *given.row("Stock_Comp")],
+        ["  Deferred Income Taxes", *given.row("Deferred_Taxes")],
         ["Changes in Working Capital:", None, None, None, None],
         [
             "  (Increase)/Decrease in Receivables",
@@ -425,7 +520,7 @@ def create_lululemon_model():
             "='Balance Sheet'!D28-'Balance Sheet'!C28",
             "='Balance Sheet'!E28-'Balance Sheet'!D28",
         ],
-        ["  Other Working Capital Changes", 50, 30, 35, 40],
+        ["  Other Working Capital Changes", *given.row("Other_WC")],
         [
             "Net Cash from Operating Activities",
             "=SUM(B6:B17)",
@@ -437,13 +532,10 @@ def create_lululemon_model():
         ["INVESTING ACTIVITIES", None, None, None, None],
         [
             "  Capital Expenditures (CapEx)",
-            "=-'Income Statement'!B5*0.05",
-            "=-'Income Statement'!C5*0.05",
-            "=-'Income Statement'!D5*0.05",
-            "=-'Income Statement'!E5*0.05",
+            *[f"=-'Income Statement'!{c}5*{ratios['CapEx_Pct']}" for c in "BCDE"],
         ],
-        ["  Purchases of Investments", -50, -60, -70, -80],
-        ["  Other Investing Activities", -20, -25, -25, -25],
+        ["  Purchases of Investments", *given.row("Investments")],
+        ["  Other Investing Activities", *given.row("Other_Invest")],
         [
             "Net Cash from Investing Activities",
             "=SUM(B21:B23)",
@@ -453,10 +545,10 @@ def create_lululemon_model():
         ],
         ["", None, None, None, None],
         ["FINANCING ACTIVITIES", None, None, None, None],
-        ["  Repurchase of Common Stock", -800, -100, -100, -100],
-        ["  Stock Option Exercises", 30, 35, 40, 45],
-        ["  Debt Repayments", 0, 0, 0, 0],
-        ["  Other Financing Activities", -15, -15, -15, -15],
+        ["  Repurchase of Common Stock", *given.row("Repurchases")],
+        ["  Stock Option Exercises", *given.row("Option_Exercises")],
+        ["  Debt Repayments", *given.row("Debt_Repayments")],
+        ["  Other Financing Activities", *given.row("Other_Financing")],
         [
             "Net Cash from Financing Activities",
             "=SUM(B27:B30)",
@@ -482,9 +574,10 @@ def create_lululemon_model():
         ["Ending Cash Balance", "=B33+B34", "=C33+C34", "=D33+D34", "=E33+E34"],
     ]
 
-    for row_idx, row_data in enumerate(cashflow_data, start=5):
-        cell_a = ws_cashflow.cell(row=row_idx, column=1, value=row_data[0])
-        if row_data[0] in [
+    statement_rows(
+        cashflow_writer,
+        cashflow_data,
+        [
             "OPERATING ACTIVITIES",
             "INVESTING ACTIVITIES",
             "FINANCING ACTIVITIES",
@@ -493,16 +586,8 @@ def create_lululemon_model():
             "Net Cash from Financing Activities",
             "Net Change in Cash",
             "Ending Cash Balance",
-        ]:
-            cell_a.font = Font(bold=True)
-        for col_idx, value in enumerate(row_data[1:], start=2):
-            cell = ws_cashflow.cell(row=row_idx, column=col_idx, value=value)
-            if isinstance(value, (int, float)) and value is not None:
-                cell.number_format = dollar_format
-
-    ws_cashflow.column_dimensions["A"].width = 38
-    for i in range(2, 6):
-        ws_cashflow.column_dimensions[get_column_letter(i)].width = 15
+        ],
+    )
 
     # Save workbook
     filepath = r"c:\Users\nduta\OneDrive\Desktop\Projects\lulu-lemon-project\Lululemon_ProForma_Model.xlsx"
@@ -0,0 +1,351 @@
+"""
+Monte Carlo Simulation
+======================
+Simulates the pro forma over the assumptions block update_module7_final.py
+writes to IncomeStatement A32:C37 (revenue growth, gross margin, SG&A %, tax
+rate, other opex) and reports distributions of EPS, free cash flow and the
+DCF implied share price.
+
+- Each assumption gets a distribution of its additive shock to the base path
+  (the block of an updated workbook, over the consensus case of
+  scenario_model): ("normal", sd), ("uniform", low, high) or ("triangular",
+  low, mode, high); one draw per path moves every forecast year
+- Correlations between assumptions go through a Gaussian copula: correlated
+  standard normals from the Cholesky factor of the correlation matrix, mapped
+  to each marginal through its inverse CDF
+- Paths are drawn and projected in vectorized chunks (scenario_model), then
+  folded into streaming aggregates and discarded, so memory is set by the
+  chunk size rather than the path count
+- Mean and variance are merged chunk by chunk (Chan et al.); quantiles come
+  from a fixed-size histogram sketch whose range doubles when a chunk falls
+  outside it, accurate to one bin (range / bins)
+- The DCF follows the workbook's DCF sheet: its inputs (WACC, terminal
+  growth, shares) come from dcf_model.dcf_inputs on the updated workbook, and
+  each path's projected FCF is valued as dcf_model.implied_price does
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from dcf_model import dcf_inputs, implied_price
+from scenario_model import load_base_case, project_scenarios
+
+# Driver -> row of the IncomeStatement assumptions block (FY 2026E in B,
+# FY 2027E in C)
+ASSUMPTION_ROWS = {
+    "Revenue_Growth": 33,
+    "Gross_Margin": 34,
+    "SGA_Pct": 35,
+    "Tax_Rate": 36,
+    "Other_OpEx": 37,
+}
+
+# Driver -> (distribution, parameters...) of its shock to the base path
+DISTRIBUTIONS = {
+    "Revenue_Growth": ("normal", 0.02),
+    "Gross_Margin": ("normal", 0.01),
+    "SGA_Pct": ("triangular", -0.005, 0.0, 0.01),
+    "Tax_Rate": ("uniform", -0.02, 0.02),
+    "Other_OpEx": ("normal", 10.0),
+}
+
+# (driver, driver) -> correlation of their shocks; unlisted pairs are 0
+CORRELATIONS = {
+    ("Revenue_Growth", "Gross_Margin"): 0.5,
+    ("Revenue_Growth", "SGA_Pct"): -0.3,
+}
+
+OUTPUTS = ("EPS", "FCF")
+
+
+# =============================================================================
+# STREAMING AGGREGATES
+# =============================================================================
+
+
+class RunningMoments:
+    """Count, mean and variance of a stream, merged one chunk at a time."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+
+    def update(self, values):
+        n = len(values)
+        if not n:
+            return
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """
+    Fixed-size histogram over a range that doubles (merging bin pairs) when a
+    value falls outside it; quantiles interpolate within a bin.
+    """
+
+    def __init__(self, bins=4096):
+        if bins % 2:
+            raise ValueError("bins must be even")
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.low = None
+        self.width = None
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        if not len(values):
+            return
+        low, high = values.min(), values.max()
+        self.min, self.max = min(self.min, low), max(self.max, high)
+        bins = len(self.counts)
+        if self.low is None:
+            self.low = low
+            self.width = (high - low) / bins or max(abs(low), 1.0) * 1e-9
+        while low < self.low or high >= self.low + bins * self.width:
+            self._widen(downward=low < self.low)
+        index = np.minimum(((values - self.low) / self.width).astype(int), bins - 1)
+        self.counts += np.bincount(index, minlength=bins)
+
+    def _widen(self, downward):
+        half = len(self.counts) // 2
+        merged = self.counts.reshape(half, 2).sum(axis=1)
+        empty = np.zeros(half, dtype=np.int64)
+        if downward:
+            self.low -= len(self.counts) * self.width
+            self.counts = np.concatenate([empty, merged])
+        else:
+            self.counts = np.concatenate([merged, empty])
+        self.width *= 2
+
+    def quantile(self, q):
+        """Value below which a fraction `q` (scalar or array) of the stream lies."""
+        cumulative = np.cumsum(self.counts)
+        target = np.asarray(q, float) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, target), len(cumulative) - 1)
+        before = np.where(index > 0, cumulative[index - 1], 0)
+        inside = np.where(
+            self.counts[index] > 0, (target - before) / self.counts[index], 0.0
+        )
+        return np.clip(self.low + (index + inside) * self.width, self.min, self.max)
+
+
+class Aggregate:
+    """Streaming moments and quantiles of one simulated output."""
+
+    def __init__(self, bins=4096):
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch(bins)
+
+    def update(self, values):
+        values = values[np.isfinite(values)]
+        self.moments.update(values)
+        self.sketch.update(values)
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    @property
+    def mean(self):
+        return self.moments.mean
+
+    @property
+    def std(self):
+        return self.moments.std
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+
+class Simulation:
+    """Output name ("EPS FY2026E", "Share_Price", ...) -> Aggregate."""
+
+    def __init__(self, aggregates, paths):
+        self.aggregates = aggregates
+        self.paths = paths
+
+    def __iter__(self):
+        return iter(self.aggregates)
+
+    def __getitem__(self, name):
+        return self.aggregates[name]
+
+    def summary(self, quantiles=(0.05, 0.5, 0.95)):
+        """{output: {"mean", "std", "p5", ...}} for reporting."""
+        return {
+            name: {
+                "mean": aggregate.mean,
+                "std": aggregate.std,
+                **{
+                    f"p{q * 100:g}": value
+                    for q, value in zip(quantiles, aggregate.quantile(quantiles))
+                },
+            }
+            for name, aggregate in self.aggregates.items()
+        }
+
+
+# =============================================================================
+# DRAWS
+# =============================================================================
+
+
+def _normal_cdf(z):
+    # Abramowitz & Stegun 7.1.26 erf, absolute error below 1.5e-7
+    x = np.abs(z) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * x)
+    poly = t * (
+        0.254829592
+        + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429)))
+    )
+    erf = 1 - poly * np.exp(-x * x)
+    return 0.5 * (1 + np.sign(z) * erf)
+
+
+def _marginal(spec, z):
+    """Map standard normals `z` onto the distribution `spec`."""
+    kind, *params = spec
+    if kind == "normal":
+        (sd,) = params
+        return sd * z
+    u = _normal_cdf(z)
+    if kind == "uniform":
+        low, high = params
+        return low + (high - low) * u
+    if kind == "triangular":
+        low, mode, high = params
+        split = (mode - low) / (high - low)
+        return np.where(
+            u < split,
+            low + np.sqrt(u * (high - low) * (mode - low)),
+            high - np.sqrt((1 - u) * (high - low) * (high - mode)),
+        )
+    raise ValueError(f"Unknown distribution {kind!r}")
+
+
+def correlation_matrix(names, correlations):
+    """Symmetric correlation matrix over `names` from {(a, b): rho}."""
+    matrix = np.eye(len(names))
+    for (a, b), rho in correlations.items():
+        i, j = names.index(a), names.index(b)
+        matrix[i, j] = matrix[j, i] = rho
+    return matrix
+
+
+def draw_shocks(rng, n, distributions, cholesky):
+    """{driver: (n,) shocks}, correlated through the Cholesky factor."""
+    z = rng.standard_normal((n, len(distributions))) @ cholesky.T
+    return {
+        name: _marginal(spec, z[:, i])
+        for i, (name, spec) in enumerate(distributions.items())
+    }
+
+
+# =============================================================================
+# VALUATION
+# =============================================================================
+
+
+def dcf_share_price(fcf, opening, dcf):
+    """
+    Implied share price per path from its (N, P) projected FCF, net of the
+    opening debt and cash; `dcf` is dcf_model.dcf_inputs of the workbook.
+    """
+    return implied_price(
+        dict(dcf, FCF=fcf, Debt=opening["Total_Debt"], Cash=opening["Cash"])
+    )
+
+
+# =============================================================================
+# SIMULATION
+# =============================================================================
+
+
+def workbook_case(path, base, periods):
+    """
+    Base drivers and DCF inputs from an updated Module7 workbook: its
+    IncomeStatement assumptions block (one forecast year per column) and DCF
+    sheet, evaluated with formula_engine. Returns (drivers, periods, dcf).
+    """
+    from formula_engine import evaluate_workbook
+
+    model = evaluate_workbook(path)
+    columns = "BC"
+    drivers = dict(base)
+    for name, row in ASSUMPTION_ROWS.items():
+        drivers[name] = np.array(
+            [[model.value("IncomeStatement", f"{c}{row}") for c in columns]], float
+        )
+    return drivers, periods[: len(columns)], dcf_inputs(model)
+
+
+def simulate(
+    opening,
+    base,
+    periods,
+    dcf,
+    paths=1_000_000,
+    distributions=DISTRIBUTIONS,
+    correlations=CORRELATIONS,
+    chunk=100_000,
+    seed=0,
+    bins=4096,
+):
+    """
+    Run `paths` draws of the assumption shocks through the projection in
+    chunks of `chunk`; returns a Simulation of EPS and FCF per forecast year
+    and the DCF share price.
+    """
+    names = list(distributions)
+    cholesky = np.linalg.cholesky(correlation_matrix(names, correlations))
+    rng = np.random.default_rng(seed)
+    aggregates = {
+        f"{output} {period}": Aggregate(bins)
+        for output in OUTPUTS
+        for period in periods
+    }
+    aggregates["Share_Price"] = Aggregate(bins)
+
+    for start in range(0, paths, chunk):
+        n = min(chunk, paths - start)
+        drivers = dict(base)
+        for name, shock in draw_shocks(rng, n, distributions, cholesky).items():
+            drivers[name] = np.asarray(base[name], float) + shock[:, None]
+        results = project_scenarios(opening, drivers, periods)
+        for output in OUTPUTS:
+            for i, period in enumerate(periods):
+                aggregates[f"{output} {period}"].update(results[output][:, i])
+        aggregates["Share_Price"].update(dcf_share_price(results["FCF"], opening, dcf))
+    return Simulation(aggregates, paths)
+
+
+if __name__ == "__main__":
+    # python monte_carlo.py <updated Module7 workbook> [paths]
+    paths = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    opening, base, periods = load_base_case()
+    base, periods, dcf = workbook_case(sys.argv[1], base, periods)
+
+    start = time.perf_counter()
+    simulation = simulate(opening, base, periods, dcf, paths)
+    elapsed = time.perf_counter() - start
+    print(f"{paths:,} paths in {elapsed:.1f} s")
+    print(f"{'':20}{'mean':>10}{'std':>10}{'p5':>10}{'p50':>10}{'p95':>10}")
+    for name, stats in simulation.summary().items():
+        print(f"{name:20}" + "".join(f"{value:>10.2f}" for value in stats.values()))
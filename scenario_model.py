@@ -0,0 +1,452 @@
+"""
+Vectorized Scenario Engine
+==========================
+The pro forma projection of update_module7_final.py and
+lululemon_proforma_bloomberg.py (revenue growth, COGS via gross margin, SG&A
+%, tax rate, working-capital days, PPE growth, retained-earnings roll-forward)
+as NumPy array expressions over N scenarios at once, instead of one
+regenerated workbook per case.
+
+- A driver is a scalar, one value per scenario (N,), or a path over the
+  forecast years (N, periods) / (1, periods); all broadcast to (N, periods)
+- Every projected line item comes back as an (N, periods) array
+- Recurrences (revenue and PPE growth, retained earnings) are cumulative
+  products / sums along the period axis, so nothing loops over scenarios or
+  years in Python
+- The base case is the Bloomberg consensus (revenue and gross-margin paths)
+  plus the historical driver ratios; named scenarios (bull, bear) are
+  additive shifts of it
+- Opening balances are the last actual year of the Bloomberg store
+- solve_financing() builds the full balance sheet and closes it with a
+  cash / revolver plug: each period's cash before the plug (liabilities +
+  equity - non-cash assets) either sits above the minimum cash or the
+  revolver draws the gap, up to a maximum leverage; this is closed form for
+  every period and scenario, so the balance check is zero by construction
+- Interest is earned on average cash and paid on average revolver, which
+  feeds back into net income and so into the plug: that loop is solved by
+  fixed-point iteration over all scenarios at once, to a set tolerance, with
+  per-scenario convergence diagnostics, instead of relying on Excel's
+  iterative-calculation mode
+
+Run this module directly for the base / bull / bear cases and a timing of
+100,000 randomized scenarios.
+"""
+
+import time
+
+import numpy as np
+
+from bloomberg_xidf import XIDF_PATH
+from driver_ratios import DAYS, driver_assumptions, driver_history
+from financial_store import FinancialStore, load_financials
+
+# Drivers with no ratio in the history to derive them from, shared by the
+# generators and the updaters
+FIXED_DRIVERS = {
+    # Other operating expense is mostly one-offs (406 in FY2023, 3 in FY2025);
+    # 50 is the run-rate of the years without them (35, 50, 80)
+    "Other_OpEx": 50.0,
+    "Net_Interest": 0.0,
+    # FY2025's 70 of non-operating income (interest on cash), for projections
+    # that do not solve interest (solve_financing replaces it)
+    "Other_NonOp_Exp": -70.0,
+    # Net PPE growth of the Module7 roll-forward, which grows PPE rather than
+    # building it from CapEx and D&A: in line with consensus revenue growth
+    # (4-6%) rather than the build-out years (26% in FY2024, 14% in FY2025)
+    "PPE_Growth": 0.05,
+    # Capital returns are a board decision, not a ratio of the history:
+    # employee stock plans issue ~25 a year (12-42 over FY2021-FY2025) and
+    # buybacks are set at 800 a year, between FY2023-FY2024 (479, 591) and
+    # FY2025 (1,672)
+    "Stock_Issued": 25.0,
+    "Stock_Repurchased": -800.0,
+    # Stock issuance and repurchases plus -50 of other financing
+    "Net_Financing": -825.0,
+    # The export reports no interest lines: LULU's non-operating income is
+    # interest on cash (70.4 on ~2.1bn average cash in FY2025) and its
+    # "debt" is lease liabilities
+    "Cash_Yield": 0.035,
+    "Debt_Rate": 0.0,
+    # Funding policy: hold at least Cash_Pct of revenue in cash and let the
+    # revolver take total debt up to Max_Leverage x EBITDA
+    "Revolver_Rate": 0.065,
+    "Max_Leverage": 2.0,
+}
+
+# Named scenario -> {driver: additive shift from the base case}
+SCENARIO_SHIFTS = {
+    "Base": {},
+    "Bull": {"Revenue_Growth": 0.03, "Gross_Margin": 0.01, "SGA_Pct": -0.005},
+    "Bear": {"Revenue_Growth": -0.04, "Gross_Margin": -0.015, "SGA_Pct": 0.01},
+}
+
+
+class Scenarios:
+    """Line item name -> (scenario x period) array for N projected scenarios."""
+
+    def __init__(self, periods, items, names=None, convergence=None):
+        self.periods = tuple(periods)
+        self.items = items
+        self.names = names
+        self.convergence = convergence
+
+    def __len__(self):
+        return len(next(iter(self.items.values())))
+
+    def __contains__(self, name):
+        return name in self.items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, name):
+        return self.items[name]
+
+    def scenario(self, index):
+        """One scenario (by position or name) as a FinancialStore."""
+        if isinstance(index, str):
+            index = self.names.index(index)
+        return FinancialStore(
+            self.periods, {name: values[index] for name, values in self.items.items()}
+        )
+
+
+class Convergence:
+    """Per-scenario outcome of an iterative solve."""
+
+    def __init__(self, iterations, residuals, tolerance):
+        self.iterations = iterations  # iteration each scenario converged on
+        self.residuals = residuals  # last change of the solved quantity
+        self.tolerance = tolerance
+
+    @property
+    def converged(self):
+        return self.residuals <= self.tolerance
+
+    def __repr__(self):
+        return (
+            f"Convergence({int(self.converged.sum())}/{len(self.residuals)} "
+            f"converged, max residual {self.residuals.max():.2e}, "
+            f"max iterations {self.iterations.max()})"
+        )
+
+
+# =============================================================================
+# INPUTS
+# =============================================================================
+
+
+def opening_balances(income, balance, through="FY2025"):
+    """Last actual values the projection rolls forward from."""
+    return {
+        "Revenue": income.value("Revenue", through),
+        "Net_PPE": balance.value("Net_PPE", through),
+        "Retained_Earnings": balance.value("Retained_Earnings", through),
+        "Diluted_Shares": income.value("Diluted_Shares", through),
+        "Cash": balance.value("Cash", through),
+        "Receivables": balance.value("Receivables", through),
+        "Inventory": balance.value("Inventory", through),
+        "AP": balance.value("AP", through),
+        "Total_Debt": balance.value("Total_Debt", through),
+        "Total_Assets": balance.value("Total_Assets", through),
+        "Total_Liabilities": balance.value("Total_Liabilities", through),
+        "Total_Equity": balance.value("Total_Equity", through),
+    }
+
+
+def base_drivers(opening, estimates, drivers):
+    """
+    Base-case drivers: consensus revenue growth and gross margin as (1,
+    periods) paths, historical driver ratios and the template's fixed lines.
+    """
+    revenue = np.concatenate([[opening["Revenue"]], estimates["Revenue"]])
+    base = dict(FIXED_DRIVERS)
+    base["Revenue_Growth"] = (revenue[1:] / revenue[:-1] - 1)[None, :]
+    base["Gross_Margin"] = (estimates["Gross_Profit"] / estimates["Revenue"])[None, :]
+    for name in ("SGA_Pct", "DA_Pct", "Tax_Rate", "Cash_Pct", "DSO", "DIO", "DPO"):
+        base[name] = drivers[name]
+    base["Diluted_Shares"] = opening["Diluted_Shares"]
+    return base
+
+
+def named_scenarios(base, shifts=SCENARIO_SHIFTS):
+    """Stack the base case and its shifted variants into (N, ...) drivers."""
+    stacked = {}
+    for name, value in base.items():
+        value = np.asarray(value, float)
+        path = value if value.ndim == 2 else value.reshape(1, -1)[:, :1]
+        stacked[name] = np.vstack(
+            [path + shift.get(name, 0.0) for shift in shifts.values()]
+        )
+    return stacked
+
+
+# =============================================================================
+# PROJECTION
+# =============================================================================
+
+
+def _scenario_count(drivers):
+    counts = {np.shape(value)[0] for value in drivers.values() if np.ndim(value)}
+    counts.discard(1)
+    if len(counts) > 1:
+        raise ValueError(f"Drivers disagree on the number of scenarios: {counts}")
+    return counts.pop() if counts else 1
+
+
+def _broadcast(value, shape):
+    value = np.asarray(value, float)
+    if value.ndim == 1:
+        value = value[:, None]  # one value per scenario, flat over the years
+    return np.broadcast_to(value, shape)
+
+
+def _drivers(drivers, periods):
+    shape = (_scenario_count(drivers), len(periods))
+    return {name: _broadcast(value, shape) for name, value in drivers.items()}
+
+
+def _operating(opening, d):
+    """
+    Lines above EBIT, working capital, PPE and the investment flows they
+    imply: untouched by financing.
+    """
+    revenue = opening["Revenue"] * np.cumprod(1 + d["Revenue_Growth"], axis=1)
+    cogs = revenue * (1 - d["Gross_Margin"])
+    gross_profit = revenue - cogs
+    sga = revenue * d["SGA_Pct"]
+    ebit = gross_profit - sga - d["Other_OpEx"]
+    receivables = revenue / DAYS * d["DSO"]
+    inventory = cogs / DAYS * d["DIO"]
+    ap = cogs / DAYS * d["DPO"]
+    net_ppe = opening["Net_PPE"] * np.cumprod(1 + d["PPE_Growth"], axis=1)
+    da = revenue * d["DA_Pct"]
+    # CapEx implied by the PPE path: PPE grows by CapEx net of D&A
+    capex = np.diff(net_ppe, axis=1, prepend=opening["Net_PPE"]) + da
+    opening_nwc = opening["Receivables"] + opening["Inventory"] - opening["AP"]
+    chg_nwc = np.diff(receivables + inventory - ap, axis=1, prepend=opening_nwc)
+    return {
+        "Revenue": revenue,
+        "COGS": cogs,
+        "Gross_Profit": gross_profit,
+        "SGA": sga,
+        "EBIT": ebit,
+        "Receivables": receivables,
+        "Inventory": inventory,
+        "AP": ap,
+        "Net_PPE": net_ppe,
+        "DA": da,
+        "EBITDA": ebit + da,
+        "CapEx": capex,
+        "Chg_NWC": chg_nwc,
+    }
+
+
+def _earnings(items, d, net_interest, opening):
+    """
+    Add EBT through retained earnings, CFO and FCF for a given net interest
+    expense.
+    """
+    ebt = items["EBIT"] - net_interest - d["Other_NonOp_Exp"]
+    tax = ebt * d["Tax_Rate"]
+    net_income = ebt - tax
+    items["EBT"] = ebt
+    items["Tax"] = tax
+    items["Net_Income"] = net_income
+    items["EPS"] = net_income / d["Diluted_Shares"]
+    items["Retained_Earnings"] = opening["Retained_Earnings"] + np.cumsum(
+        net_income, axis=1
+    )
+    items["CFO"] = net_income + items["DA"] - items["Chg_NWC"]
+    items["FCF"] = items["CFO"] - items["CapEx"]
+    return net_income
+
+
+def project_scenarios(opening, drivers, periods, names=None):
+    """
+    Project every scenario in `drivers` ({driver: scalar / (N,) / (N, P)})
+    over `periods` from the `opening` balances; returns Scenarios.
+    """
+    d = _drivers(drivers, periods)
+    items = _operating(opening, d)
+    _earnings(items, d, d["Net_Interest"], opening)
+    items["Cash"] = items["Revenue"] * d["Cash_Pct"]
+    return Scenarios(periods, items, names)
+
+
+def funding_plug(surplus, minimum_cash, capacity):
+    """
+    Closed-form cash / revolver plug. `surplus` is the cash the balance sheet
+    holds before any revolver (liabilities + equity - non-cash assets); below
+    `minimum_cash` the revolver draws the gap, up to `capacity`, and above it
+    the excess stays in cash with the revolver repaid. Returns (cash,
+    revolver) with cash = surplus + revolver, so the balance sheet balances
+    whichever way the policy binds.
+    """
+    revolver = np.minimum(np.maximum(minimum_cash - surplus, 0.0), capacity)
+    return surplus + revolver, revolver
+
+
+def _with_prior(path, opening):
+    """(N, P) path shifted one year right, the opening value in front."""
+    return np.concatenate([np.full((len(path), 1), opening), path[:, :-1]], axis=1)
+
+
+def solve_financing(
+    opening, drivers, periods, names=None, tolerance=1e-6, max_iterations=50
+):
+    """
+    Project the full balance sheet with cash and a revolver as the plug
+    (funding_plug): minimum cash is Cash_Pct of revenue and the revolver is
+    capped at Max_Leverage x EBITDA less existing debt, which is held flat.
+    Interest income on average cash (Cash_Yield), revolver interest on the
+    average draw (Revolver_Rate) and interest on existing debt (Debt_Rate)
+    feed net income, which moves the plug; that loop is iterated until both
+    interest lines move by at most `tolerance` in every scenario and year.
+    The Net_Interest driver is not used. Returns Scenarios whose
+    `convergence` reports the iterations and final residuals.
+    """
+    d = _drivers(drivers, periods)
+    items = _operating(opening, d)
+    other_flows = items["DA"] - items["Chg_NWC"] - items["CapEx"] + d["Net_Financing"]
+    debt_interest = d["Debt_Rate"] * opening["Total_Debt"]
+    minimum_cash = items["Revenue"] * d["Cash_Pct"]
+    capacity = np.maximum(
+        d["Max_Leverage"] * items["EBITDA"] - opening["Total_Debt"], 0.0
+    )
+
+    n = len(other_flows)
+    interest_income = np.zeros_like(other_flows)
+    revolver_interest = np.zeros_like(other_flows)
+    iterations = np.zeros(n, dtype=int)
+    residuals = np.full(n, np.inf)
+    for iteration in range(1, max_iterations + 1):
+        net_interest = debt_interest + revolver_interest - interest_income
+        net_income = _earnings(items, d, net_interest, opening)
+        surplus = opening["Cash"] + np.cumsum(net_income + other_flows, axis=1)
+        cash, revolver = funding_plug(surplus, minimum_cash, capacity)
+        solved_income = (
+            d["Cash_Yield"] * (_with_prior(cash, opening["Cash"]) + cash) / 2
+        )
+        solved_revolver = (
+            d["Revolver_Rate"] * (_with_prior(revolver, 0.0) + revolver) / 2
+        )
+        residuals = np.maximum(
+            np.abs(solved_income - interest_income).max(axis=1),
+            np.abs(solved_revolver - revolver_interest).max(axis=1),
+        )
+        interest_income, revolver_interest = solved_income, solved_revolver
+        iterations[(iterations == 0) & (residuals <= tolerance)] = iteration
+        if iterations.all():
+            break
+
+    interest_expense = debt_interest + revolver_interest
+    net_income = _earnings(items, d, interest_expense - interest_income, opening)
+    surplus = opening["Cash"] + np.cumsum(net_income + other_flows, axis=1)
+    cash, revolver = funding_plug(surplus, minimum_cash, capacity)
+
+    # Lines the projection does not drive stay at their opening balances
+    other_assets = (
+        opening["Total_Assets"]
+        - opening["Cash"]
+        - opening["Receivables"]
+        - opening["Inventory"]
+        - opening["Net_PPE"]
+    )
+    other_liabilities = (
+        opening["Total_Liabilities"] - opening["AP"] - opening["Total_Debt"]
+    )
+    total_assets = (
+        cash
+        + items["Receivables"]
+        + items["Inventory"]
+        + items["Net_PPE"]
+        + other_assets
+    )
+    total_liabilities = (
+        items["AP"] + opening["Total_Debt"] + revolver + other_liabilities
+    )
+    total_equity = opening["Total_Equity"] + np.cumsum(
+        net_income + d["Net_Financing"], axis=1
+    )
+    items.update(
+        {
+            "Interest_Income": interest_income,
+            "Interest_Expense": interest_expense,
+            "Net_Interest": interest_expense - interest_income,
+            "Revolver_Draw": np.diff(revolver, axis=1, prepend=0.0),
+            "Minimum_Cash": minimum_cash,
+            "Cash_Before_Plug": surplus,
+            "Cash": cash,
+            "Revolver": revolver,
+            "Total_Assets": total_assets,
+            "Total_Liabilities": total_liabilities,
+            "Total_Equity": total_equity,
+            "Balance_Check": total_assets - total_liabilities - total_equity,
+        }
+    )
+    return Scenarios(
+        periods, items, names, Convergence(iterations, residuals, tolerance)
+    )
+
+
+def load_base_case(path=XIDF_PATH, window="last"):
+    """(opening balances, base drivers, forecast periods) from the export."""
+    income, balance, cashflow, estimates = load_financials(path)
+    history = driver_history([income, balance, cashflow])
+    opening = opening_balances(income, balance, income.periods[-1])
+    drivers = driver_assumptions(history, window)
+    return opening, base_drivers(opening, estimates, drivers), estimates.periods
+
+
+if __name__ == "__main__":
+    opening, base, periods = load_base_case()
+
+    cases = project_scenarios(
+        opening, named_scenarios(base), periods, list(SCENARIO_SHIFTS)
+    )
+    print(f"{'':24}" + "".join(f"{period:>12}" for period in periods))
+    for name in cases.names:
+        eps = cases.scenario(name).row("EPS")
+        print(f"{name + ' EPS':24}" + "".join(f"{value:>12.2f}" for value in eps))
+
+    # Interest on average cash replaces the hand-set non-operating income
+    circular = dict(base, Other_NonOp_Exp=0.0)
+    solved = solve_financing(
+        opening, named_scenarios(circular), periods, list(SCENARIO_SHIFTS)
+    )
+    print(solved.convergence)
+    for name in solved.names:
+        case = solved.scenario(name)
+        for item in ("Interest_Income", "Cash", "Revolver"):
+            print(
+                f"{name + ' ' + item:24}"
+                + "".join(f"{value:>12.1f}" for value in case.row(item))
+            )
+    print(f"Max |balance check|: {np.abs(solved['Balance_Check']).max():.2e}")
+
+    n = 100_000
+    rng = np.random.default_rng(0)
+    randomized = dict(base)
+    randomized["Revenue_Growth"] = base["Revenue_Growth"] + rng.normal(
+        0, 0.02, (n, len(periods))
+    )
+    randomized["Gross_Margin"] = base["Gross_Margin"] + rng.normal(0, 0.01, (n, 1))
+    randomized["SGA_Pct"] = base["SGA_Pct"] + rng.normal(0, 0.005, n)
+    start = time.perf_counter()
+    results = project_scenarios(opening, randomized, periods)
+    elapsed = time.perf_counter() - start
+    randomized["Other_NonOp_Exp"] = 0.0
+    start = time.perf_counter()
+    circular = solve_financing(opening, randomized, periods)
+    solve_elapsed = time.perf_counter() - start
+    eps = results["EPS"][:, -1]
+    print(
+        f"{n:,} scenarios in {elapsed * 1e3:.1f} ms; {periods[-1]} EPS "
+        f"p5 {np.percentile(eps, 5):.2f} / p50 {np.median(eps):.2f} / "
+        f"p95 {np.percentile(eps, 95):.2f}"
+    )
+    print(
+        f"{n:,} scenarios with the funding plug and interest solved in "
+        f"{solve_elapsed * 1e3:.1f} ms; {circular.convergence}"
+    )
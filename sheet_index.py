@@ -0,0 +1,133 @@
+"""
+Label / Period Cell Index
+=========================
+Maps line-item labels and fiscal-period headers to cells, so the updaters
+look data up by name instead of by hardcoded row numbers.
+
+- Built once per workbook; every sheet of the Bloomberg XIDF export and of the
+  Module7 template can be indexed
+- Lookups are dict hits: label -> row, period -> column
+- Labels are matched ignoring case and surrounding / repeated whitespace, so
+  "  Gross Profit" and "Gross Profit" are the same line item
+- Period columns come from the FY offset row of Bloomberg sheets
+  ("FY2023" / "FY2026E", see statement_periods) and are matched ignoring
+  whitespace ("FY 2023" == "FY2023"); other text cells are labels only
+- The first occurrence of a label wins unless a section is given (Key Stats
+  repeats "Margin %" under every line item)
+- A re-exported file simply gets a new index, so inserted or reordered rows
+  never shift a lookup
+"""
+
+from openpyxl.utils import get_column_letter
+
+from bloomberg_xidf import XIDF_PATH, read_sheets, statement_periods
+from xlsx_reader import sheet_names
+
+
+def normalize_label(text):
+    return " ".join(str(text).split()).casefold()
+
+
+def normalize_period(text):
+    return "".join(str(text).split()).casefold()
+
+
+class SheetIndex:
+    """Label and period-header lookups over one sheet grid ({row: values})."""
+
+    def __init__(self, name, grid):
+        self.name = name
+        self.grid = grid
+        self.cells = {}
+        self.columns = {}
+
+        for col, period in statement_periods(grid).items():
+            self.columns[normalize_period(period)] = col + 1
+
+        for row_idx in sorted(grid):
+            for col, value in enumerate(grid[row_idx]):
+                if not isinstance(value, str) or not value.strip():
+                    continue
+                if value.startswith("="):
+                    continue  # formula text, not a label
+                key = normalize_label(value)
+                self.cells.setdefault(key, []).append((row_idx, col + 1))
+
+    @classmethod
+    def from_worksheet(cls, ws):
+        """Index an already loaded openpyxl worksheet."""
+        grid = {}
+        for row_idx, values in enumerate(ws.iter_rows(values_only=True), start=1):
+            if any(value is not None for value in values):
+                grid[row_idx] = tuple(values)
+        return cls(ws.title, grid)
+
+    def __contains__(self, label):
+        return normalize_label(label) in self.cells
+
+    def find(self, label, after=None):
+        """
+        (row, column) of the cell holding `label`. Labels that repeat
+        ("Other Funds" under each cash flow section) are told apart with
+        `after`: a row number or a section label the match must sit below.
+        """
+        if isinstance(after, str):
+            after = self.find(after)[0]
+        for cell in self.cells.get(normalize_label(label), ()):
+            if after is None or cell[0] > after:
+                return cell
+        where = f" below row {after}" if after is not None else ""
+        raise KeyError(f"{label!r} not found on sheet {self.name!r}{where}")
+
+    def row(self, label, after=None):
+        return self.find(label, after)[0]
+
+    def value_cell(self, label, after=None):
+        """(row, column) of the first populated cell to the right of a label."""
+        row, col = self.find(label, after)
+        values = self.grid[row]
+        for value_col in range(col + 1, len(values) + 1):
+            if values[value_col - 1] is not None:
+                return row, value_col
+        raise KeyError(f"No value next to {label!r} on sheet {self.name!r}")
+
+    def column(self, period):
+        try:
+            return self.columns[normalize_period(period)]
+        except KeyError:
+            raise KeyError(f"{period!r} not found on sheet {self.name!r}") from None
+
+    def cell(self, label, period):
+        """(row, column) of a label / period pair, 1-based like openpyxl."""
+        return self.row(label), self.column(period)
+
+    def coordinate(self, label, period):
+        row, col = self.cell(label, period)
+        return f"{get_column_letter(col)}{row}"
+
+    def value(self, label, period, default=0):
+        """
+        Value stored at a label / period pair. Blank cells and Bloomberg's
+        "-" / "NA" placeholders come back as `default`.
+        """
+        row, col = self.cell(label, period)
+        values = self.grid.get(row, ())
+        value = values[col - 1] if col <= len(values) else None
+        return value if isinstance(value, (int, float)) else default
+
+
+def index_grids(grids):
+    """{sheet: grid} -> {sheet: SheetIndex}."""
+    return {name: SheetIndex(name, grid) for name, grid in grids.items()}
+
+
+def index_workbook(path=XIDF_PATH, sheets=None, use_cache=True, workers=None):
+    """Index every sheet of a workbook on disk (or just the ones named)."""
+    if sheets is None:
+        sheets = sheet_names(path)
+    return index_grids(read_sheets(path, sheets, use_cache, workers))
+
+
+def index_loaded_workbook(wb):
+    """Index every sheet of a workbook already opened with openpyxl."""
+    return {ws.title: SheetIndex.from_worksheet(ws) for ws in wb.worksheets}
@@ -0,0 +1,283 @@
+"""
+Streaming Sheet Writer
+======================
+Row-ordered output for the pro forma generators, so the same rendering code
+can fill a regular openpyxl workbook or stream a write-only one.
+
+- SheetWriter.row(index, cells) emits one whole row; rows must come in
+  increasing order (gaps are written as empty rows), which is all a
+  write-only worksheet accepts
+- A cell is a plain value or Styled(value, font, fill, ...); None cells are
+  skipped entirely, so placeholder columns are never materialised in either
+  mode
+- Column widths are set through the writer before the first row, since a
+  write-only sheet emits its <cols> element up front
+- In write-only mode each row goes straight to the sheet's temporary XML
+  stream instead of a dict of Cell objects, so peak memory stays flat as
+  periods and companies are added
+- StyleRegistry defines each look once (STYLES: header, actual, estimate,
+  percent, dollar, check, ...) as a workbook named style; a cell given
+  Styled(value, style="estimate dollar") takes the registered style's
+  indices directly, instead of a fresh Font / PatternFill being hashed
+  into the workbook's style tables for every cell
+- new_workbook(direct=True) gives an xlsx_writer workbook instead: no Cell
+  objects at all, each row serialized to SpreadsheetML as it is written and
+  each style resolved to its cellXfs index once
+
+Run this module directly for a benchmark of regular vs. write-only output,
+with per-cell style objects and with named styles (and of direct output),
+over growing period counts and company counts.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from copy import copy
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+
+from xlsx_writer import XlsxSheet, XlsxWorkbook
+
+STYLE_ATTRIBUTES = ("font", "fill", "number_format", "alignment", "border")
+
+Styled = namedtuple("Styled", ("value",) + STYLE_ATTRIBUTES + ("style",))
+Styled.__new__.__defaults__ = (None,) * (len(STYLE_ATTRIBUTES) + 1)
+
+
+def _solid(color):
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+# Named style -> attributes. Names are single words; a cell may combine
+# several ("estimate percent"), later words overriding earlier ones.
+STYLES = {
+    "heading": {"font": Font(bold=True, size=16)},
+    "title": {"font": Font(bold=True, size=14)},
+    "section": {"font": Font(bold=True, size=12)},
+    "subtitle": {"font": Font(italic=True)},
+    "note": {"font": Font(italic=True, size=12)},
+    "source": {"font": Font(italic=True, size=9, color="666666")},
+    "bold": {"font": Font(bold=True)},
+    "header": {
+        "font": Font(bold=True, color="FFFFFF", size=11),
+        "fill": _solid("1F4E79"),
+        "alignment": Alignment(horizontal="center"),
+    },
+    "actual": {"fill": _solid("E2EFDA")},
+    "estimate": {"fill": _solid("FFF2CC")},
+    "percent": {"number_format": "0.0%"},
+    "dollar": {"number_format": "#,##0.0"},
+    "check": {
+        "font": Font(bold=True),
+        "border": Border(top=Side(style="thin"), bottom=Side(style="thin")),
+    },
+}
+
+
+class StyleRegistry:
+    """
+    Named styles of one workbook. A (possibly combined) name is registered
+    as a NamedStyle the first time it is used; `overrides` replaces or adds
+    STYLES entries for this workbook.
+    """
+
+    def __init__(self, wb, overrides=None):
+        self.wb = wb
+        self.styles = dict(STYLES, **(overrides or {}))
+        self._arrays = {}
+
+    def __getitem__(self, name):
+        """Style indices (StyleArray) of `name`, e.g. "actual dollar"."""
+        array = self._arrays.get(name)
+        if array is None:
+            # Unstyled parts keep the workbook defaults, as a plain cell would
+            style = NamedStyle(name=name, font=copy(DEFAULT_FONT))
+            for part in name.split():
+                if part not in self.styles:
+                    raise KeyError(f"Unknown style {part!r}")
+                for attribute, value in self.styles[part].items():
+                    setattr(style, attribute, value)
+            self.wb.add_named_style(style)
+            array = self._arrays[name] = style.as_tuple()
+        return array
+
+
+def new_workbook(write_only=False, direct=False):
+    """
+    Empty workbook; regular workbooks lose their default sheet. `direct`
+    gives an xlsx_writer.XlsxWorkbook (output only).
+    """
+    if direct:
+        return XlsxWorkbook()
+    wb = Workbook(write_only=write_only)
+    if not write_only:
+        wb.remove(wb.active)
+    return wb
+
+
+class SheetWriter:
+    """Writes one worksheet top to bottom: regular, write-only or direct."""
+
+    def __init__(self, ws, styles=None):
+        self.ws = ws
+        self.styles = styles
+        self.write_only = isinstance(ws, WriteOnlyWorksheet)
+        self.direct = isinstance(ws, XlsxSheet)
+        self.next_row = 1
+        self._xfs = {}  # Styled attributes -> cellXfs index (direct)
+
+    def widths(self, widths):
+        """{column letter: width}; call before the first row."""
+        if self.write_only and self.next_row > 1:
+            raise ValueError("Set column widths before writing rows")
+        for letter, width in widths.items():
+            if self.direct:
+                self.ws.widths[letter] = width
+            else:
+                self.ws.column_dimensions[letter].width = width
+
+    def row(self, index, cells):
+        """Write row `index` (1-based) from a list of values / Styled cells."""
+        if index < self.next_row:
+            raise ValueError(f"Row {index} written after row {self.next_row - 1}")
+        if self.direct:
+            self.ws.write_row(index, [self._direct_cell(cell) for cell in cells])
+        elif self.write_only:
+            for _ in range(index - self.next_row):
+                self.ws.append([])
+            self.ws.append([self._write_only_cell(cell) for cell in cells])
+        else:
+            for column, cell in enumerate(cells, start=1):
+                if cell is None or (isinstance(cell, Styled) and cell.value is None):
+                    continue
+                self._apply(self.ws.cell(row=index, column=column), cell)
+        self.next_row = index + 1
+
+    def _write_only_cell(self, cell):
+        if not isinstance(cell, Styled):
+            return cell
+        if cell.value is None:
+            return None
+        target = WriteOnlyCell(self.ws)
+        self._apply(target, cell)
+        return target
+
+    def _direct_cell(self, cell):
+        if not isinstance(cell, Styled):
+            return None if cell is None else (cell, 0)
+        if cell.value is None:
+            return None
+        key = cell[1:]
+        xf = self._xfs.get(key)
+        if xf is None:
+            attributes = {
+                name: getattr(cell, name)
+                for name in STYLE_ATTRIBUTES
+                if getattr(cell, name) is not None
+            }
+            style = self.styles[cell.style] if cell.style is not None else None
+            xf = self._xfs[key] = self.ws.parent.xf(style, **attributes)
+        return cell.value, xf
+
+    def _apply(self, target, cell):
+        if not isinstance(cell, Styled):
+            target.value = cell
+            return
+        target.value = cell.value
+        if cell.style is not None:
+            target._style = copy(self.styles[cell.style])
+        for name in STYLE_ATTRIBUTES:
+            style = getattr(cell, name)
+            if style is not None:
+                setattr(target, name, style)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def _render(wb, companies, periods, named, rows=45):
+    # Same cells either way: per-cell style objects, or registry style names
+    styles = StyleRegistry(wb) if named else None
+    bold = Font(bold=True)
+    fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+    for company in range(companies):
+        writer = SheetWriter(wb.create_sheet(f"Company {company + 1}"), styles)
+        writer.widths(
+            {"A": 35, **{get_column_letter(c): 13 for c in range(2, periods + 2)}}
+        )
+        title = f"COMPANY {company + 1}"
+        writer.row(
+            1, [Styled(title, style="bold") if named else Styled(title, font=bold)]
+        )
+        writer.row(3, [None] + [f"FY{2000 + p}" for p in range(periods)])
+        for r in range(4, 4 + rows):
+            if r % 6 == 0:
+                continue  # spacer row: never materialised
+            label = f"Line {r}"
+            if named:
+                cells = [Styled(label, style="bold") if r % 5 == 0 else label]
+            else:
+                cells = [Styled(label, font=bold if r % 5 == 0 else None)]
+            for p in range(periods):
+                letter = get_column_letter(p + 2)
+                value = f"={letter}{r - 1}*1.05" if r % 3 else float(r * p)
+                if named:
+                    cells.append(Styled(value, style="estimate dollar"))
+                else:
+                    cells.append(Styled(value, fill=fill, number_format="#,##0.0"))
+            writer.row(r, cells)
+
+
+def benchmark(companies, periods, write_only, named=False, direct=False, memory=True):
+    """
+    (seconds, peak MB) to render and save a synthetic workbook; without
+    `memory` allocations are not traced (which slows every mode) and the
+    peak is None.
+    """
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.xlsx")
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    wb = new_workbook(write_only, direct)
+    _render(wb, companies, periods, named)
+    wb.save(path)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    os.remove(path)
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    cases = [(1, 6), (1, 40), (100, 6), (100, 40)]
+    if len(sys.argv) > 1:
+        cases.append((int(sys.argv[1]), int(sys.argv[2]) if len(sys.argv) > 2 else 6))
+    modes = [
+        ("regular", False, False, False),
+        ("regular named", False, True, False),
+        ("write-only", True, False, False),
+        ("write-only named", True, True, False),
+        ("direct named", False, True, True),
+    ]
+    print(f"{'companies':>10}{'periods':>9}" + "".join(f"{m[0]:>20}" for m in modes))
+    for companies, periods in cases:
+        results = [
+            benchmark(companies, periods, write_only, named, direct)
+            for _, write_only, named, direct in modes
+        ]
+        print(
+            f"{companies:>10}{periods:>9}"
+            + "".join(f"{t:>9.2f} s {mb:>6.1f} MB" for t, mb in results)
+        )
@@ -0,0 +1,259 @@
+"""
+Template Pool
+=============
+Module7.xlsm parsed once per process, handed out as cheap copy-on-write
+clones for repeated renders (many tickers, many scenarios).
+
+- load_template(path) parses a template on first use and keeps it, keyed by
+  path; a template whose size or modification time changed is parsed again
+- Every call returns a fresh clone: new sheet objects and new style tables,
+  but the template's Cell objects shared until the clone touches them
+- A cell is copied into the clone the first time it is looked up through the
+  sheet (ws["B5"], ws.cell(), iteration, moves); cells never looked up stay
+  the template's own, so a render pays for the cells it writes, not for the
+  whole workbook
+- The clone's style tables start as copies of the template's, so shared
+  cells keep valid style indices and styles added by a render stay private
+  to that clone
+- Row / column dimensions, merged ranges, validations, conditional formats,
+  views and page setup are small and copied outright
+- Template cells are read through formula_engine.stored_cells, the one
+  accessor for openpyxl's private cell dict
+
+Run this module directly for a benchmark of load_workbook against pool
+clones.
+"""
+
+import os
+import sys
+import time
+from copy import copy, deepcopy
+
+import openpyxl
+from openpyxl.cell.cell import Cell, MergedCell
+from openpyxl.utils.indexed_list import IndexedList
+from openpyxl.worksheet.cell_range import MultiCellRange
+from openpyxl.worksheet.dimensions import DimensionHolder
+from openpyxl.worksheet.worksheet import Worksheet
+
+from formula_engine import stored_cells
+
+TEMPLATE_PATH = "Module7.xlsm"
+
+# Workbook style tables, indexed by the style arrays of every cell
+STYLE_TABLES = (
+    "_fonts",
+    "_alignments",
+    "_borders",
+    "_fills",
+    "_number_formats",
+    "_protections",
+    "_cell_styles",
+)
+
+# Worksheet parts copied as they are (lists, dicts, small serialisables)
+SHEET_PARTS = (
+    "_charts",
+    "_images",
+    "_comments",
+    "_pivots",
+    "_hyperlinks",
+    "_tables",
+    "_rels",
+    "row_breaks",
+    "col_breaks",
+    "print_options",
+    "page_margins",
+    "protection",
+    "defined_names",
+    "auto_filter",
+    "sheet_properties",
+    "sheet_format",
+    "HeaderFooter",
+)
+
+# Worksheet parts holding nested mutable state
+DEEP_SHEET_PARTS = ("views", "conditional_formatting", "data_validations", "scenarios")
+
+
+# =============================================================================
+# CLONES
+# =============================================================================
+
+
+class PooledWorksheet(Worksheet):
+    """
+    Worksheet of a clone. `_cells` starts out holding the template's Cell
+    objects; each is replaced by a private copy when first looked up.
+    """
+
+    def _get_cell(self, row, column):
+        cell = self._cells.get((row, column))
+        if cell is not None and cell.parent is not self:
+            cell = self._cells[row, column] = self._own(cell)
+        return super()._get_cell(row, column)
+
+    def _own(self, source):
+        if isinstance(source, MergedCell):
+            cell = MergedCell(self, source.row, source.column)
+        else:
+            cell = Cell(self, row=source.row, column=source.column)
+            cell._value = source._value
+            cell.data_type = source.data_type
+            if source.hyperlink:
+                cell._hyperlink = copy(source.hyperlink)
+            if source.comment:
+                cell.comment = copy(source.comment)
+        if source._style is not None:
+            cell._style = copy(source._style)
+        return cell
+
+
+def clone_worksheet(ws, parent):
+    """Copy-on-write clone of `ws` belonging to workbook `parent`."""
+    clone = PooledWorksheet.__new__(PooledWorksheet)
+    clone.__dict__.update(ws.__dict__)
+    clone._parent = parent
+    clone._cells = dict(stored_cells(ws))
+    for name in SHEET_PARTS:
+        setattr(clone, name, copy(getattr(ws, name)))
+    for name in DEEP_SHEET_PARTS:
+        setattr(clone, name, deepcopy(getattr(ws, name)))
+    # copy() would also copy the sheet the page setup points back to
+    clone.page_setup = type(ws.page_setup).from_tree(ws.page_setup.to_tree())
+    clone.page_setup._parent = clone
+
+    for name, factory in (
+        ("row_dimensions", clone._add_row),
+        ("column_dimensions", clone._add_column),
+    ):
+        holder = DimensionHolder(worksheet=clone, default_factory=factory)
+        source = getattr(ws, name)
+        holder.max_outline = source.max_outline
+        for key, dim in source.items():
+            holder[key] = _rebind(dim, parent=clone, _style=copy(dim._style))
+        setattr(clone, name, holder)
+
+    clone.merged_cells = MultiCellRange(
+        [_rebind(merged, ws=clone) for merged in ws.merged_cells.ranges]
+    )
+    return clone
+
+
+def _rebind(obj, **attributes):
+    # Copy without __init__, which for dimensions and merged ranges
+    # re-derives (and restyles) cells of the sheet
+    new = object.__new__(type(obj))
+    new.__dict__.update(obj.__dict__)
+    for name, value in attributes.items():
+        setattr(new, name, value)
+    return new
+
+
+def clone_workbook(wb):
+    """Clone of a template workbook; the template itself is never modified."""
+    clone = openpyxl.Workbook.__new__(openpyxl.Workbook)
+    clone.__dict__.update(wb.__dict__)
+    for name in STYLE_TABLES:
+        setattr(clone, name, IndexedList(getattr(wb, name)))
+    clone._named_styles = copy(wb._named_styles)
+    clone._differential_styles = deepcopy(wb._differential_styles)
+    clone._date_formats = set(wb._date_formats)
+    clone._timedelta_formats = set(wb._timedelta_formats)
+    clone.shared_strings = IndexedList(wb.shared_strings)
+    clone.defined_names = copy(wb.defined_names)
+    clone.properties = copy(wb.properties)
+    clone.calculation = copy(wb.calculation)
+    clone.views = deepcopy(wb.views)
+    clone._pivots = list(wb._pivots)
+    clone._external_links = list(wb._external_links)
+    clone._sheets = [
+        clone_worksheet(ws, clone) if isinstance(ws, Worksheet) else copy(ws)
+        for ws in wb._sheets
+    ]
+    for sheet in clone._sheets:
+        sheet._parent = clone
+    return clone
+
+
+# =============================================================================
+# POOL
+# =============================================================================
+
+
+_templates = {}
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def load_template(path=TEMPLATE_PATH, keep_vba=True):
+    """
+    Clone of the workbook at `path`, parsing it only if this process has not
+    already (or the file has changed since).
+    """
+    key = (os.path.abspath(path), keep_vba)
+    stamp = _stamp(path)
+    cached = _templates.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = _templates[key] = (stamp, parse_template(path, keep_vba))
+    return clone_workbook(cached[1])
+
+
+def parse_template(path, keep_vba=True):
+    """
+    Load a workbook to clone from. Shared cells resolve their style index in
+    the template's tables when saved, so every style in use is registered up
+    front: after this the template's tables never grow.
+    """
+    wb = openpyxl.load_workbook(path, keep_vba=keep_vba)
+    for ws in wb.worksheets:
+        for cell in stored_cells(ws).values():
+            if cell.has_style:
+                cell.style_id
+    return wb
+
+
+def clear_templates():
+    """Drop every parsed template (frees their memory)."""
+    _templates.clear()
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def _render(wb):
+    # A small edit, as a per-ticker render would make
+    ws = wb["IncomeStatement"]
+    for row in range(33, 38):
+        for letter in "BC":
+            ws[f"{letter}{row}"] = 0.5
+    ws["A1"].font = openpyxl.styles.Font(bold=True, color="C00000")
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else TEMPLATE_PATH
+    renders = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    start = time.perf_counter()
+    for _ in range(renders):
+        _render(openpyxl.load_workbook(path, keep_vba=True))
+    loaded = (time.perf_counter() - start) / renders
+
+    start = time.perf_counter()
+    load_template(path)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(renders):
+        _render(load_template(path))
+    pooled = (time.perf_counter() - start) / renders
+
+    template = _templates[os.path.abspath(path), True][1]
+    assert template["IncomeStatement"]["B33"].value != 0.5, "template modified"
+    print(f"load_workbook + render: {loaded * 1e3:8.1f} ms per render")
+    print(f"pool clone + render:    {pooled * 1e3:8.1f} ms per render")
+    print(f"first template parse:   {first * 1e3:8.1f} ms; {loaded / pooled:.1f}x")
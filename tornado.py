@@ -0,0 +1,244 @@
+"""
+Tornado Report
+==============
+One-at-a-time sensitivity of net income, EPS, FCF and the DCF implied share
+price to every scalar assumption of an updated Module7 workbook, ranked by
+swing and written as a Tornado sheet plus JSON.
+
+- Assumptions: the IncomeStatement block A33:C37 (each year's cell on its
+  own), the BalanceSheet block A47:B50 (cash %, A/R days, inventory days,
+  PPE growth), the WACC inputs and the DCF terminal growth
+- Each assumption is moved by -x% and +x% of its value; the 2K perturbed
+  cases plus the base case are stacked as rows of one scenario batch, so the
+  whole report is a single scenario_model projection and one broadcast
+  dcf_model valuation rather than 2K rebuilt workbooks
+- Values are read from the workbook through formula_engine, as are the
+  forecast lines held as given (net interest, other non-operating expense,
+  diluted shares); lines the workbook does not expose (D&A %, payable days)
+  come from the Bloomberg base case
+- Income and cash flow outputs are for the last year of the assumptions
+  block (FY 2027E); the share price uses the projected FCF in place of
+  DCF!C12:D12
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import openpyxl
+from openpyxl.styles import Alignment, Font, PatternFill
+
+from dcf_model import INPUT_CELLS, dcf_inputs, implied_price
+from formula_engine import FormulaModel
+from monte_carlo import ASSUMPTION_ROWS
+from scenario_model import load_base_case, project_scenarios
+
+PERTURBATION = 0.10
+
+# Driver -> row of the BalanceSheet assumptions block (values in B)
+BALANCE_ROWS = {"Cash_Pct": 47, "DSO": 48, "DIO": 49, "PPE_Growth": 50}
+
+# dcf_model inputs perturbed (WACC sheet and DCF!B6)
+DCF_NAMES = (
+    "Risk_Free",
+    "Beta",
+    "Market_Premium",
+    "Pre_Tax_Kd",
+    "Tax_Rate",
+    "Equity_Value",
+    "Debt_Value",
+    "Terminal_Growth",
+)
+
+# Driver -> IncomeStatement row of a forecast line taken as is (G, H)
+LINE_ROWS = {"Net_Interest": 14, "Other_NonOp_Exp": 15, "Diluted_Shares": 28}
+
+OUTPUTS = ("Net_Income", "EPS", "FCF", "Share_Price")
+
+BLOCK_COLUMNS = "BC"
+
+
+# =============================================================================
+# INPUTS
+# =============================================================================
+
+
+def tornado_inputs(model):
+    """
+    Every perturbed assumption of an evaluated workbook as (label, cell,
+    kind, name, column, value); kind is "driver" (scenario_model, `column`
+    the forecast year or None for all) or "dcf" (dcf_model).
+    """
+    entries = []
+    for name, row in ASSUMPTION_ROWS.items():
+        label = model.value("IncomeStatement", f"A{row}")
+        for column, letter in enumerate(BLOCK_COLUMNS):
+            year = model.value("IncomeStatement", f"{chr(ord('G') + column)}3")
+            cell = f"IncomeStatement!{letter}{row}"
+            value = model.value("IncomeStatement", f"{letter}{row}")
+            entries.append((f"{label} ({year})", cell, "driver", name, column, value))
+    for name, row in BALANCE_ROWS.items():
+        label = model.value("BalanceSheet", f"A{row}")
+        value = model.value("BalanceSheet", f"B{row}")
+        entries.append((label, f"BalanceSheet!B{row}", "driver", name, None, value))
+    for name in DCF_NAMES:
+        sheet, cell = INPUT_CELLS[name]
+        label = model.value(sheet, f"A{cell[1:]}")
+        value = model.value(sheet, cell)
+        entries.append((label, f"{sheet}!{cell}", "dcf", name, None, value))
+    return entries
+
+
+def workbook_drivers(model, entries, base, periods):
+    """
+    Base drivers with the workbook's assumption values and given forecast
+    lines (LINE_ROWS) in place.
+    """
+    drivers = dict(base)
+    columns = [chr(ord("G") + column) for column in range(len(BLOCK_COLUMNS))]
+    for name, row in LINE_ROWS.items():
+        values = [model.value("IncomeStatement", f"{c}{row}") for c in columns]
+        drivers[name] = np.array([values], float)
+    paths = {}
+    for _, _, kind, name, column, value in entries:
+        if kind != "driver":
+            continue
+        if column is None:
+            drivers[name] = value
+        else:
+            paths.setdefault(name, [None] * len(BLOCK_COLUMNS))[column] = value
+    for name, path in paths.items():
+        drivers[name] = np.array([path], float)
+    return drivers, periods[: len(BLOCK_COLUMNS)]
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+
+def tornado(model, opening, base, periods, perturbation=PERTURBATION):
+    """
+    Rank every assumption by the swing it causes in each output; returns a
+    JSON-ready report {"perturbation", "period", "base", "outputs": {output:
+    [{"assumption", "cell", "value", "low", "high", "swing"}, ...]}}.
+    """
+    entries = tornado_inputs(model)
+    drivers, periods = workbook_drivers(model, entries, base, periods)
+    dcf = dcf_inputs(model)
+    n = 2 * len(entries) + 1
+    shape = (n, len(periods))
+
+    # Row 0 is the base case; rows 2i+1 / 2i+2 move assumption i down / up
+    batch = dict(drivers)
+    for i, (_, _, kind, name, column, _) in enumerate(entries):
+        if kind == "driver":
+            if np.shape(batch[name]) != shape:
+                path = np.asarray(drivers[name], float).reshape(1, -1)
+                batch[name] = np.array(np.broadcast_to(path, shape))
+            cells = batch[name][:, slice(None) if column is None else column]
+        else:
+            if np.ndim(dcf[name]) == 0:
+                dcf[name] = np.full(n, float(dcf[name]))
+            cells = dcf[name]
+        cells[2 * i + 1] *= 1 - perturbation
+        cells[2 * i + 2] *= 1 + perturbation
+
+    results = project_scenarios(opening, batch, periods)
+    values = {name: results[name][:, -1] for name in OUTPUTS[:-1]}
+    values["Share_Price"] = implied_price(dict(dcf, FCF=results["FCF"]))
+
+    report = {
+        "perturbation": perturbation,
+        "period": periods[-1],
+        "base": {name: float(value[0]) for name, value in values.items()},
+        "outputs": {},
+    }
+    for output, value in values.items():
+        rows = [
+            {
+                "assumption": label,
+                "cell": cell,
+                "value": float(entry_value),
+                "low": float(value[2 * i + 1]),
+                "high": float(value[2 * i + 2]),
+                "swing": float(abs(value[2 * i + 2] - value[2 * i + 1])),
+            }
+            for i, (label, cell, _, _, _, entry_value) in enumerate(entries)
+        ]
+        report["outputs"][output] = sorted(rows, key=lambda row: -row["swing"])
+    return report
+
+
+def write_tornado(ws, report):
+    """Lay the report out as one ranked block per output."""
+    header_fill = PatternFill(
+        start_color="1F4E79", end_color="1F4E79", fill_type="solid"
+    )
+    pct = f"{report['perturbation']:.0%}"
+    ws["A1"] = f"Tornado - One-at-a-Time Sensitivity (+/-{pct})"
+    ws["A1"].font = Font(bold=True, size=14)
+    ws["A2"] = (
+        f"Outputs for {report['period']}; native model (scenario_model / dcf_model)"
+    )
+    ws["A2"].font = Font(italic=True, size=9, color="666666")
+    ws.column_dimensions["A"].width = 38
+    ws.column_dimensions["B"].width = 24
+    for letter in "CDEF":
+        ws.column_dimensions[letter].width = 14
+
+    top = 4
+    headers = ["Assumption", "Cell", "Value", f"-{pct}", f"+{pct}", "Swing"]
+    for output, rows in report["outputs"].items():
+        title = ws.cell(
+            row=top,
+            column=1,
+            value=f"{output.replace('_', ' ')} (base {report['base'][output]:,.2f})",
+        )
+        title.font = Font(bold=True, size=12)
+        for j, header in enumerate(headers, start=1):
+            cell = ws.cell(row=top + 1, column=j, value=header)
+            cell.font = Font(bold=True, color="FFFFFF")
+            cell.fill = header_fill
+            cell.alignment = Alignment(horizontal="center")
+        for i, row in enumerate(rows, start=top + 2):
+            ws.cell(row=i, column=1, value=row["assumption"])
+            ws.cell(row=i, column=2, value=row["cell"])
+            for j, key in enumerate(("value", "low", "high", "swing"), start=3):
+                ws.cell(row=i, column=j, value=row[key]).number_format = "#,##0.00##"
+        top += len(rows) + 3
+
+
+def add_tornado_sheet(wb, perturbation=PERTURBATION, title="Tornado"):
+    """
+    Evaluate the workbook in-process and write the report to the `title`
+    sheet (replaced if present). Returns the report.
+    """
+    model = FormulaModel.from_workbook(wb)
+    model.evaluate()
+    opening, base, periods = load_base_case()
+    report = tornado(model, opening, base, periods, perturbation)
+    if title in wb.sheetnames:
+        del wb[title]
+    write_tornado(wb.create_sheet(title), report)
+    return report
+
+
+def save_report(report, path):
+    """Write the report as JSON."""
+    with open(path, "w") as fh:
+        json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    # python tornado.py <updated Module7 workbook> [perturbation]
+    path = sys.argv[1]
+    perturbation = float(sys.argv[2]) if len(sys.argv) > 2 else PERTURBATION
+    wb = openpyxl.load_workbook(path, keep_vba=path.endswith(".xlsm"))
+    report = add_tornado_sheet(wb, perturbation)
+    wb.save(path)
+    save_report(report, os.path.splitext(path)[0] + "_Tornado.json")
+    for output, rows in report["outputs"].items():
+        top = ", ".join(f"{row['assumption']} {row['swing']:.2f}" for row in rows[:3])
+        print(f"{output}: {top}")
@@ -7,18 +7,101 @@ Update Module7.xlsm with Lululemon Athletica (LULU) Data - FINAL VERSION
 - Pro forma projections with formula-driven assumptions
 """
 
+import os
+import sys
+
 import openpyxl
 import openpyxl.cell.cell
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.styles import Font, PatternFill
 from openpyxl.utils import get_column_letter
 
+from bloomberg_xidf import XIDF_PATH, load_statements
+from dcf_model import add_sensitivity_sheet
+from driver_ratios import driver_assumptions, driver_history
+from financial_store import FinancialStore, add_margins, load_financials
+from formula_engine import FormulaModel
+from scenario_model import FIXED_DRIVERS
+from template_pool import load_template
+from tornado import add_tornado_sheet, save_report
+from xlsm_patch import save_patched, snapshot
+
+# Template labels that differ from the line-item label in the Bloomberg export
+BLOOMBERG_LABELS = {
+    "Basic Shares Outstanding": "Weighted Avg. Basic Shares Out.",
+    "Diluted Shares Outstanding": "Weighted Avg. Diluted Shares Out.",
+    "Sale of Property, Plant & Equip": "Sale of Property, Plant, and Equipment",
+    "Increase in Capital Stocks": "Increase in CapItal Stocks",  # sic
+}
+
+
+def bloomberg_store(table, labels):
+    """Bloomberg line items for `labels`, keyed by the template's own labels."""
+    fields = {label: BLOOMBERG_LABELS.get(label, label) for label in labels}
+    return FinancialStore.from_table(table, fields, missing=0.0)
+
+
+def solve_interest(wb, tolerance=1e-6, max_iterations=50):
+    """
+    Interest income on average BalanceSheet cash (row 6) and interest expense
+    on the average revolver (row 108) and long-term debt (row 29), written to
+    IncomeStatement rows 12-13 of the estimate years. Interest moves net
+    income and so the funding plug; the workbook's own formulas are
+    recalculated (formula_engine) until both lines move by at most
+    `tolerance`. Returns the iterations taken.
+    """
+    rates = {
+        name: FIXED_DRIVERS[name]
+        for name in ("Cash_Yield", "Revolver_Rate", "Debt_Rate")
+    }
+    years = (("G", "G", "H"), ("H", "H", "I"))  # IS column, BS prior, BS current
+
+    def average(model, row, prior, current):
+        # Unset cells (no revolver before the forecast) read as zero
+        return (
+            sum(
+                model.value("BalanceSheet", f"{col}{row}") or 0.0
+                for col in (prior, current)
+            )
+            / 2
+        )
 
-def update_module7():
+    model = FormulaModel.from_workbook(wb)
+    model.evaluate()
+    for iteration in range(1, max_iterations + 1):
+        residual = 0.0
+        for is_col, prior, current in years:
+            solved = {
+                12: rates["Revolver_Rate"] * average(model, 108, prior, current)
+                + rates["Debt_Rate"] * average(model, 29, prior, current),
+                13: rates["Cash_Yield"] * average(model, 6, prior, current),
+            }
+            for row, value in solved.items():
+                previous = model.value("IncomeStatement", f"{is_col}{row}") or 0.0
+                residual = max(residual, abs(value - previous))
+                model.edit("IncomeStatement", f"{is_col}{row}", value)
+        model.recalculate()
+        if residual <= tolerance:
+            break
+    ws = wb["IncomeStatement"]
+    for is_col, _, _ in years:
+        for row in (12, 13):
+            ws[f"{is_col}{row}"] = model.value("IncomeStatement", f"{is_col}{row}")
+    return iteration
+
+
+def update_module7(patch=False):
+    """
+    Fill the Module7 template with LULU data. With `patch` the output is
+    saved by patching the template's zip (see xlsm_patch): only the edited
+    sheets are rewritten and every other part is copied as is. The template
+    is parsed once per process (see template_pool); each call fills a clone.
+    """
     # Load the template (preserve macros)
     filepath = (
         r"c:\Users\nduta\OneDrive\Desktop\Projects\lulu-lemon-project\Module7.xlsm"
     )
-    wb = openpyxl.load_workbook(filepath, keep_vba=True)
+    wb = load_template(filepath)
+    loaded = snapshot(wb) if patch else None
 
     # Define styles
     header_font = Font(bold=True, size=12)
@@ -103,90 +186,35 @@ def update_module7():
     for label, row in is_labels:
         ws.cell(row=row, column=1, value=label)
 
-    # Historical data (FY 2021 - FY 2025) - Columns B through F
-    is_data = {
-        "B": {  # FY 2021
-            5: 4401.879,
-            6: 1937.888,
-            8: 1609.003,
-            9: 35.002,
-            12: 0,
-            13: 0,
-            15: 0.636,
-            17: 0,
-            18: 0,
-            22: 0,
-            24: 0,
-            27: 130.5,
-            28: 130.9,
-        },
-        "C": {  # FY 2022
-            5: 6256.617,
-            6: 2648.052,
-            8: 2225.034,
-            9: 50.176,
-            12: 0,
-            13: 0,
-            15: -0.514,
-            17: 0,
-            18: 0,
-            22: 0,
-            24: 0,
-            27: 129.5,
-            28: 130.2,
-        },
-        "D": {  # FY 2023
-            5: 8110.518,
-            6: 3618.178,
-            8: 2757.447,
-            9: 406.485,
-            12: 0,
-            13: 0,
-            15: -401.896,
-            17: 407.913,
-            18: 0,
-            22: 0,
-            24: 0,
-            27: 127.2,
-            28: 128.0,
-        },
-        "E": {  # FY 2024
-            5: 9619.278,
-            6: 4009.873,
-            8: 3397.218,
-            9: 79.511,
-            12: 0,
-            13: 0,
-            15: -117.56,
-            17: 0,
-            18: 74.501,
-            22: 0,
-            24: 0,
-            27: 125.5,
-            28: 127.1,
-        },
-        "F": {  # FY 2025
-            5: 10588.126,
-            6: 4317.315,
-            8: 3762.379,
-            9: 2.735,
-            12: 0,
-            13: 0,
-            15: -70.38,
-            17: 0,
-            18: 0,
-            22: 0,
-            24: 0,
-            27: 122.0,
-            28: 124.0,
-        },
-    }
+    # Historical data (FY 2021 - FY 2025) - Columns B through F, looked up by
+    # label in the Bloomberg export - every other row is a formula below
+    statements = load_statements(XIDF_PATH)
+    income, balance, cashflow, estimates = load_financials(XIDF_PATH)
+    drivers = driver_assumptions(driver_history([income, balance, cashflow]), "last")
+    is_inputs = [
+        "Revenue",
+        "Cost Of Goods Sold",
+        "Selling General & Admin Exp.",
+        "Other Operating Expense/(Income)",
+        "Interest Expense",
+        "Interest Income",
+        "Other Non-Operating Exp. (Inc)",
+        "Impairment of Goodwill",
+        "Asset Writedown",
+        "Income Tax Expense",
+        "Minority Int. in Earnings",
+        "Pref. Dividends",
+        "Basic Shares Outstanding",
+        "Diluted Shares Outstanding",
+    ]
+    is_rows = dict(is_labels)
+    bbg_is = bloomberg_store(statements["Income Statement"], is_inputs)
+    is_periods = [header.replace(" ", "") for header in year_headers[:5]]
 
     # Fill historical values
-    for col_letter, data in is_data.items():
-        col = ord(col_letter) - ord("A") + 1
-        for row, value in data.items():
-            ws.cell(row=row, column=col, value=value)
+    for label in is_inputs:
+        for i, value in enumerate(bbg_is.row(label, is_periods)):
+            ws.cell(row=is_rows[label], column=2 + i, value=value)
 
     # Add FORMULAS for historical years (Columns B-F)
     for col_letter in ["B", "C", "D", "E", "F"]:
@@ -219,13 +247,6 @@ def update_module7():
         # Diluted EPS = NI to Common / Diluted Shares
         ws.cell(row=30, column=col, value=f"={col_letter}25/{col_letter}28")
 
-    # Historical tax values (calculated from Bloomberg data)
-    ws["B20"] = 230.437
-    ws["C20"] = 358.547
-    ws["D20"] = 477.771
-    ws["E20"] = 700.046
-    ws["F20"] = 761.461
-
     # =========================================================================
     # PRO FORMA ESTIMATES (FY 2026E, FY 2027E) - Columns G and H with FORMULAS
     # =========================================================================
@@ -233,26 +254,29 @@ def update_module7():
     # Assumptions row (add at bottom)
     ws["A32"] = "ASSUMPTIONS"
     ws["A32"].font = header_font
-    ws["A33"] = "Revenue Growth Rate"
-    ws["B33"] = 4.27 / 100  # 4.27% for FY 2026
-    ws["C33"] = 4.50 / 100  # 4.50% for FY 2027
-    ws["A34"] = "Gross Margin"
-    ws["B34"] = 56.54 / 100  # 56.54% for FY 2026
-    ws["C34"] = 55.14 / 100  # 55.14% for FY 2027
-    ws["A35"] = "SG&A % of Revenue"
-    ws["B35"] = 35.5 / 100
-    ws["C35"] = 35.5 / 100
-    ws["A36"] = "Tax Rate"
-    ws["B36"] = 31.28 / 100  # Based on FY 2026 estimates
-    ws["C36"] = 31.17 / 100
-    ws["A37"] = "Other OpEx"
-    ws["B37"] = 50.0
-    ws["C37"] = 50.0
+    # Growth and gross margin from the consensus, SG&A and tax from the
+    # history, other OpEx fixed (see scenario_model.FIXED_DRIVERS)
+    consensus = income.concat(estimates)
+    add_margins(consensus)
+    estimate_years = ["FY2026E", "FY2027E"]  # columns G and H
+    assumption_rows = [
+        ("Revenue Growth Rate", consensus.row("Revenue_Growth", estimate_years)),
+        ("Gross Margin", consensus.row("Gross_Margin", estimate_years)),
+        ("SG&A % of Revenue", [drivers["SGA_Pct"]] * 2),
+        ("Tax Rate", [drivers["Tax_Rate"]] * 2),
+        ("Other OpEx", [FIXED_DRIVERS["Other_OpEx"]] * 2),
+    ]
+    for row, (label, values) in enumerate(assumption_rows, start=33):
+        ws.cell(row=row, column=1, value=label)
+        for col, value in enumerate(values, start=2):
+            ws.cell(row=row, column=col, value=value)
 
     # FY 2026E (Column G) - FORMULA DRIVEN
     col = 7  # Column G
     # Revenue = Prior Year * (1 + Growth Rate) - Using Bloomberg consensus
-    ws.cell(row=5, column=col, value=11040.29)  # Bloomberg consensus
+    ws.cell(
+        row=5, column=col, value=estimates.value("Revenue", "FY2026E")
+    )  # Bloomberg consensus
     ws.cell(row=5, column=col).fill = estimate_fill
     # COGS = Revenue * (1 - Gross Margin)
     ws.cell(row=6, column=col, value=f"=G5*(1-$B$34)")
@@ -267,12 +291,14 @@ def update_module7():
     ws.cell(row=10, column=col, value=f"=G8+G9")
     # EBIT
     ws.cell(row=11, column=col, value=f"=G7-G10")
-    # Interest
+    # Interest on average cash and revolver, solved with the funding plug once
+    # the balance sheet is written (solve_interest)
     ws.cell(row=12, column=col, value=0)
     ws.cell(row=13, column=col, value=0)
     ws.cell(row=14, column=col, value=f"=G12-G13")
-    # Other Non-Op (assume similar to prior)
-    ws.cell(row=15, column=col, value=-70.0)
+    # Other Non-Op: interest on cash is LULU's non-operating income, so the
+    # hand-set line is zero alongside it
+    ws.cell(row=15, column=col, value=0)
     # EBT
     ws.cell(row=16, column=col, value=f"=G11-G14-G15")
     # Unusual items
@@ -298,7 +324,9 @@ def update_module7():
     # FY 2027E (Column H) - FORMULA DRIVEN
     col = 8  # Column H
     # Revenue = Prior Year * (1 + Growth Rate) - Bloomberg consensus
-    ws.cell(row=5, column=col, value=11537.65)  # Bloomberg consensus
+    ws.cell(
+        row=5, column=col, value=estimates.value("Revenue", "FY2027E")
+    )  # Bloomberg consensus
     ws.cell(row=5, column=col).fill = estimate_fill
     # COGS = Revenue * (1 - Gross Margin)
     ws.cell(row=6, column=col, value=f"=H5*(1-$C$34)")
@@ -313,12 +341,13 @@ def update_module7():
     ws.cell(row=10, column=col, value=f"=H8+H9")
     # EBIT
     ws.cell(row=11, column=col, value=f"=H7-H10")
-    # Interest
+    # Interest on average cash and revolver, solved with the funding plug once
+    # the balance sheet is written (solve_interest)
     ws.cell(row=12, column=col, value=0)
     ws.cell(row=13, column=col, value=0)
     ws.cell(row=14, column=col, value=f"=H12-H13")
     # Other Non-Op
-    ws.cell(row=15, column=col, value=-70.0)
+    ws.cell(row=15, column=col, value=0)
     # EBT
     ws.cell(row=16, column=col, value=f"=H11-H14-H15")
     # Unusual items
@@ -438,166 +467,45 @@ def update_module7():
         if label in ["ASSETS", "LIABILITIES", "EQUITY"]:
             ws.cell(row=row, column=1).font = header_font
 
-    # Historical Balance Sheet Data (FY 2020 - FY 2025)
-    bs_hist_data = {
-        2: {  # FY 2020 - Column B
-            6: 1093.505,
-            7: 0,
-            9: 40.219,
-            11: 518.513,
-            12: 70.542,
-            13: 85.159,
-            16: 1361.357,
-            17: 0,
-            18: 31.435,
-            19: 80.624,
-            23: 128.497,
-            24: 79.997,
-            25: 26.436,
-            26: 133.688,
-            27: 251.8,
-            29: 611.464,
-            30: 97.254,
-            34: 0,
-            35: 0,
-            36: 356.162,
-            37: 1820.637,
-            38: 0,
-            39: -224.581,
-        },
-        3: {  # FY 2021 - Column C
-            6: 1150.517,
-            7: 0,
-            9: 62.399,
-            11: 647.23,
-            12: 125.107,
-            13: 139.126,
-            16: 1480.522,
-            17: 0,
-            18: 6.731,
-            19: 573.583,
-            23: 166.091,
-            24: 172.246,
-            25: 8.357,
-            26: 130.171,
-            27: 406.313,
-            29: 632.59,
-            30: 110.881,
-            34: 0,
-            35: 0,
-            36: 389.293,
-            37: 2346.428,
-            38: 0,
-            39: -177.155,
-        },
-        4: {  # FY 2022 - Column D
-            6: 1259.871,
-            7: 0,
-            9: 77.001,
-            11: 966.481,
-            12: 192.572,
-            13: 118.928,
-            16: 1731.253,
-            17: 0,
-            18: 6.091,
-            19: 590.281,
-            23: 188.996,
-            24: 289.728,
-            25: 133.852,
-            26: 204.921,
-            27: 587.837,
-            29: 692.056,
-            30: 105.042,
-            34: 0,
-            35: 0,
-            36: 423.123,
-            37: 2512.84,
-            38: 0,
-            39: -195.917,
-        },
-        5: {  # FY 2023 - Column E
-            6: 1154.867,
-            7: 0,
-            9: 132.906,
-            11: 1447.367,
-            12: 238.672,
-            13: 185.641,
-            16: 2239.033,
-            17: 0,
-            18: 6.402,
-            19: 202.15,
-            23: 207.972,
-            24: 172.732,
-            25: 174.221,
-            26: 248.167,
-            27: 689.106,
-            29: 862.362,
-            30: 103.679,
-            34: 0,
-            35: 0,
-            36: 475.256,
-            37: 2926.127,
-            38: 0,
-            39: -252.584,
-        },
-        6: {  # FY 2024 - Column F
-            6: 2243.971,
-            7: 0,
-            9: 124.769,
-            11: 1323.602,
-            12: 184.502,
-            13: 183.733,
-            16: 2811.421,
-            17: 0,
-            18: 9.176,
-            19: 210.767,
-            23: 249.27,
-            24: 348.441,
-            25: 12.098,
-            26: 326.11,
-            27: 695.342,
-            29: 1154.012,
-            30: 74.587,
-            34: 0,
-            35: 0,
-            36: 575.975,
-            37: 3920.362,
-            38: 0,
-            39: -264.256,
-        },
-        7: {  # FY 2025 - Column G
-            6: 1984.336,
-            7: 0,
-            9: 120.173,
-            11: 1442.081,
-            12: 208.0,
-            13: 225.712,
-            16: 3196.873,
-            17: 0,
-            18: 17.085,
-            19: 409.032,
-            23: 275.154,
-            24: 271.406,
-            25: 183.126,
-            26: 350.0,
-            27: 759.944,
-            29: 1300.637,
-            30: 138.978,
-            34: 0,
-            35: 0,
-            36: 620.0,
-            37: 4000.0,
-            38: 0,
-            39: -295.953,
-        },
-    }
+    # Historical Balance Sheet Data (FY 2020 - FY 2025), looked up by label in
+    # the Bloomberg export - every other row is a formula below
+    bs_inputs = [
+        "Cash And Equivalents",
+        "Short Term Investments",
+        "Accounts & Notes Receivable",
+        "Inventories",
+        "Prepaid Exp.",
+        "Other Current Assets",
+        "Net Property, Plant & Equipment",
+        "Long-term Investments",
+        "Deferred Charges, LT",
+        "Other Long-Term Assets",
+        "Short-term Borrowings",
+        "Accounts Payable",
+        "Curr. Income Taxes Payable",
+        "Accrued Exp.",
+        "Other Current Liabilities",
+        "Long-Term Debt",
+        "Other Non-Current Liabilities",
+        "Pref. Stock, Non-Redeem.",
+        "Minority Interest",
+        "Additional Paid In Capital",
+        "Retained Earnings",
+        "Treasury Stock",
+        "Comprehensive Inc. and Other",
+    ]
+    bs_rows = dict(bs_labels)
+    bbg_bs = bloomberg_store(statements["Balance Sheet"], bs_inputs)
+    bs_periods = [header.replace(" ", "") for header in bs_year_headers[:6]]
+
+    # Fill raw values
+    for label in bs_inputs:
+        for i, value in enumerate(bbg_bs.row(label, bs_periods)):
+            ws.cell(row=bs_rows[label], column=2 + i, value=value)
 
-    # Fill historical data and add formulas
-    for col, data in bs_hist_data.items():
+    for i in range(len(bs_periods)):
+        col = 2 + i
         col_letter = get_column_letter(col)
-        # Fill raw values
-        for row, value in data.items():
-            ws.cell(row=row, column=col, value=value)
 
         # Add FORMULAS
         # Total Cash = Cash + ST Investments
@@ -642,22 +550,53 @@ def update_module7():
     # Balance Sheet Assumptions
     ws["A46"] = "BALANCE SHEET ASSUMPTIONS"
     ws["A46"].font = header_font
-    ws["A47"] = "Cash % of Revenue"
-    ws["B47"] = 0.19
+    ws["A47"] = "Minimum Cash % of Revenue"
+    ws["B47"] = drivers["Cash_Pct"]
     ws["A48"] = "A/R Days"
-    ws["B48"] = 4
+    ws["B48"] = drivers["DSO"]
     ws["A49"] = "Inventory Days"
-    ws["B49"] = 122
+    ws["B49"] = drivers["DIO"]
     ws["A50"] = "Net PPE Growth"
-    ws["B50"] = 0.05
+    ws["B50"] = FIXED_DRIVERS["PPE_Growth"]
     ws["A51"] = "Retained Earnings Growth (from NI)"
     ws["B51"] = "Links to Income Statement"
+    ws["A52"] = "Max Debt / EBITDA"
+    ws["B52"] = FIXED_DRIVERS["Max_Leverage"]
+
+    # Funding plug: below the minimum the revolver (on top of the last actual
+    # short-term borrowings) draws the gap, up to its capacity. Cash before
+    # the plug is last year's cash without last year's revolver, plus this
+    # year's cash flows other than the revolver line (CashFlow row 21).
+    # Kept below the template's notes and ratio rows (A54:B102)
+    ws["A104"] = "FUNDING PLUG"
+    ws["A104"].font = header_font
+    ws["A105"] = "Cash Before Plug"
+    ws["A106"] = "Minimum Cash"
+    ws["A107"] = "Revolver Capacity"
+    ws["A108"] = "Revolver Balance"
+    for prior, col_letter, is_col in (("G", "H", "G"), ("H", "I", "H")):
+        ws[f"{col_letter}105"] = (
+            f"={prior}6"
+            + (f"-{prior}108" if prior != "G" else "")
+            + "".join(
+                f"+CashFlow!{is_col}{row}"
+                for row in (10, 18, 22, 23, 25, 26, 27, 28, 29)
+            )
+        )
+        ws[f"{col_letter}106"] = f"=IncomeStatement!{is_col}5*$B$47"
+        ws[f"{col_letter}107"] = (
+            f"=MAX($B$52*(IncomeStatement!{is_col}11+CashFlow!{is_col}7)"
+            f"-$G$23-{col_letter}29,0)"
+        )
+        ws[f"{col_letter}108"] = (
+            f"=MIN(MAX({col_letter}106-{col_letter}105,0),{col_letter}107)"
+        )
 
     # FY 2026E Projections (Column H) - FORMULA DRIVEN
     col = 8
     col_letter = "H"
-    # Cash = Revenue * Cash %
-    ws.cell(row=6, column=col, value=f"=IncomeStatement!G5*$B$47")
+    # Cash = Prior + Net Change in Cash (revolver included)
+    ws.cell(row=6, column=col, value=f"=G6+CashFlow!G32")
     ws.cell(row=6, column=col).fill = estimate_fill
     ws.cell(row=7, column=col, value=0)
     ws.cell(row=8, column=col, value=f"={col_letter}6+{col_letter}7")
@@ -683,8 +622,8 @@ def update_module7():
         column=col,
         value=f"={col_letter}14+{col_letter}16+{col_letter}17+{col_letter}18+{col_letter}19",
     )
-    # Liabilities
-    ws.cell(row=23, column=col, value=290.0)
+    # Liabilities; short-term borrowings carry the revolver
+    ws.cell(row=23, column=col, value=f"=$G$23+{col_letter}108")
     ws.cell(row=24, column=col, value=290.0)
     ws.cell(row=25, column=col, value=170.0)
     ws.cell(row=26, column=col, value=360.0)
@@ -694,15 +633,17 @@ def update_module7():
         column=col,
         value=f"={col_letter}23+{col_letter}24+{col_letter}25+{col_letter}26+{col_letter}27",
     )
-    ws.cell(row=29, column=col, value=1350.0)
+    # Long-term debt held flat; new funding comes from the revolver
+    ws.cell(row=29, column=col, value="=G29")
     ws.cell(row=30, column=col, value=145.0)
     ws.cell(row=31, column=col, value=f"={col_letter}28+{col_letter}29+{col_letter}30")
     # Equity
     ws.cell(row=34, column=col, value=0)
     ws.cell(row=35, column=col, value=0)
-    ws.cell(row=36, column=col, value=670.0)
-    # Retained Earnings = Prior RE + Net Income
-    ws.cell(row=37, column=col, value=f"=G37+IncomeStatement!G23")
+    # APIC = Prior + Stock Issued
+    ws.cell(row=36, column=col, value=f"=G36+CashFlow!G27")
+    # Retained Earnings = Prior RE + Net Income + Repurchases (negative)
+    ws.cell(row=37, column=col, value=f"=G37+IncomeStatement!G23+CashFlow!G28")
     ws.cell(row=38, column=col, value=0)
     ws.cell(row=39, column=col, value=-310.0)
     ws.cell(
@@ -719,8 +660,8 @@ def update_module7():
     # FY 2027E Projections (Column I) - FORMULA DRIVEN
     col = 9
     col_letter = "I"
-    # Cash = Revenue * Cash %
-    ws.cell(row=6, column=col, value=f"=IncomeStatement!H5*$B$47")
+    # Cash = Prior + Net Change in Cash (revolver included)
+    ws.cell(row=6, column=col, value=f"=H6+CashFlow!H32")
     ws.cell(row=6, column=col).fill = estimate_fill
     ws.cell(row=7, column=col, value=0)
     ws.cell(row=8, column=col, value=f"={col_letter}6+{col_letter}7")
@@ -746,8 +687,8 @@ def update_module7():
         column=col,
         value=f"={col_letter}14+{col_letter}16+{col_letter}17+{col_letter}18+{col_letter}19",
     )
-    # Liabilities
-    ws.cell(row=23, column=col, value=305.0)
+    # Liabilities; short-term borrowings carry the revolver
+    ws.cell(row=23, column=col, value=f"=$G$23+{col_letter}108")
     ws.cell(row=24, column=col, value=305.0)
     ws.cell(row=25, column=col, value=160.0)
     ws.cell(row=26, column=col, value=375.0)
@@ -757,15 +698,16 @@ def update_module7():
         column=col,
         value=f"={col_letter}23+{col_letter}24+{col_letter}25+{col_letter}26+{col_letter}27",
     )
-    ws.cell(row=29, column=col, value=1400.0)
+    ws.cell(row=29, column=col, value="=H29")
     ws.cell(row=30, column=col, value=150.0)
     ws.cell(row=31, column=col, value=f"={col_letter}28+{col_letter}29+{col_letter}30")
     # Equity
     ws.cell(row=34, column=col, value=0)
     ws.cell(row=35, column=col, value=0)
-    ws.cell(row=36, column=col, value=720.0)
-    # Retained Earnings = Prior RE + Net Income
-    ws.cell(row=37, column=col, value=f"=H37+IncomeStatement!H23")
+    # APIC = Prior + Stock Issued
+    ws.cell(row=36, column=col, value=f"=H36+CashFlow!H27")
+    # Retained Earnings = Prior RE + Net Income + Repurchases (negative)
+    ws.cell(row=37, column=col, value=f"=H37+IncomeStatement!H23+CashFlow!H28")
     ws.cell(row=38, column=col, value=0)
     ws.cell(row=39, column=col, value=-320.0)
     ws.cell(
@@ -868,112 +810,40 @@ def update_module7():
         ]:
             ws.cell(row=row, column=1).font = header_font
 
-    # Historical Cash Flow Data
-    cf_hist_data = {
-        2: {  # FY 2021
-            6: 588.913,
-            7: 185.478,
-            8: 51.489,
-            9: -22.544,
-            13: -229.226,
-            14: 0,
-            15: 0,
-            16: 0,
-            17: -466.306,
-            21: 0,
-            22: 0,
-            23: 0,
-            25: 0,
-            26: 0,
-            27: 15.263,
-            28: -96.051,
-            29: 29.996,
-        },
-        3: {  # FY 2022
-            6: 975.322,
-            7: 224.206,
-            8: 86.46,
-            9: 103.12,
-            13: -394.502,
-            14: 0,
-            15: 0,
-            16: 0,
-            17: -33.389,
-            21: 0,
-            22: 0,
-            23: 0,
-            25: 0,
-            26: 0,
-            27: 18.194,
-            28: -862.411,
-            29: -7.646,
-        },
-        4: {  # FY 2023
-            6: 854.8,
-            7: 291.791,
-            8: 401.326,
-            9: -581.454,
-            13: -638.657,
-            14: 0,
-            15: 0,
-            16: 0,
-            17: 68.72,
-            21: 0,
-            22: 0,
-            23: 0,
-            25: 0,
-            26: 0,
-            27: 11.704,
-            28: -479.159,
-            29: -34.075,
-        },
-        5: {  # FY 2024
-            6: 1550.19,
-            7: 379.384,
-            8: 163.852,
-            9: 202.738,
-            13: -651.865,
-            14: 0,
-            15: 0,
-            16: 0,
-            17: -2.267,
-            21: 0,
-            22: 0,
-            23: 0,
-            25: 0,
-            26: 0,
-            27: 42.43,
-            28: -591.226,
-            29: -4.132,
-        },
-        6: {  # FY 2025
-            6: 1814.616,
-            7: 446.524,
-            8: 16.252,
-            9: -4.679,
-            13: -689.232,
-            14: 0,
-            15: 0,
-            16: 0,
-            17: -108.942,
-            21: 0,
-            22: 0,
-            23: 0,
-            25: 0,
-            26: 0,
-            27: 20.0,
-            28: -1672.476,
-            29: -81.698,
-        },
-    }
-
-    # Fill historical data and add formulas
-    for col, data in cf_hist_data.items():
+    # Historical Cash Flow Data (FY 2021 - FY 2025), looked up by label in the
+    # Bloomberg export - every other row is a formula below
+    cf_inputs = [
+        "Net Income",
+        "Depreciation & Amort., Total",
+        "Other Non-Cash Adj",
+        "Changes in Non-Cash Capital",
+        "Capital Expenditure",
+        "Sale of Property, Plant & Equip",
+        "Cash Acquisitions",
+        "Proceeds from Investment",
+        "Other Investing Activities",
+        "Net Short Term Debt Issued/Repaid",
+        "Long-Term Debt Issued",
+        "Long-Term Debt Repaid",
+        "Pref. Dividends Paid",
+        "Total Dividends Paid",
+        "Increase in Capital Stocks",
+        "Decrease in Capital Stocks",
+        "Other Financing Activities",
+    ]
+    cf_rows = dict(cf_labels)
+    bbg_cf = bloomberg_store(statements["Cash Flow"], cf_inputs)
+    cf_periods = [header.replace(" ", "") for header in cf_year_headers[:5]]
+
+    # Fill historical data
+    for label in cf_inputs:
+        for i, value in enumerate(bbg_cf.row(label, cf_periods)):
+            ws.cell(row=cf_rows[label], column=2 + i, value=value)
+
+    # Formulas
+    for i in range(len(cf_periods)):
+        col = 2 + i
         col_letter = get_column_letter(col)
-        for row, value in data.items():
-            ws.cell(row=row, column=col, value=value)
-
-        # Formulas
         # CFO = Net Income + D&A + Other + Changes in WC
         ws.cell(
             row=10,
@@ -1011,34 +881,67 @@ def update_module7():
     ws.cell(row=6, column=col).fill = estimate_fill
     # D&A as % of prior PPE
     ws.cell(row=7, column=col, value=f"=BalanceSheet!G16*0.15")  # 15% depreciation rate
-    ws.cell(row=8, column=col, value=50.0)
-    ws.cell(row=9, column=col, value=-80.0)
+    # Change in other non-current liabilities and AOCI
+    ws.cell(
+        row=8,
+        column=col,
+        value="=BalanceSheet!H30-BalanceSheet!G30+BalanceSheet!H39-BalanceSheet!G39",
+    )
+    # Operating current assets down / current liabilities up
+    ws.cell(
+        row=9,
+        column=col,
+        value="="
+        + "+".join(
+            f"BalanceSheet!G{row}-BalanceSheet!H{row}" for row in (9, 11, 12, 13)
+        )
+        + "".join(
+            f"+BalanceSheet!H{row}-BalanceSheet!G{row}" for row in (24, 25, 26, 27)
+        ),
+    )
     ws.cell(
         row=10,
         column=col,
         value=f"={col_letter}6+{col_letter}7+{col_letter}8+{col_letter}9",
     )
-    # CapEx as % of Revenue
-    ws.cell(row=13, column=col, value=f"=-IncomeStatement!G5*0.065")  # 6.5% of revenue
+    # CapEx implied by the PPE path: PPE grows by CapEx net of D&A
+    ws.cell(row=13, column=col, value="=BalanceSheet!G16-BalanceSheet!H16-G7")
     ws.cell(row=14, column=col, value=0)
     ws.cell(row=15, column=col, value=0)
-    ws.cell(row=16, column=col, value=0)
-    ws.cell(row=17, column=col, value=-50.0)
+    # Change in short- and long-term investments
+    ws.cell(
+        row=16,
+        column=col,
+        value="=BalanceSheet!G7-BalanceSheet!H7+BalanceSheet!G17-BalanceSheet!H17",
+    )
+    # Change in deferred charges and other long-term assets
+    ws.cell(
+        row=17,
+        column=col,
+        value="=BalanceSheet!G18-BalanceSheet!H18+BalanceSheet!G19-BalanceSheet!H19",
+    )
     ws.cell(
         row=18,
         column=col,
         value=f"={col_letter}13+{col_letter}14+{col_letter}15+{col_letter}16+{col_letter}17",
     )
-    # Financing
-    ws.cell(row=21, column=col, value=0)
-    ws.cell(row=22, column=col, value=0)
-    ws.cell(row=23, column=col, value=0)
+    # Financing: the FUNDING PLUG revolver draw / (repayment), then the
+    # change in long-term debt
+    ws.cell(row=21, column=col, value="=BalanceSheet!H108")
+    ws.cell(row=22, column=col, value="=MAX(BalanceSheet!H29-BalanceSheet!G29,0)")
+    ws.cell(row=23, column=col, value="=MIN(BalanceSheet!H29-BalanceSheet!G29,0)")
     ws.cell(row=24, column=col, value=f"={col_letter}21+{col_letter}22+{col_letter}23")
     ws.cell(row=25, column=col, value=0)
     ws.cell(row=26, column=col, value=0)
-    ws.cell(row=27, column=col, value=25.0)
-    ws.cell(row=28, column=col, value=-800.0)
-    ws.cell(row=29, column=col, value=-50.0)
+    ws.cell(row=27, column=col, value=FIXED_DRIVERS["Stock_Issued"])
+    ws.cell(row=28, column=col, value=FIXED_DRIVERS["Stock_Repurchased"])
+    # Change in preferred stock, minority interest and treasury stock
+    ws.cell(
+        row=29,
+        column=col,
+        value="="
+        + "+".join(f"BalanceSheet!H{row}-BalanceSheet!G{row}" for row in (34, 35, 38)),
+    )
     ws.cell(
         row=30,
         column=col,
@@ -1053,32 +956,59 @@ def update_module7():
     ws.cell(row=6, column=col, value=f"=IncomeStatement!H23")
     ws.cell(row=6, column=col).fill = estimate_fill
     ws.cell(row=7, column=col, value=f"=BalanceSheet!H16*0.15")
-    ws.cell(row=8, column=col, value=50.0)
-    ws.cell(row=9, column=col, value=-70.0)
+    ws.cell(
+        row=8,
+        column=col,
+        value="=BalanceSheet!I30-BalanceSheet!H30+BalanceSheet!I39-BalanceSheet!H39",
+    )
+    ws.cell(
+        row=9,
+        column=col,
+        value="="
+        + "+".join(
+            f"BalanceSheet!H{row}-BalanceSheet!I{row}" for row in (9, 11, 12, 13)
+        )
+        + "".join(
+            f"+BalanceSheet!I{row}-BalanceSheet!H{row}" for row in (24, 25, 26, 27)
+        ),
+    )
     ws.cell(
         row=10,
         column=col,
         value=f"={col_letter}6+{col_letter}7+{col_letter}8+{col_letter}9",
     )
-    ws.cell(row=13, column=col, value=f"=-IncomeStatement!H5*0.065")
+    ws.cell(row=13, column=col, value="=BalanceSheet!H16-BalanceSheet!I16-H7")
     ws.cell(row=14, column=col, value=0)
     ws.cell(row=15, column=col, value=0)
-    ws.cell(row=16, column=col, value=0)
-    ws.cell(row=17, column=col, value=-50.0)
+    ws.cell(
+        row=16,
+        column=col,
+        value="=BalanceSheet!H7-BalanceSheet!I7+BalanceSheet!H17-BalanceSheet!I17",
+    )
+    ws.cell(
+        row=17,
+        column=col,
+        value="=BalanceSheet!H18-BalanceSheet!I18+BalanceSheet!H19-BalanceSheet!I19",
+    )
     ws.cell(
         row=18,
         column=col,
         value=f"={col_letter}13+{col_letter}14+{col_letter}15+{col_letter}16+{col_letter}17",
     )
-    ws.cell(row=21, column=col, value=0)
-    ws.cell(row=22, column=col, value=0)
-    ws.cell(row=23, column=col, value=0)
+    ws.cell(row=21, column=col, value="=BalanceSheet!I108-BalanceSheet!H108")
+    ws.cell(row=22, column=col, value="=MAX(BalanceSheet!I29-BalanceSheet!H29,0)")
+    ws.cell(row=23, column=col, value="=MIN(BalanceSheet!I29-BalanceSheet!H29,0)")
     ws.cell(row=24, column=col, value=f"={col_letter}21+{col_letter}22+{col_letter}23")
     ws.cell(row=25, column=col, value=0)
     ws.cell(row=26, column=col, value=0)
-    ws.cell(row=27, column=col, value=25.0)
-    ws.cell(row=28, column=col, value=-800.0)
-    ws.cell(row=29, column=col, value=-50.0)
+    ws.cell(row=27, column=col, value=FIXED_DRIVERS["Stock_Issued"])
+    ws.cell(row=28, column=col, value=FIXED_DRIVERS["Stock_Repurchased"])
+    ws.cell(
+        row=29,
+        column=col,
+        value="="
+        + "+".join(f"BalanceSheet!I{row}-BalanceSheet!H{row}" for row in (34, 35, 38)),
+    )
     ws.cell(
         row=30,
         column=col,
@@ -1089,6 +1019,9 @@ def update_module7():
 
     print("✓ Cash Flow Statement updated with Bloomberg format and Excel formulas")
 
+    iterations = solve_interest(wb)
+    print(f"✓ Interest solved on average cash and revolver ({iterations} iterations)")
+
     # =========================================================================
     # WACC MODEL - with Formulas
     # =========================================================================
@@ -1114,7 +1047,7 @@ def update_module7():
     ws["A11"] = "Pre-Tax Cost of Debt"
     ws["B11"] = 0.05
     ws["A12"] = "Tax Rate"
-    ws["B12"] = 0.296
+    ws["B12"] = drivers["Tax_Rate"]
     ws["A13"] = "After-Tax Cost of Debt (Kd)"
     ws["B13"] = "=B11*(1-B12)"  # After-tax formula
 
@@ -1123,7 +1056,7 @@ def update_module7():
     ws["A16"] = "Market Value of Equity ($ millions)"
     ws["B16"] = 20770.0  # 122M shares * $170.09
     ws["A17"] = "Market Value of Debt ($ millions)"
-    ws["B17"] = 1575.791  # ST Debt + LT Debt
+    ws["B17"] = balance.value("Total_Debt", "FY2025")  # ST Debt + LT Debt
     ws["A18"] = "Total Capital"
     ws["B18"] = "=B16+B17"
     ws["A19"] = "Equity Weight"
@@ -1257,11 +1190,24 @@ def update_module7():
 
     print("✓ DCF Model updated with formulas")
 
+    # Share price grids (WACC x terminal growth, beta x risk-free), evaluated
+    # natively rather than as Excel data tables
+    add_sensitivity_sheet(wb)
+    print("✓ DCF Sensitivity sheet written")
+
+    # One-at-a-time sensitivity of NI / EPS / FCF / price to every assumption
+    tornado_report = add_tornado_sheet(wb)
+    print("✓ Tornado sheet written")
+
     # =========================================================================
     # SAVE THE WORKBOOK
     # =========================================================================
     output_path = r"c:\Users\nduta\OneDrive\Desktop\Projects\lulu-lemon-project\Module7_LULU_Final.xlsm"
-    wb.save(output_path)
+    if patch:
+        save_patched(wb, filepath, output_path, loaded)
+    else:
+        wb.save(output_path)
+    save_report(tornado_report, os.path.splitext(output_path)[0] + "_Tornado.json")
 
     print("\n" + "=" * 70)
     print("✓ Module7 FINAL VERSION COMPLETE!")
@@ -1283,4 +1229,5 @@ def update_module7():
 
 
 if __name__ == "__main__":
-    update_module7()
+    # --patch: save by patching the template zip instead of a full rewrite
+    update_module7(patch="--patch" in sys.argv[1:])
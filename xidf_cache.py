@@ -0,0 +1,90 @@
+"""
+Parsed Workbook Cache
+=====================
+On-disk cache of parsed Bloomberg XIDF sheets, so repeated runs against the
+same export skip XML parsing entirely and a re-export only re-parses the
+sheets that actually changed.
+
+- Entries are per sheet, keyed by the CRC32 and size of its zip member
+  (xl/worksheets/sheetN.xml) as recorded in the zip central directory, so
+  checking a sheet never reads or hashes the file body
+- A copied, renamed or re-exported workbook hits the cache for every sheet
+  whose XML is byte-identical
+- Each entry remembers the shared strings its cells used; when
+  sharedStrings.xml changes, the sheet is only re-parsed if one of those
+  strings moved
+- Entries are zlib-compressed pickles and are written atomically, so
+  concurrent jobs never see a half-written file
+"""
+
+import os
+import pickle
+import tempfile
+import zlib
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".xidf_cache")
+
+# Bump when the layout of the cached entries changes
+SNAPSHOT_VERSION = 2
+
+
+def read_pickle(path):
+    """Load a zlib-compressed pickle; None if it is missing or unreadable."""
+    try:
+        with open(path, "rb") as fh:
+            return pickle.loads(zlib.decompress(fh.read()))
+    except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def write_pickle(path, obj):
+    """Write a zlib-compressed pickle atomically (temp file + rename)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = zlib.compress(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL), 1)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _entry_path(info, cache_dir):
+    return os.path.join(
+        cache_dir, f"{info.CRC:08x}-{info.file_size}.v{SNAPSHOT_VERSION}.snap"
+    )
+
+
+def load(members, strings_crc, shared_strings, cache_dir=CACHE_DIR):
+    """
+    Cached grids for {sheet: ZipInfo of its member}; changed sheets are left
+    out. `strings_crc` is the CRC32 of the export's sharedStrings.xml;
+    `shared_strings()` returns its table and is only called when a cached
+    sheet was parsed against a different one.
+    """
+    grids = {}
+    strings = None
+    for name, info in members.items():
+        entry = read_pickle(_entry_path(info, cache_dir))
+        if entry is None:
+            continue
+        entry_crc, refs, grid = entry
+        if entry_crc != strings_crc:
+            if strings is None:
+                strings = shared_strings()
+            if any(i >= len(strings) or strings[i] != s for i, s in refs.items()):
+                continue
+        grids[name] = grid
+    return grids
+
+
+def store(members, strings_crc, parsed, cache_dir=CACHE_DIR):
+    """
+    Write entries for freshly parsed sheets. `parsed` maps a sheet name to
+    (grid, {shared string index: string} for the cells read).
+    """
+    for name, (grid, refs) in parsed.items():
+        write_pickle(_entry_path(members[name], cache_dir), (strings_crc, refs, grid))
@@ -0,0 +1,504 @@
+"""
+Zip-Level Workbook Patching
+===========================
+Saves a workbook loaded from a template (Module7.xlsm) by patching the
+template's zip instead of letting openpyxl re-serialise every part.
+
+- snapshot() records each cell's value and style right after loading;
+  save_patched() compares against it and rewrites only the worksheet parts
+  that changed (IncomeStatement, BalanceSheet, CashFlow, WACC, DDM, DCF)
+- Inside a patched sheet only the changed cells are regenerated; every
+  other cell, row attribute and sheet element (views, merges, conditional
+  formats, controls, drawings) stays the template's raw XML
+- Sheets created after loading (DCF Sensitivity, Tornado) become new
+  worksheet parts, registered in workbook.xml, its rels and
+  [Content_Types].xml
+- New cell formats are appended to styles.xml (fonts, fills, borders,
+  number formats, cellXfs); existing entries keep their indices, so styles
+  openpyxl does not model survive. Strings are written inline, so
+  sharedStrings.xml is untouched
+- Shared formulas in a patched sheet are written out per cell, and
+  calcChain.xml is dropped with a full recalculation on load, since edited
+  formulas would leave it stale
+- Every other part (vbaProject.bin, __FDSCACHE__, Myoutline, drawings,
+  customXml, ...) is copied byte-for-byte
+
+Run this module directly to time a full openpyxl save against a patched
+save of an edited template.
+"""
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from copy import copy
+from datetime import date, datetime
+from numbers import Real
+from xml.sax.saxutils import escape, quoteattr
+
+import openpyxl
+from openpyxl.styles.numbers import BUILTIN_FORMATS_REVERSE
+from openpyxl.utils import column_index_from_string
+from openpyxl.utils.datetime import to_excel
+from openpyxl.xml.functions import tostring
+
+from formula_engine import stored_cells
+from xlsx_reader import sheet_paths
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_WORKSHEET_TYPE = _REL_NS + "/worksheet"
+_WORKSHEET_CONTENT = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+)
+
+_WORKBOOK = "xl/workbook.xml"
+_WORKBOOK_RELS = "xl/_rels/workbook.xml.rels"
+_CONTENT_TYPES = "[Content_Types].xml"
+_STYLES = "xl/styles.xml"
+_CALC_CHAIN = "xl/calcChain.xml"
+
+_ROW = re.compile(r"<row\b([^>]*?)(?:/>|>(.*?)</row>)", re.S)
+_CELL = re.compile(r"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.S)
+_ATTRIBUTE = re.compile(r'\s([\w:]+)="([^"]*)"')
+_SHEET_DATA = re.compile(r"<sheetData\s*/>|<sheetData>.*?</sheetData>", re.S)
+_DIMENSION = re.compile(r'<dimension ref="[^"]*"\s*/>')
+_DIGITS = "0123456789"
+
+
+def _attributes(text):
+    return dict(_ATTRIBUTE.findall(text))
+
+
+def _style(cell):
+    # Merged cells carry no style array
+    return tuple(cell._style) if cell._style is not None else ()
+
+
+def snapshot(wb):
+    """{sheet: {(row, col): (value, style)}} of a freshly loaded workbook."""
+    return {
+        ws.title: {
+            key: (cell.value, _style(cell)) for key, cell in stored_cells(ws).items()
+        }
+        for ws in wb.worksheets
+    }
+
+
+def changed_cells(ws, before):
+    """
+    {(row, col): cell} of the cells whose value or style moved; cells merely
+    looked up since loading (empty, unstyled) do not count.
+    """
+    return {
+        key: cell
+        for key, cell in stored_cells(ws).items()
+        if before.get(key) != (cell.value, _style(cell))
+        and (key in before or cell.value is not None or any(_style(cell)))
+    }
+
+
+# =============================================================================
+# STYLES
+# =============================================================================
+
+
+class StylePatch:
+    """
+    Appends the cell formats a patch needs to the template's styles.xml,
+    leaving every existing entry (and its index) as it was.
+    """
+
+    def __init__(self, xml):
+        self.xml = xml
+        self.sections = {}
+        for tag in ("fonts", "fills", "borders", "cellXfs"):
+            count = re.search(rf'<{tag} count="(\d+)"', xml).group(1)
+            self.sections[tag] = (int(count), [])
+        self.formats = {
+            code: int(number)
+            for number, code in re.findall(
+                r'<numFmt numFmtId="(\d+)" formatCode="([^"]*)"', xml
+            )
+        }
+        self.next_format = max([163, *self.formats.values()]) + 1
+        self.new_formats = []
+        self.indices = {}
+        self.cells = {}  # openpyxl style array -> cellXfs index
+
+    @property
+    def changed(self):
+        return bool(self.indices)
+
+    def _index(self, tag, entry):
+        key = (tag, entry)
+        if key not in self.indices:
+            count, added = self.sections[tag]
+            self.indices[key] = count + len(added)
+            added.append(entry)
+        return self.indices[key]
+
+    def _number_format(self, code):
+        if code in BUILTIN_FORMATS_REVERSE:
+            return BUILTIN_FORMATS_REVERSE[code]
+        code = escape(code, {'"': "&quot;"})
+        if code not in self.formats:
+            self.formats[code] = self.next_format
+            self.new_formats.append(
+                f'<numFmt numFmtId="{self.next_format}" formatCode="{code}"/>'
+            )
+            self.next_format += 1
+        return self.formats[code]
+
+    def xf(self, cell):
+        """cellXfs index for an openpyxl cell's font, fill, border and format."""
+        style = cell._style
+        key = tuple(style)
+        if key in self.cells:
+            return self.cells[key]
+        font = self._index("fonts", tostring(copy(cell.font).to_tree()).decode())
+        fill = self._index("fills", tostring(copy(cell.fill).to_tree()).decode())
+        border = self._index("borders", tostring(copy(cell.border).to_tree()).decode())
+        number = self._number_format(cell.number_format)
+        entry = (
+            f'<xf numFmtId="{number}" fontId="{font}" fillId="{fill}" '
+            f'borderId="{border}" xfId="0" applyNumberFormat="1" applyFont="1" '
+            f'applyFill="1" applyBorder="1"'
+        )
+        children = ""
+        if style.alignmentId:
+            entry += ' applyAlignment="1"'
+            children += tostring(copy(cell.alignment).to_tree()).decode()
+        if style.protectionId:
+            entry += ' applyProtection="1"'
+            children += tostring(copy(cell.protection).to_tree()).decode()
+        entry += f">{children}</xf>" if children else "/>"
+        self.cells[key] = self._index("cellXfs", entry)
+        return self.cells[key]
+
+    def render(self):
+        """styles.xml with the new entries appended and counts updated."""
+        xml = self.xml
+        for tag, (count, added) in self.sections.items():
+            if added:
+                xml = xml.replace(
+                    f'<{tag} count="{count}"', f'<{tag} count="{count + len(added)}"', 1
+                )
+                xml = xml.replace(f"</{tag}>", "".join(added) + f"</{tag}>", 1)
+        if self.new_formats:
+            added = "".join(self.new_formats)
+            match = re.search(r'<numFmts count="(\d+)"', xml)
+            if match:
+                count = int(match.group(1)) + len(self.new_formats)
+                xml = xml.replace(match.group(0), f'<numFmts count="{count}"', 1)
+                xml = xml.replace("</numFmts>", added + "</numFmts>", 1)
+            else:
+                formats = f'<numFmts count="{len(self.new_formats)}">{added}</numFmts>'
+                xml = xml.replace("<fonts ", formats + "<fonts ", 1)
+        return xml
+
+
+# =============================================================================
+# SHEETS
+# =============================================================================
+
+
+def cell_xml(ref, value, style=None):
+    """One <c> element; strings are inline, formulas carry no cached value."""
+    s = f' s="{style}"' if style else ""
+    if value is None:
+        return f'<c r="{ref}"{s}/>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{s} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (datetime, date)):
+        value = to_excel(value)
+    if isinstance(value, str):
+        if value.startswith("=") and len(value) > 1:
+            return f'<c r="{ref}"{s}><f>{escape(value[1:])}</f></c>'
+        space = ' xml:space="preserve"' if value != value.strip() else ""
+        text = f"<is><t{space}>{escape(value)}</t></is>"
+        return f'<c r="{ref}"{s} t="inlineStr">{text}</c>'
+    if isinstance(value, int):
+        return f'<c r="{ref}"{s}><v>{value}</v></c>'
+    if isinstance(value, Real):
+        return f'<c r="{ref}"{s}><v>{float(value)!r}</v></c>'
+    raise TypeError(f"Cannot patch a {type(value).__name__} value into {ref}")
+
+
+def _new_cell_xml(cell, styles):
+    style = styles.xf(cell) if any(_style(cell)) else None
+    return cell_xml(cell.coordinate, cell.value, style)
+
+
+def _insert_cells(body, added, styles):
+    # Slot new cells between a row's existing ones by column
+    cells = [
+        (
+            column_index_from_string(_attributes(c.group(1))["r"].rstrip(_DIGITS)),
+            c.group(0),
+        )
+        for c in _CELL.finditer(body)
+    ]
+    cells += [(col, _new_cell_xml(cell, styles)) for col, cell in added.items()]
+    return "".join(xml for _, xml in sorted(cells, key=lambda item: item[0]))
+
+
+def patch_sheet(xml, ws, before, changed, styles):
+    """
+    The template's sheet XML with the `changed` cells regenerated (keeping
+    their template format when only the value moved since `before`) and
+    shared formulas written out per cell; all else stays verbatim.
+    """
+    pending = {}
+    for (row, col), cell in changed.items():
+        pending.setdefault(row, {})[col] = cell
+
+    def patch_cell(match, row, edits):
+        attributes = _attributes(match.group(1))
+        ref = attributes["r"]
+        col = column_index_from_string(ref.rstrip(_DIGITS))
+        cell = edits.pop(col, None)
+        style = attributes.get("s")
+        if cell is not None:
+            if before.get((row, col), (None, None))[1] != _style(cell):
+                style = styles.xf(cell)
+        elif 't="shared"' in (match.group(2) or ""):
+            cell = stored_cells(ws)[row, col]
+        else:
+            return match.group(0)
+        return cell_xml(ref, cell.value, style)
+
+    def patch_row(match):
+        attributes = match.group(1)
+        row = int(_attributes(attributes)["r"])
+        edits = pending.pop(row, {})
+        if not edits and 't="shared"' not in (match.group(2) or ""):
+            return match.group(0)
+        body = _CELL.sub(lambda c: patch_cell(c, row, edits), match.group(2) or "")
+        if edits:
+            body = _insert_cells(body, edits, styles)
+            attributes = re.sub(r'\sspans="[^"]*"', "", attributes)
+        return f"<row{attributes}>{body}</row>"
+
+    def patch_data(match):
+        data = _ROW.sub(patch_row, match.group(0))
+        if not pending:
+            return data
+        # Rows the template never had, slotted in by row number
+        rows = [
+            (int(_attributes(row.group(1))["r"]), row.group(0))
+            for row in _ROW.finditer(data)
+        ]
+        for row, edits in pending.items():
+            rows.append(
+                (row, f'<row r="{row}">{_insert_cells("", edits, styles)}</row>')
+            )
+        rows.sort(key=lambda item: item[0])
+        return "<sheetData>" + "".join(xml for _, xml in rows) + "</sheetData>"
+
+    xml = _SHEET_DATA.sub(patch_data, xml, count=1)
+    return _DIMENSION.sub(f'<dimension ref="{ws.calculate_dimension()}"/>', xml, 1)
+
+
+def sheet_xml(ws, styles):
+    """A complete worksheet part for a sheet created after loading."""
+    widths = sorted(
+        (column_index_from_string(letter), dim.width)
+        for letter, dim in ws.column_dimensions.items()
+        if dim.customWidth
+    )
+    cols = "".join(
+        f'<col min="{col}" max="{col}" width="{width}" customWidth="1"/>'
+        for col, width in widths
+    )
+    rows = {}
+    for (row, col), cell in sorted(stored_cells(ws).items()):
+        if cell.value is not None or any(_style(cell)):
+            rows.setdefault(row, []).append(_new_cell_xml(cell, styles))
+    data = "".join(
+        f'<row r="{row}">{"".join(cells)}</row>' for row, cells in rows.items()
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<worksheet xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+        f'<dimension ref="{ws.calculate_dimension()}"/>'
+        '<sheetViews><sheetView workbookViewId="0"/></sheetViews>'
+        '<sheetFormatPr defaultRowHeight="15"/>'
+        + (f"<cols>{cols}</cols>" if cols else "")
+        + f"<sheetData>{data}</sheetData>"
+        '<pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" '
+        'footer="0.5"/></worksheet>'
+    )
+
+
+# =============================================================================
+# PACKAGE
+# =============================================================================
+
+
+def _register_sheets(parts, names, added):
+    """workbook.xml, its rels and [Content_Types].xml for new sheet parts."""
+    workbook, rels, types = (
+        parts[_WORKBOOK],
+        parts[_WORKBOOK_RELS],
+        parts[_CONTENT_TYPES],
+    )
+    sheet_id = max(int(i) for i in re.findall(r'<sheet [^>]*sheetId="(\d+)"', workbook))
+    rel_id = max(int(i) for i in re.findall(r'Id="rId(\d+)"', rels))
+    number = max(
+        [
+            0,
+            *(
+                int(n)
+                for n in re.findall(r"worksheets/sheet(\d+)\.xml", " ".join(names))
+            ),
+        ]
+    )
+    new_parts = {}
+    for title, xml in added:
+        sheet_id, rel_id, number = sheet_id + 1, rel_id + 1, number + 1
+        part = f"xl/worksheets/sheet{number}.xml"
+        new_parts[part] = xml
+        workbook = workbook.replace(
+            "</sheets>",
+            f'<sheet name={quoteattr(title)} sheetId="{sheet_id}" r:id="rId{rel_id}"/>'
+            "</sheets>",
+            1,
+        )
+        rels = rels.replace(
+            "</Relationships>",
+            f'<Relationship Id="rId{rel_id}" Type="{_WORKSHEET_TYPE}" '
+            f'Target="worksheets/sheet{number}.xml"/></Relationships>',
+        )
+        types = types.replace(
+            "</Types>",
+            f'<Override PartName="/{part}" ContentType="{_WORKSHEET_CONTENT}"/></Types>',
+        )
+    parts[_WORKBOOK], parts[_WORKBOOK_RELS], parts[_CONTENT_TYPES] = (
+        workbook,
+        rels,
+        types,
+    )
+    return new_parts
+
+
+def _drop_calc_chain(parts):
+    """Remove calcChain.xml and ask Excel to recalculate everything on load."""
+    parts[_WORKBOOK_RELS] = re.sub(
+        r'<Relationship [^>]*Target="calcChain\.xml"\s*/>', "", parts[_WORKBOOK_RELS]
+    )
+    parts[_CONTENT_TYPES] = re.sub(
+        r'<Override PartName="/xl/calcChain\.xml"[^>]*/>', "", parts[_CONTENT_TYPES]
+    )
+    if "fullCalcOnLoad" not in parts[_WORKBOOK]:
+        parts[_WORKBOOK] = parts[_WORKBOOK].replace(
+            "<calcPr", '<calcPr fullCalcOnLoad="1"', 1
+        )
+
+
+def save_patched(wb, template, output, before):
+    """
+    Save `wb` (loaded from `template`, with `before` = snapshot(wb) taken
+    right after loading) to `output` by patching the template's zip.
+    Returns the names of the parts that were rewritten or added.
+    """
+    with zipfile.ZipFile(template) as src:
+        names = src.namelist()
+        paths = sheet_paths(src)
+        removed = set(paths) - set(wb.sheetnames)
+        if removed:
+            raise ValueError(f"Cannot patch out template sheets: {sorted(removed)}")
+
+        styles = StylePatch(src.read(_STYLES).decode("utf-8"))
+        parts = {}
+        added = []
+        for ws in wb.worksheets:
+            if ws.title not in paths:
+                added.append((ws.title, ws))
+                continue
+            changed = changed_cells(ws, before[ws.title])
+            if changed:
+                member = paths[ws.title]
+                xml = src.read(member).decode("utf-8")
+                parts[member] = patch_sheet(xml, ws, before[ws.title], changed, styles)
+        new_parts = {}
+        if parts or added:
+            for name in (_WORKBOOK, _WORKBOOK_RELS, _CONTENT_TYPES):
+                parts[name] = src.read(name).decode("utf-8")
+            new_parts = _register_sheets(
+                parts, names, [(title, sheet_xml(ws, styles)) for title, ws in added]
+            )
+            _drop_calc_chain(parts)
+        if styles.changed:
+            parts[_STYLES] = styles.render()
+
+        # Write beside the output and swap in, so a failed save never leaves
+        # a half-written workbook (and output may be the template itself)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output)))
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as dst:
+                for info in src.infolist():
+                    if info.filename == _CALC_CHAIN and (parts or added):
+                        continue
+                    if info.filename in parts:
+                        dst.writestr(info, parts[info.filename].encode("utf-8"))
+                    else:
+                        dst.writestr(info, src.read(info))
+                for name, xml in new_parts.items():
+                    dst.writestr(name, xml.encode("utf-8"))
+            shutil.copymode(template, tmp)
+            os.replace(tmp, output)
+        except BaseException:
+            os.remove(tmp)
+            raise
+    return sorted(parts) + sorted(new_parts)
+
+
+if __name__ == "__main__":
+    # python xlsm_patch.py [template]
+    here = os.path.dirname(os.path.abspath(__file__))
+    template = sys.argv[1] if len(sys.argv) > 1 else os.path.join(here, "Module7.xlsm")
+    out = tempfile.mkdtemp()
+
+    wb = openpyxl.load_workbook(template, keep_vba=True)
+    before = snapshot(wb)
+    ws = wb["DCF"]
+    ws["B6"] = 0.03
+    ws["A6"].font = copy(ws["A4"].font)
+    extra = wb.create_sheet("Patch Check")
+    extra["A1"] = "Patched"
+    extra["B1"] = "=DCF!B6*100"
+    extra.column_dimensions["A"].width = 20
+
+    timings = {}
+    for mode in ("openpyxl", "patched"):
+        path = os.path.join(out, f"{mode}.xlsm")
+        start = time.perf_counter()
+        if mode == "openpyxl":
+            wb.save(path)
+        else:
+            rewritten = save_patched(wb, template, path, before)
+        timings[mode] = time.perf_counter() - start
+        print(
+            f"{mode:<10}{timings[mode] * 1000:8.1f} ms "
+            f"{os.path.getsize(path) / 1e3:8.1f} kB"
+        )
+    print(
+        f"{timings['openpyxl'] / timings['patched']:.1f}x faster; rewrote {rewritten}"
+    )
+
+    with zipfile.ZipFile(template) as a, zipfile.ZipFile(path) as b:
+        same = sum(
+            a.read(name) == b.read(name)
+            for name in a.namelist()
+            if name in b.namelist()
+        )
+        print(f"{same} of {len(a.namelist())} template parts byte-identical")
+    check = openpyxl.load_workbook(path)
+    print(
+        f"DCF!B6 = {check['DCF']['B6'].value}, Patch Check!B1 = {check['Patch Check']['B1'].value}"
+    )
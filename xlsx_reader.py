@@ -0,0 +1,248 @@
+"""
+Streaming XLSX / XLSM Sheet Reader
+==================================
+Pure-data reader for the sheets these scripts ingest. openpyxl builds a Cell
+object (and parses every style) per cell; this walks the XML directly.
+
+- Reads xl/worksheets/sheetN.xml and xl/sharedStrings.xml straight out of
+  the zip with an incremental XML parser, clearing each row once it is read
+- Yields (row, col, value) tuples, 1-based like openpyxl
+- Shared strings are resolved through an interned table, so a label that
+  repeats across rows and sheets is a single str object
+- Cached values only (like data_only=True); styles are never read, so
+  date-formatted cells stay Excel serial numbers
+
+Run this module directly to benchmark it against openpyxl.load_workbook on
+the Bloomberg XIDF export and Module7.xlsm.
+"""
+
+import os
+import posixpath
+import sys
+import time
+import zipfile
+from datetime import datetime
+from xml.etree import ElementTree
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_SHEET_TAG = _MAIN_NS + "sheet"
+_ROW_TAG = _MAIN_NS + "row"
+_CELL_TAG = _MAIN_NS + "c"
+_VALUE_TAG = _MAIN_NS + "v"
+_INLINE_TAG = _MAIN_NS + "is"
+_SI_TAG = _MAIN_NS + "si"
+_TEXT_TAG = _MAIN_NS + "t"
+_RUN_TAG = _MAIN_NS + "r"
+_REL_TAG = _PKG_REL_NS + "Relationship"
+
+_SHARED_STRINGS = "xl/sharedStrings.xml"
+_DIGITS = "0123456789"
+
+# Column letters -> 1-based index, filled lazily ("A" -> 1, "AA" -> 27)
+_COLUMNS = {}
+
+
+def _column_index(letters):
+    index = _COLUMNS.get(letters)
+    if index is None:
+        index = 0
+        for ch in letters:
+            index = index * 26 + ord(ch) - 64
+        _COLUMNS[letters] = index
+    return index
+
+
+def _cast_number(text):
+    # Same rule as openpyxl, so both readers hand back identical values
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+def _string_content(node):
+    # Plain text of an <si> / <is> node: its <t> plus every rich-text run's <t>
+    # (phonetic <rPh> runs are skipped, as openpyxl does)
+    parts = [node.findtext(_TEXT_TAG) or ""]
+    for run in node.iterfind(_RUN_TAG):
+        parts.append(run.findtext(_TEXT_TAG) or "")
+    return "".join(parts)
+
+
+def sheet_paths(archive):
+    """Sheet name -> worksheet XML member of an open zip, in workbook order."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(_REL_TAG)}
+    paths = {}
+    for sheet in workbook.iter(_SHEET_TAG):
+        target = targets[sheet.get(_REL_NS + "id")]
+        if target.startswith("/"):
+            paths[sheet.get("name")] = target.lstrip("/")
+        else:
+            paths[sheet.get("name")] = posixpath.normpath(posixpath.join("xl", target))
+    return paths
+
+
+def sheet_names(path):
+    """Sheet names in workbook order, read from xl/workbook.xml only."""
+    with zipfile.ZipFile(path) as archive:
+        return list(sheet_paths(archive))
+
+
+def read_shared_strings(archive):
+    """The shared string table of an open zip, every entry interned."""
+    if _SHARED_STRINGS not in archive.namelist():
+        return []
+    strings = []
+    with archive.open(_SHARED_STRINGS) as src:
+        for _, node in ElementTree.iterparse(src):
+            if node.tag == _SI_TAG:
+                strings.append(sys.intern(_string_content(node).replace("x005F_", "")))
+                node.clear()
+    return strings
+
+
+def shared_strings_crc(archive):
+    """CRC32 of an open zip's shared string table (0 if it has none)."""
+    if _SHARED_STRINGS not in archive.namelist():
+        return 0
+    return archive.getinfo(_SHARED_STRINGS).CRC
+
+
+def iter_member(archive, member, strings, refs=None):
+    """
+    Yield (row, col, value) for every non-empty cell of one sheet member.
+    When given, `refs` is filled with {shared string index: string} for the
+    shared-string cells read.
+    """
+    row_idx = 0
+    col_idx = 0
+    with archive.open(member) as src:
+        for event, node in ElementTree.iterparse(src, events=("start", "end")):
+            tag = node.tag
+            if event == "start":
+                if tag == _ROW_TAG:
+                    row_ref = node.get("r")
+                    row_idx = int(row_ref) if row_ref else row_idx + 1
+                    col_idx = 0
+                continue
+
+            if tag == _CELL_TAG:
+                ref = node.get("r")
+                col_idx = _column_index(ref.rstrip(_DIGITS)) if ref else col_idx + 1
+                data_type = node.get("t", "n")
+                if data_type == "inlineStr":
+                    inline = node.find(_INLINE_TAG)
+                    value = _string_content(inline) if inline is not None else None
+                else:
+                    value = node.findtext(_VALUE_TAG) or None
+                    if value is None:
+                        pass
+                    elif data_type == "n":
+                        value = _cast_number(value)
+                    elif data_type == "s":
+                        index = int(value)
+                        value = strings[index]
+                        if refs is not None:
+                            refs[index] = value
+                    elif data_type == "b":
+                        value = bool(int(value))
+                    elif data_type == "d":
+                        value = datetime.fromisoformat(value)
+                    # "str" (formula result) and "e" (error) stay as text
+                if value is not None:
+                    yield row_idx, col_idx, value
+            elif tag == _ROW_TAG:
+                node.clear()
+
+
+def iter_cells(path, sheet):
+    """Yield (row, col, value) for every non-empty cell of a named sheet."""
+    with zipfile.ZipFile(path) as archive:
+        member = sheet_paths(archive)[sheet]
+        yield from iter_member(archive, member, read_shared_strings(archive))
+
+
+def cells_to_grid(cells):
+    """(row, col, value) stream -> {row: values} with trailing blanks dropped."""
+    rows = {}
+    for row, col, value in cells:
+        rows.setdefault(row, {})[col] = value
+    grid = {}
+    for row, values in rows.items():
+        line = [None] * max(values)
+        for col, value in values.items():
+            line[col - 1] = value
+        grid[row] = tuple(line)
+    return grid
+
+
+def read_grid(path, sheet):
+    """One named sheet as {row_number: values}."""
+    return cells_to_grid(iter_cells(path, sheet))
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_FILES = (
+    os.path.join(_HERE, "Bloomberg Macro XIDF (1).xlsm"),
+    os.path.join(_HERE, "Module7.xlsm"),
+)
+
+
+def _openpyxl_cells(path, read_only):
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=read_only, data_only=True)
+    try:
+        return sum(
+            value is not None
+            for ws in wb.worksheets
+            for row in ws.iter_rows(values_only=True)
+            for value in row
+        )
+    finally:
+        wb.close()
+
+
+def _reader_cells(path):
+    with zipfile.ZipFile(path) as archive:
+        strings = read_shared_strings(archive)
+        return sum(
+            1
+            for member in sheet_paths(archive).values()
+            for _ in iter_member(archive, member, strings)
+        )
+
+
+def benchmark(paths=BENCHMARK_FILES, repeat=3):
+    """Best-of-`repeat` time to read every cell value of each workbook."""
+    readers = [
+        ("openpyxl.load_workbook", lambda p: _openpyxl_cells(p, read_only=False)),
+        ("openpyxl read_only", lambda p: _openpyxl_cells(p, read_only=True)),
+        ("xlsx_reader", _reader_cells),
+    ]
+    for path in paths:
+        print(f"\n{os.path.basename(path)} ({os.path.getsize(path) / 1e6:.1f} MB)")
+        baseline = None
+        for name, read in readers:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                cells = read(path)
+                best = min(best, time.perf_counter() - start)
+            baseline = baseline or best
+            print(
+                f"  {name:<24} {best * 1000:8.1f} ms  {cells:>7} cells"
+                f"  {baseline / best:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    benchmark()
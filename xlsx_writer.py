@@ -0,0 +1,408 @@
+"""
+Direct XLSX Writer
+==================
+SpreadsheetML written straight from row data, for workbooks that are only
+ever output. openpyxl builds a Cell object per cell and resolves its style
+when saving; this writes each row's XML as it is given.
+
+- XlsxWorkbook keeps the style tables openpyxl would (fonts, fills,
+  borders, number formats, cell formats; StyleRegistry named styles register
+  into them unchanged) and a shared-string table; a style is resolved to
+  its cellXfs index once and every later cell just repeats the index
+- XlsxSheet.write_row(index, cells) takes (value, xf) pairs and appends one
+  <row> to the sheet's buffer
+- Formulas filled across a row (one R1C1 pattern, see
+  formula_engine.normalize) are written once, as a shared formula over the
+  range; the other cells of the range only point at it
+- save(path) streams the parts into the zip through a buffered writer; the
+  workbook is flagged for a full recalculation on open, since formulas
+  carry no cached values
+- sheet_writer.SheetWriter drives an XlsxSheet like any other sheet, so the
+  pro forma generators write their four sheets this way with
+  create_lululemon_model(direct=True)
+
+Run this module directly for a benchmark of both generators and of a
+synthetic workbook: regular, write-only and direct.
+"""
+
+import contextlib
+import importlib
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+from copy import copy
+from datetime import datetime, timezone
+from numbers import Real
+from xml.sax.saxutils import escape, quoteattr
+
+from openpyxl import Workbook
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import BUILTIN_FORMATS_MAX_SIZE, BUILTIN_FORMATS_REVERSE
+from openpyxl.styles.stylesheet import write_stylesheet
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.xml.functions import tostring
+
+from formula_engine import normalize
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CONTENT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+_SPREADSHEET = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Cell style attribute -> (workbook table, StyleArray field)
+_STYLE_TABLES = {
+    "font": ("_fonts", "fontId"),
+    "fill": ("_fills", "fillId"),
+    "border": ("_borders", "borderId"),
+    "alignment": ("_alignments", "alignmentId"),
+}
+
+# Whole-column / whole-row references, which normalize() leaves as text; a
+# formula holding one is never shared, since Excel would shift it
+_SPAN = re.compile(r"(?<![\w.$])\$?(?:[A-Za-z]{1,3}:\$?[A-Za-z]{1,3}|\d+:\$?\d+)\b")
+
+BUFFER_SIZE = 1 << 16
+
+
+def _is_formula(value):
+    return isinstance(value, str) and value.startswith("=") and len(value) > 1
+
+
+# =============================================================================
+# WORKBOOK
+# =============================================================================
+
+
+class XlsxWorkbook:
+    """Sheets, style tables and shared strings of one directly written file."""
+
+    # openpyxl's own bootstrap: default font / fills / border, the Normal
+    # named style, so styles.xml comes out as openpyxl would write it
+    _setup_styles = Workbook._setup_styles
+    add_named_style = Workbook.add_named_style
+
+    def __init__(self):
+        self._setup_styles()
+        self._sheets = []
+        self.strings = {}
+        self.string_count = 0
+        self._xfs = {}
+
+    @property
+    def sheetnames(self):
+        return [ws.title for ws in self._sheets]
+
+    def create_sheet(self, title):
+        if title in self.sheetnames:
+            raise ValueError(f"Sheet {title!r} exists already")
+        ws = XlsxSheet(self, title)
+        self._sheets.append(ws)
+        return ws
+
+    def xf(self, style=None, **attributes):
+        """
+        cellXfs index of a StyleArray (e.g. a StyleRegistry entry) with
+        `attributes` (font, fill, border, alignment, number_format) over it.
+        """
+        key = (style, tuple(attributes.items()))
+        index = self._xfs.get(key)
+        if index is None:
+            array = copy(style) if style is not None else StyleArray()
+            for name, value in attributes.items():
+                if name == "number_format":
+                    if value in BUILTIN_FORMATS_REVERSE:
+                        array.numFmtId = BUILTIN_FORMATS_REVERSE[value]
+                    else:
+                        array.numFmtId = (
+                            self._number_formats.add(value) + BUILTIN_FORMATS_MAX_SIZE
+                        )
+                else:
+                    table, field = _STYLE_TABLES[name]
+                    setattr(array, field, getattr(self, table).add(value))
+            index = self._xfs[key] = self._cell_styles.add(array)
+        return index
+
+    def string(self, value):
+        """Shared-string index of `value`."""
+        self.string_count += 1
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    # -------------------------------------------------------------------------
+    # Parts
+    # -------------------------------------------------------------------------
+
+    def _parts(self):
+        sheets = [
+            f"xl/worksheets/sheet{n}.xml" for n in range(1, len(self._sheets) + 1)
+        ]
+        yield "[Content_Types].xml", _content_types(sheets)
+        yield "_rels/.rels", _relationships(
+            [
+                ("/officeDocument", "xl/workbook.xml"),
+                ("/metadata/core-properties", "docProps/core.xml"),
+            ]
+        )
+        yield "docProps/core.xml", _core_properties()
+        yield "xl/workbook.xml", self._workbook_xml()
+        yield "xl/_rels/workbook.xml.rels", _relationships(
+            [("/worksheet", path[3:]) for path in sheets]
+            + [("/styles", "styles.xml"), ("/sharedStrings", "sharedStrings.xml")]
+        )
+        yield "xl/styles.xml", _XML_HEADER + tostring(write_stylesheet(self)).decode()
+        yield "xl/sharedStrings.xml", self._shared_strings_xml()
+        for path, ws in zip(sheets, self._sheets):
+            yield path, ws
+
+    def _workbook_xml(self):
+        sheets = "".join(
+            f'<sheet name={quoteattr(ws.title)} sheetId="{n}" r:id="rId{n}"/>'
+            for n, ws in enumerate(self._sheets, start=1)
+        )
+        return (
+            _XML_HEADER + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+            '<bookViews><workbookView activeTab="0"/></bookViews>'
+            f"<sheets>{sheets}</sheets>"
+            '<calcPr calcId="124519" fullCalcOnLoad="1"/></workbook>'
+        )
+
+    def _shared_strings_xml(self):
+        items = "".join(f"<si>{_text(value)}</si>" for value in self.strings)
+        return (
+            _XML_HEADER + f'<sst xmlns="{_MAIN_NS}" count="{self.string_count}" '
+            f'uniqueCount="{len(self.strings)}">{items}</sst>'
+        )
+
+    def save(self, filename):
+        """Write the workbook to `filename` (.xlsx)."""
+        with zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, part in self._parts():
+                with archive.open(name, "w") as raw:
+                    with io.BufferedWriter(raw, BUFFER_SIZE) as stream:
+                        if isinstance(part, XlsxSheet):
+                            part.write(stream)
+                        else:
+                            stream.write(part.encode())
+
+
+class XlsxSheet:
+    """One worksheet, kept as the XML of its rows until the workbook is saved."""
+
+    def __init__(self, parent, title):
+        self.parent = parent
+        self.title = title
+        self.widths = {}
+        self.selected = not parent._sheets
+        self._rows = []
+        self._shared = 0
+        self.max_row = 0
+        self.max_column = 0
+
+    def write_row(self, index, cells):
+        """Row `index` (1-based) from [(value, xf) or None, ...] from column A."""
+        if index <= self.max_row:
+            raise ValueError(f"Row {index} written after row {self.max_row}")
+        cells = [
+            (column, *cell)
+            for column, cell in enumerate(cells, start=1)
+            if cell is not None and cell[0] is not None
+        ]
+        if not cells:
+            return
+        xml = []
+        for run in self._runs(index, cells):
+            column, value, xf = run[0]
+            ref = f"{get_column_letter(column)}{index}"
+            s = f' s="{xf}"' if xf else ""
+            if len(run) > 1:
+                last = f"{get_column_letter(run[-1][0])}{index}"
+                si = self._shared
+                self._shared += 1
+                xml.append(
+                    f'<c r="{ref}"{s}><f t="shared" ref="{ref}:{last}" si="{si}">'
+                    f"{escape(value[1:])}</f></c>"
+                )
+                for column, _, xf in run[1:]:
+                    s = f' s="{xf}"' if xf else ""
+                    xml.append(
+                        f'<c r="{get_column_letter(column)}{index}"{s}>'
+                        f'<f t="shared" si="{si}"/></c>'
+                    )
+            else:
+                xml.append(self._cell_xml(ref, value, s))
+        self._rows.append(f'<row r="{index}">{"".join(xml)}</row>')
+        self.max_row = index
+        self.max_column = max(self.max_column, cells[-1][0])
+
+    def _runs(self, index, cells):
+        # Adjacent formulas with one R1C1 pattern form a run; anything else
+        # is a run of one
+        runs, pattern = [], None
+        for cell in cells:
+            column, value, _ = cell
+            current = None
+            if _is_formula(value) and not _SPAN.search(value):
+                current = normalize(value, self.title, index, column)[0]
+            if (
+                current is not None
+                and current == pattern
+                and runs[-1][-1][0] == column - 1
+            ):
+                runs[-1].append(cell)
+            else:
+                runs.append([cell])
+            pattern = current
+        return runs
+
+    def _cell_xml(self, ref, value, s):
+        if isinstance(value, bool):
+            return f'<c r="{ref}"{s} t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, str):
+            if _is_formula(value):
+                return f'<c r="{ref}"{s}><f>{escape(value[1:])}</f></c>'
+            if not value:
+                return f'<c r="{ref}"{s} t="inlineStr"/>'  # as openpyxl writes ""
+            return f'<c r="{ref}"{s} t="s"><v>{self.parent.string(value)}</v></c>'
+        if isinstance(value, int):
+            return f'<c r="{ref}"{s}><v>{value}</v></c>'
+        if isinstance(value, Real):
+            return f'<c r="{ref}"{s}><v>{float(value)!r}</v></c>'
+        raise TypeError(f"Cannot write a {type(value).__name__} value to {ref}")
+
+    def write(self, stream):
+        """Write the worksheet part to a binary stream."""
+        dimension = "A1"
+        if self._rows:
+            dimension = f"A1:{get_column_letter(max(self.max_column, 1))}{self.max_row}"
+        cols = "".join(
+            f'<col min="{n}" max="{n}" width="{width}" customWidth="1"/>'
+            for n, width in sorted(
+                (column_index_from_string(letter), width)
+                for letter, width in self.widths.items()
+            )
+        )
+        selected = ' tabSelected="1"' if self.selected else ""
+        stream.write(
+            (
+                _XML_HEADER + f'<worksheet xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+                f'<dimension ref="{dimension}"/>'
+                f'<sheetViews><sheetView{selected} workbookViewId="0"/></sheetViews>'
+                '<sheetFormatPr defaultRowHeight="15"/>'
+                + (f"<cols>{cols}</cols>" if cols else "")
+                + "<sheetData>"
+            ).encode()
+        )
+        for row in self._rows:
+            stream.write(row.encode())
+        stream.write(
+            b'</sheetData><pageMargins left="0.75" right="0.75" top="1" bottom="1" '
+            b'header="0.5" footer="0.5"/></worksheet>'
+        )
+
+
+def _text(value):
+    space = ' xml:space="preserve"' if value != value.strip() else ""
+    return f"<t{space}>{escape(value)}</t>"
+
+
+def _relationships(targets):
+    items = "".join(
+        f'<Relationship Id="rId{n}" Type="{_REL_NS}{kind}" Target="{target}"/>'
+        for n, (kind, target) in enumerate(targets, start=1)
+    )
+    return _XML_HEADER + f'<Relationships xmlns="{_PKG_REL_NS}">{items}</Relationships>'
+
+
+def _content_types(sheets):
+    overrides = [
+        ("/xl/workbook.xml", _SPREADSHEET + ".sheet.main+xml"),
+        ("/xl/styles.xml", _SPREADSHEET + ".styles+xml"),
+        ("/xl/sharedStrings.xml", _SPREADSHEET + ".sharedStrings+xml"),
+        (
+            "/docProps/core.xml",
+            "application/vnd.openxmlformats-package.core-properties+xml",
+        ),
+    ] + [("/" + path, _SPREADSHEET + ".worksheet+xml") for path in sheets]
+    items = "".join(
+        f'<Override PartName="{name}" ContentType="{kind}"/>'
+        for name, kind in overrides
+    )
+    return (
+        _XML_HEADER + f'<Types xmlns="{_CONTENT_NS}">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        f"{items}</Types>"
+    )
+
+
+def _core_properties():
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return (
+        _XML_HEADER + "<cp:coreProperties "
+        'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:dcterms="http://purl.org/dc/terms/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        "<dc:creator>openpyxl</dc:creator>"
+        f'<dcterms:created xsi:type="dcterms:W3CDTF">{now}</dcterms:created>'
+        f'<dcterms:modified xsi:type="dcterms:W3CDTF">{now}</dcterms:modified>'
+        "</cp:coreProperties>"
+    )
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def _time_generator(module, mode, path):
+    # The generators save to a fixed Windows path; send it to `path` instead
+    # (run as a script, this module is __main__: patch the imported one)
+    generator = importlib.import_module(module)
+    direct = importlib.import_module("xlsx_writer").XlsxWorkbook
+    saves = (Workbook.save, direct.save)
+    Workbook.save = lambda wb, _: saves[0](wb, path)
+    direct.save = lambda wb, _: saves[1](wb, path)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            generator.create_lululemon_model(**{mode: True} if mode else {})
+            return time.perf_counter() - start
+    finally:
+        Workbook.save, direct.save = saves
+
+
+if __name__ == "__main__":
+    from sheet_writer import benchmark
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.xlsx")
+    modes = [("regular", None), ("write-only", "write_only"), ("direct", "direct")]
+
+    print(f"{'':<32}" + "".join(f"{name:>14}" for name, _ in modes))
+    for module in ("lululemon_proforma_model", "lululemon_proforma_bloomberg"):
+        times = [
+            min(_time_generator(module, mode, path) for _ in range(runs))
+            for _, mode in modes
+        ]
+        print(f"{module:<32}" + "".join(f"{t * 1e3:>11.1f} ms" for t in times))
+
+    for companies, periods in [(10, 6), (100, 40)]:
+        times = [
+            benchmark(
+                companies, periods, write_only, named=True, direct=direct, memory=False
+            )[0]
+            for write_only, direct in ((False, False), (True, False), (False, True))
+        ]
+        label = f"synthetic {companies} x {periods}"
+        print(f"{label:<32}" + "".join(f"{t * 1e3:>11.1f} ms" for t in times))
+    os.remove(path)